@@ -0,0 +1,119 @@
+# benchmarks/downloads.py
+# Segmented download throughput against a local HTTP server that honours
+# Range and caps each connection's rate (like many mirrors do), then an
+# interrupted download resumed from its saved segments. Checks the result
+# byte for byte and how much was transferred in total.
+# Run: python benchmarks/downloads.py [size_mb] [per_connection_mb_s]
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from triode.browser.downloads import Download, fetch  # noqa: E402
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+def make_server(data: bytes, rate: float):
+    """HTTP server for data at any path; rate is bytes/s per connection."""
+    etag = '"%s"' % hashlib.blake2b(data, digest_size=8).hexdigest()
+    sent = [0]
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            start, end, status = 0, len(data) - 1, 200
+            m = _RANGE.match(self.headers.get("Range", ""))
+            if_range = self.headers.get("If-Range")
+            if m and (if_range is None or if_range == etag):
+                start, status = int(m.group(1)), 206
+                if m.group(2):
+                    end = min(int(m.group(2)), end)
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            self.end_headers()
+            step = 64 * 1024
+            began = time.monotonic()
+            for pos in range(start, end + 1, step):
+                chunk = data[pos:min(pos + step, end + 1)]
+                try:
+                    self.wfile.write(chunk)
+                except OSError:
+                    return
+                with lock:
+                    sent[0] += len(chunk)
+                # throttle: sleep until this connection is back under rate
+                ahead = (pos + len(chunk) - start) / rate - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, sent
+
+
+def run(url: str, path: str, segments: int, stop_after: float = 0.0) -> tuple[Download, float]:
+    d = Download(url, path)
+    stop = threading.Event()
+    if stop_after:
+        threading.Timer(stop_after, stop.set).start()
+    t0 = time.perf_counter()
+    fetch(d, stop, segments=segments, min_segment=1 << 20)
+    return d, time.perf_counter() - t0
+
+
+def check(d: Download, data: bytes) -> bool:
+    with open(d.part_path, "rb") as f:
+        return f.read() == data
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * (1 << 20)) if len(sys.argv) > 1 else 32 << 20
+    rate = float(sys.argv[2]) * (1 << 20) if len(sys.argv) > 2 else 8 << 20
+    data = os.urandom(size)
+    server, sent = make_server(data, rate)
+    url = f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+    tmp = tempfile.mkdtemp(prefix="triode-dl-bench-")
+    print(f"{size / (1 << 20):.0f} MB, server capped at {rate / (1 << 20):.0f} MB/s per connection")
+
+    for segments in (1, 2, 4, 8):
+        path = os.path.join(tmp, f"seg{segments}.bin")
+        d, took = run(url, path, segments)
+        ok = "ok" if check(d, data) else "CORRUPT"
+        print(f"  {segments} segment(s): {took:6.2f} s  {size / took / (1 << 20):7.1f} MB/s  {ok}")
+
+    # stop part way, then resume from the saved segments
+    path = os.path.join(tmp, "resume.bin")
+    sent[0] = 0
+    d, _ = run(url, path, 4, stop_after=size / rate / 4 / 2)
+    first = d.received
+    t0 = time.perf_counter()
+    fetch(d, threading.Event(), segments=4, min_segment=1 << 20)
+    took = time.perf_counter() - t0
+    ok = "ok" if check(d, data) else "CORRUPT"
+    print(f"  resume: {first / size:.0%} done when stopped, rest in {took:.2f} s, "
+          f"{sent[0] / size:.2f}x the file sent in total  {ok}")
+    server.shutdown()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
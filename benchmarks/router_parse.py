@@ -0,0 +1,65 @@
+# benchmarks/router_parse.py
+# Parse throughput of URLRouter over the inputs a user produces while typing
+# (every prefix of a set of URLs and paths), plus how many of them needed a
+# filesystem probe. Run: python benchmarks/router_parse.py [rounds]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from triode.url_router import URLRouter  # noqa: E402
+
+TYPED = [
+    "https://www.example.com/some/long/path?q=triode&page=2",
+    "http://localhost:8080/api/v1/items",
+    "news.ycombinator.com",
+    "www.python.org/downloads/",
+    "docs.qt.io/qtforpython-6/",
+    "file:///usr/share/doc",
+    "/etc/hosts",
+    "~/Documents/notes.txt",
+    "./build/output.log",
+    "../README.md",
+    "term://~/src",
+    "notes.txt",
+    "my documents.pdf",
+    "localhost",
+]
+
+
+def corpus() -> list[str]:
+    out = []
+    for text in TYPED:
+        out.extend(text[:i] for i in range(1, len(text) + 1))
+    return out
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = QCoreApplication(sys.argv)  # noqa: F841  (FsProbe is a QObject)
+    router = URLRouter()
+    inputs = corpus()
+
+    ambiguous = sum(1 for t in inputs if router.classify(t)[1] is not None)
+    cases = (
+        ("uncached", router._classify),  # what every call cost before memoizing
+        ("classify", router.classify),
+        ("parse", router.parse),
+    )
+    for name, fn in cases:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in inputs:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        n = rounds * len(inputs)
+        print(f"{name:<9} {n:>8} inputs  {elapsed * 1000:8.1f} ms  "
+              f"{n / elapsed:>10.0f}/s  {elapsed / n * 1e6:6.2f} us/input")
+    print(f"corpus: {len(inputs)} distinct inputs, {ambiguous} ambiguous (probed off-thread by resolve())")
+
+
+if __name__ == "__main__":
+    main()
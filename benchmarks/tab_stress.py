@@ -0,0 +1,72 @@
+# benchmarks/tab_stress.py
+# Opens, switches between and closes N browser tabs on the headless stub
+# backend, timing each phase. "switch" includes Qt's own tab-bar relayout,
+# which grows with N; "handler" is TabManager's share of a switch and should
+# stay flat as N grows.
+# Run: python benchmarks/tab_stress.py [N]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# keep the session file and history database out of the real profile
+_scratch = tempfile.mkdtemp(prefix="triode-bench-")
+os.environ["HOME"] = _scratch
+os.environ["XDG_DATA_HOME"] = os.path.join(_scratch, "data")
+os.environ["XDG_CACHE_HOME"] = os.path.join(_scratch, "cache")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from triode.settings import DEFAULTS  # noqa: E402
+from triode.tab_manager import TabManager  # noqa: E402
+from triode.url_router import URLRouter  # noqa: E402
+
+
+def timed(label: str, n: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {n:>6} ops  {elapsed * 1000:9.1f} ms  {elapsed / n * 1e6:8.1f} us/op")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = QApplication(sys.argv)
+    settings = {section: dict(values) for section, values in DEFAULTS.items()}
+    settings["browser"]["engine"] = "stub"
+    settings["history"]["enabled"] = False
+    tabs = TabManager(URLRouter(), settings)
+    tabs.resize(1024, 768)
+    tabs.show()
+
+    def open_all():
+        for i in range(n):
+            tabs.create_browser_tab(f"https://example.com/{i}", insert_index=tabs.count())
+
+    def switch_all():
+        for i in range(1, tabs.count()):
+            tabs.setCurrentIndex(i)
+
+    def handler_all():
+        for i in range(1, tabs.count()):
+            tabs._on_current_changed(i)
+
+    def close_all():
+        while tabs.count() > 1:
+            tabs.destroy_tab(tabs.widget(tabs.count() - 1))
+            app.processEvents()  # let deleteLater run as it would between clicks
+
+    timed("open", n, open_all)
+    timed("switch", n, switch_all)
+    timed("switch", n, switch_all)  # second pass: everything already created
+    timed("handler", n, handler_all)
+    timed("close", n, close_all)
+    assert tabs.tab_count() == 0, tabs.tab_count()
+    tabs.session.suspend(True)
+    tabs.history.close()
+
+
+if __name__ == "__main__":
+    main()
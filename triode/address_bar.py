@@ -1,46 +1,150 @@
 # triode/address_bar.py
-from PySide6.QtWidgets import QLineEdit
+from PySide6.QtWidgets import QLineEdit, QCompleter
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, QObject, QEvent
 from .url_router import URLRouter
 #from .tab_manager import TabManager
 from .models.route import URLRoute
-from .explorer.tab import ExplorerTab
-from .browser.tab import BrowserTab
-from .generic_tab import GenericTab
-from .terminal.tab import TerminalTab
+from .browser.preconnect import Preconnector
+from .tab_registry import kind_of, kind_for_route
+from .path_completion import PathCompleter, split_path_text
 import os
 
+
+class _TabKeyFilter(QObject):
+    """Gives Tab in the address bar to path completion instead of focus navigation."""
+
+    def __init__(self, controller: "AddressBarController", parent=None):
+        super().__init__(parent)
+        self.controller = controller
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.KeyPress and event.key() == Qt.Key.Key_Tab:
+            return self.controller._on_tab_key()
+        return False
+
+
 class AddressBarController:
     def __init__(self, router: URLRouter, tab_manager: "TabManager"):
         self.router = router
         self.tab_manager = tab_manager
         self.line_edit: QLineEdit | None = None
+        self.preconnector = Preconnector(
+            lambda: tab_manager.backend, router, tab_manager.settings, parent=tab_manager
+        )
+        self.history = tab_manager.history
+        self.history.suggestions_ready.connect(self._on_history_ready)
+        self.max_suggestions = int(tab_manager.settings.get("history", {}).get("max_suggestions", 8))
+        self._suggestions = QStandardItemModel()
+        self.completer: QCompleter | None = None
+        self.paths = PathCompleter(tab_manager.settings, parent=tab_manager)
+        self.paths.ready.connect(self._on_paths_ready)
+        self._tab_pending = False
+        self._submit_seq = 0
 
     def bind(self, line_edit: QLineEdit) -> None:
         self.line_edit = line_edit
         self.line_edit.returnPressed.connect(self._on_submit)
+        # textEdited only fires for user typing, not for setText() from tabs
+        self.line_edit.textEdited.connect(self._on_text_edited)
+
+        # The model is refilled from history on every edit, so the completer must not filter it
+        self.completer = QCompleter(self._suggestions, line_edit)
+        self.completer.setWidget(line_edit)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.activated[str].connect(self._on_suggestion_activated)
+        self._key_filter = _TabKeyFilter(self, line_edit)
+        line_edit.installEventFilter(self._key_filter)
+
+    def _on_text_edited(self, text: str) -> None:
+        self._tab_pending = False
+        self.preconnector.hint(text)
+        self._update_suggestions(text)
+
+    def _update_suggestions(self, text: str, paths: list[str] | None = None) -> None:
+        """Fill the popup with path completions (if text is a path) followed by history."""
+        if paths is None and split_path_text(text) is not None:
+            # None means the directory is still being listed; _on_paths_ready follows
+            paths = self.paths.complete(text) or []
+        rows = [(p, p) for p in (paths or [])[: self.max_suggestions]]
+        shown = {p for p, _ in rows}
+        entries = self.history.suggest(text, self.max_suggestions) if text.strip() else []
+        for entry in entries:
+            if entry.url not in shown:
+                rows.append((entry.url, f"{entry.url}  —  {entry.title}" if entry.title else entry.url))
+
+        self._suggestions.clear()
+        for value, label in rows:
+            item = QStandardItem(label)
+            item.setData(value, Qt.ItemDataRole.EditRole)
+            item.setToolTip(value)
+            self._suggestions.appendRow(item)
+        if rows:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
 
-    def attach_tab_signals(self, tab):
-        if isinstance(tab, BrowserTab):
-            tab.url_changed.connect(self._on_tab_url_changed)
-        elif hasattr(tab, "path_changed"):
-            # This handles both ExplorerTab and TerminalTab
-            tab.path_changed.connect(self._on_tab_path_changed)
+    def _on_history_ready(self, text: str) -> None:
+        if self.line_edit and self.line_edit.text() == text:
+            self._update_suggestions(text)  # now with the matches the slow search found
+
+    def _on_paths_ready(self, text: str, completions: list) -> None:
+        if not self.line_edit or self.line_edit.text() != text:
+            return  # the user has typed on since
+        if self._tab_pending:
+            self._tab_pending = False
+            if self._apply_common_completion(text):
+                return
+        self._update_suggestions(text, completions)
+
+    def _on_tab_key(self) -> bool:
+        """Shell-style Tab: extend to the longest common match, else list the matches."""
+        if not self.line_edit:
+            return False
+        text = self.line_edit.text()
+        if split_path_text(text) is None:
+            return False
+        if self.paths.complete(text) is None:
+            self._tab_pending = True  # finish once the listing arrives
+            return True
+        if not self._apply_common_completion(text):
+            self._update_suggestions(text)
+        return True
+
+    def _apply_common_completion(self, text: str) -> bool:
+        extended = self.paths.common_completion(text)
+        if extended is None:
+            return False
+        self.line_edit.setText(extended)
+        self._update_suggestions(extended)
+        return True
+
+    def _on_suggestion_activated(self, value: str) -> None:
+        if not self.line_edit:
+            return
+        self.line_edit.setText(value)
+        if split_path_text(value) is not None and value.endswith("/"):
+            # a directory: keep completing inside it, like a shell
+            self._update_suggestions(value)
+            return
+        self._on_submit()
 
     def set_route_from_browser(self, url: str):
         print("AddressBarController received url:", url)
-        route = URLRoute(scheme="http", path=url)  # or parse scheme dynamically
-        self.set_route(route)
+        self.set_route(self.router.route_for_url(url))
 
     def set_route(self, route: URLRoute) -> None:
         if self.line_edit:
-            self.line_edit.setText(self.router.to_text(route))
+            text = self.router.to_text(route)
+            if self.line_edit.text() != text:
+                self.line_edit.setText(text)
 
     def set_route_file(self, path: str) -> None:
         """Update address bar with a file:// or term:// path."""
         if self.line_edit:
             # Check if it's a terminal tab
             print("Setting file path in address bar:", path)
-            if isinstance(self.tab_manager.currentWidget(), TerminalTab):
+            if kind_of(self.tab_manager.currentWidget()) == "terminal":
                 self.line_edit.setText(f"term://{path}")
                 # Messy fix for double term:// bug
                 # Listen, if it works, it works
@@ -49,72 +153,38 @@ class AddressBarController:
             else:
                 self.line_edit.setText(f"file://{path}")
 
-    def _on_tab_url_changed(self, url: str):
-        if self.line_edit:
-            self.line_edit.setText(url)
-
-    def _on_tab_path_changed(self, path: str):
-        if self.line_edit:
-            # Check if it's a terminal tab
-            if isinstance(self.tab_manager.currentWidget(), TerminalTab):
-                self.line_edit.setText(f"term://{path}")
-            else:
-                self.line_edit.setText(f"file://{path}")
-
     def _on_submit(self) -> None:
         if not self.line_edit:
             return
         text = self.line_edit.text()
-        route = self.router.parse(text)
+        self.preconnector.cancel()
+        if self.completer:
+            self.completer.popup().hide()
+        self._submit_seq += 1
+        seq = self._submit_seq
+        # ambiguous input ("notes.txt") is probed off the GUI thread first
+        self.router.resolve(text, lambda route: self._open_route(route, seq))
+
+    def _open_route(self, route: URLRoute, seq: int) -> None:
+        if seq != self._submit_seq:
+            return  # a newer submit superseded this one while it was probing
         current_tab = self.tab_manager.currentWidget()
-        
-        # Prevent creating new terminal if we're already in one
-        if isinstance(current_tab, TerminalTab) and route.scheme == "term":
-            if route.path:
-                current_tab.navigate_to(route.path)
+        current_kind = kind_of(current_tab)
+        target_kind = kind_for_route(route)
+
+        if current_kind is None:
+            print(f"[AddressBar] Unknown tab type: {type(current_tab)}")
+            return
+        if target_kind is None:
+            print(f"[AddressBar] No tab type for {self.router.to_text(route)}")
             return
-            
-        if isinstance(current_tab, ExplorerTab):
-            if route.scheme in ("http", "https"):
-                newtab = self.tab_manager.create_browser_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme == "file":
-                current_tab.navigate_to(route.path)
-            elif route.scheme == "term":
-                newtab = self.tab_manager.create_terminal_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-
-        elif isinstance(current_tab, BrowserTab):
-            if route.scheme == "file":
-                newtab = self.tab_manager.create_explorer_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme == "term":
-                newtab = self.tab_manager.create_terminal_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            else:  # http/https
-                current_tab.navigate_to(route.path)
 
-        elif isinstance(current_tab, TerminalTab):
-            if route.scheme == "file":
-                newtab = self.tab_manager.create_explorer_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme in ("http", "https"):
-                newtab = self.tab_manager.create_browser_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme == "term":
+        # Same kind of tab: navigate in place (never spawn a second terminal etc.)
+        if current_kind == target_kind:
+            if route.path:
                 current_tab.navigate_to(route.path)
+            return
 
-        elif isinstance(current_tab, GenericTab):
-            if route.scheme == "file":
-                newtab = self.tab_manager.create_explorer_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme in ("http", "https"):
-                newtab = self.tab_manager.create_browser_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-            elif route.scheme == "term":
-                newtab = self.tab_manager.create_terminal_tab(route.path)
-                self.tab_manager.destroy_tab(current_tab, newtab)
-
-        else:
-            print(f"[AddressBar] Unknown tab type: {type(current_tab)}")
-        
\ No newline at end of file
+        # Otherwise the current tab is replaced by one of the right kind
+        newtab = self.tab_manager.create_tab(target_kind, route.path)
+        self.tab_manager.destroy_tab(current_tab, newtab)
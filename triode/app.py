@@ -1,19 +1,41 @@
 # triode/app.py
 import sys
 from PySide6.QtWidgets import QApplication
-from .main_window import MainWindow
+from PySide6.QtCore import QCoreApplication, Qt, QTimer
 from .settings import load_settings
+from .startup_profile import StartupProfiler
 
 class TriodeApp(QApplication):
     def __init__(self, argv):
         super().__init__(argv)
         self.setApplicationName("Triode")
 
-def main():
-    settings = load_settings()
-    app = TriodeApp(sys.argv)
-    win = MainWindow(settings=settings)
+def main(targets=None):
+    profiling = "--profile-startup" in sys.argv
+    if profiling:
+        sys.argv.remove("--profile-startup")
+    profiler = StartupProfiler(enabled=profiling)
+    perf_hud = "--perf" in sys.argv
+    if perf_hud:
+        sys.argv.remove("--perf")
+
+    # Tab modules (and with them QtWebEngine, pyte) are imported on first use
+    with profiler.phase("import main_window"):
+        from .main_window import MainWindow
+    with profiler.phase("load settings"):
+        settings = load_settings()
+    if perf_hud:
+        settings.setdefault("perf", {})["enabled"] = True
+    # QtWebEngine may be imported after QApplication exists; that requires this
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    with profiler.phase("QApplication"):
+        app = TriodeApp(sys.argv)
+    with profiler.phase("MainWindow"):
+        win = MainWindow(settings=settings, targets=targets or [])
+    profiler.report_after_first_paint(win)
     win.show()
+    # later launches (triode.cli) hand their targets to this instance
+    QTimer.singleShot(0, win.start_instance_server)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
 # triode/browser/backend.py
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 from PySide6.QtWidgets import QWidget
 
 class BrowserBackend(ABC):
+    """
+    Engine-neutral browser API. BrowserTab only talks to views through this,
+    so an engine can be swapped (or stubbed out) without touching tab code.
+
+    Lifecycle states are plain strings: "active", "frozen" or "discarded".
+    """
+
     @abstractmethod
     def create_view(self, parent: Optional[QWidget] = None) -> QWidget:
         raise NotImplementedError
@@ -15,3 +22,52 @@ class BrowserBackend(ABC):
     @abstractmethod
     def current_url(self, view: QWidget) -> str:
         raise NotImplementedError
+
+    @abstractmethod
+    def title(self, view: QWidget) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def connect_signals(
+        self,
+        view: QWidget,
+        url_changed: Optional[Callable[[str], None]] = None,
+        title_changed: Optional[Callable[[str], None]] = None,
+        load_finished: Optional[Callable[[bool], None]] = None,
+        scroll_changed: Optional[Callable[[float, float], None]] = None,
+    ) -> None:
+        """Forward the view's url/title/load/scroll notifications to the callbacks."""
+        raise NotImplementedError
+
+    # ---------- lifecycle hooks (optional for engines) ----------
+    def suspend(self, view: QWidget, discard: bool = False) -> None:
+        """Freeze the view, or release its renderer entirely if discard is True."""
+
+    def resume(self, view: QWidget) -> None:
+        """Bring a frozen or discarded view back to the active state."""
+
+    def lifecycle_state(self, view: QWidget) -> str:
+        return "active"
+
+    def renderer_pid(self, view: QWidget) -> int:
+        """PID of the process rendering view, or 0 if unknown or in-process."""
+        return 0
+
+    def memory_usage(self, view: QWidget) -> Optional[int]:
+        """Bytes used by the view's renderer, or None if unknown."""
+        return None
+
+    # ---------- page helpers (optional for engines) ----------
+    def scroll_position(self, view: QWidget) -> tuple[float, float]:
+        return (0.0, 0.0)
+
+    def scroll_to(self, view: QWidget, x: float, y: float) -> None:
+        pass
+
+    # ---------- downloads (optional for engines) ----------
+    def set_download_handler(self, handler: Callable[[object], None]) -> None:
+        """Call handler with the engine's download request whenever a page starts a download."""
+
+    # ---------- speculative loading (optional for engines) ----------
+    def preconnect(self, origin: str) -> None:
+        """Resolve and open a connection to origin ahead of navigation."""
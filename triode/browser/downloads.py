@@ -0,0 +1,563 @@
+# triode/browser/downloads.py
+# Downloads that outlive the page that started them. A large file from a
+# server that honours Range requests is fetched as several segments in
+# parallel, each written in place into a preallocated "<name>.part"; how far
+# each segment got is saved with the download list, so an interrupted
+# download (network error, pause, quit) picks up where it stopped. Anything
+# else is a single GET stream, or left to the browser engine. A download the
+# engine started is only taken over once a probe shows the same file (size
+# and type) is served to us with Range support, since we fetch without the
+# page's cookies or form data.
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ..session import atomic_write_json
+from ..settings import config_dir
+
+# states
+QUEUED = "queued"
+RUNNING = "running"
+PAUSED = "paused"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE = (QUEUED, RUNNING)
+
+CHUNK = 256 * 1024
+TIMEOUT = 30.0   # seconds without data before a connection counts as failed
+RETRIES = 3      # per segment, before the whole download fails
+USER_AGENT = "Triode"
+_MAX_KEPT = 100  # finished downloads remembered in downloads.json
+
+
+def _downloads_path() -> str:
+    return str(config_dir() / "downloads.json")
+
+
+def _request(url: str, start: Optional[int] = None, end: Optional[int] = None,
+             validator: Optional[str] = None) -> urllib.request.Request:
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept-Encoding": "identity"})
+    if start is not None:
+        req.add_header("Range", f"bytes={start}-{'' if end is None else end}")
+        if validator:
+            # if the file changed, the server sends all of it with 200 instead
+            req.add_header("If-Range", validator)
+    return req
+
+
+def _filename_from(url: str, disposition: Optional[str]) -> str:
+    if disposition:
+        msg = Message()
+        msg["Content-Disposition"] = disposition
+        name = msg.get_filename()
+        if name:
+            return os.path.basename(name)
+    name = os.path.basename(urllib.parse.unquote(urllib.parse.urlsplit(url).path))
+    return name or "download"
+
+
+def unique_path(directory: str, name: str) -> str:
+    """directory/name, or "name (1).ext" etc. if that (or its .part) is taken."""
+    stem, ext = os.path.splitext(name)
+    if stem.endswith(".tar"):
+        stem, ext = stem[:-4], ".tar" + ext
+    path = os.path.join(directory, name)
+    n = 1
+    while os.path.exists(path) or os.path.exists(path + ".part"):
+        path = os.path.join(directory, f"{stem} ({n}){ext}")
+        n += 1
+    return path
+
+
+class Segment:
+    __slots__ = ("start", "end", "done")
+
+    def __init__(self, start: int, end: int, done: int = 0):
+        self.start = start
+        self.end = end    # inclusive; -1 when the length is unknown
+        self.done = done  # bytes written from start
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.end < 0 else self.end - self.start + 1 - self.done
+
+
+class Download:
+    """One entry of the download list. Workers only touch segments and error."""
+
+    def __init__(self, url: str, path: str, id: int = 0):
+        self.id = id
+        self.url = url
+        self.path = path
+        self.total = -1             # bytes; -1 while unknown
+        self.ranges = False         # server honours Range: segments can resume
+        self.validator: Optional[str] = None  # ETag or Last-Modified of what we started on
+        self.from_engine = False    # started by a page; we may lack its cookies or form data
+        self.expected = -1          # size the engine announced, -1 if it didn't know
+        self.mime = ""              # content type the engine reported, "" if none
+        self.segments: List[Segment] = []
+        self.state = QUEUED
+        self.error = ""
+        self.speed = 0.0            # bytes/s, smoothed
+        self.engine = None          # the engine's download request, if the engine does the fetching
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._last = (0.0, 0)       # (time, received) at the last speed sample
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def received(self) -> int:
+        return sum(s.done for s in self.segments)
+
+    @property
+    def part_path(self) -> str:
+        return self.path + ".part"
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.id, "url": self.url, "path": self.path, "total": self.total,
+            "ranges": self.ranges, "validator": self.validator, "from_engine": self.from_engine,
+            "expected": self.expected, "mime": self.mime, "state": self.state,
+            "error": self.error, "segments": [[s.start, s.end, s.done] for s in self.segments],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Download":
+        d = cls(data["url"], data["path"], data.get("id", 0))
+        d.total = data.get("total", -1)
+        d.ranges = data.get("ranges", False)
+        d.validator = data.get("validator")
+        d.from_engine = data.get("from_engine", False)
+        d.expected = data.get("expected", -1)
+        d.mime = data.get("mime", "")
+        d.state = data.get("state", PAUSED)
+        d.error = data.get("error", "")
+        d.segments = [Segment(*s) for s in data.get("segments", ())]
+        return d
+
+
+# ---------- fetching (worker threads) ----------
+def _plan(total: int, count: int, min_size: int) -> List[Segment]:
+    count = max(1, min(count, total // max(1, min_size)))
+    size = -(-total // count)
+    return [Segment(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+
+def _copy(resp, f, seg: Segment, stop: threading.Event) -> None:
+    while not stop.is_set():
+        want = CHUNK if seg.remaining is None else min(CHUNK, seg.remaining)
+        if want == 0:
+            return
+        chunk = resp.read(want)
+        if not chunk:
+            if seg.remaining:
+                raise OSError("connection closed early")
+            return
+        f.write(chunk)  # unbuffered: a saved seg.done is always on disk
+        seg.done += len(chunk)
+
+
+def _fetch_segment(url: str, d: Download, seg: Segment, stop: threading.Event) -> None:
+    for attempt in range(RETRIES + 1):
+        try:
+            req = _request(url, seg.start + seg.done, seg.end, d.validator)
+            with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
+                if resp.status != 206:
+                    raise ValueError("file changed on the server")
+                with open(d.part_path, "r+b", buffering=0) as f:
+                    f.seek(seg.start + seg.done)
+                    _copy(resp, f, seg, stop)
+            return
+        except ValueError:
+            raise
+        except OSError:
+            if attempt == RETRIES or stop.is_set():
+                raise
+            stop.wait(1.0 * 2 ** attempt)
+
+
+def _content_type(resp) -> str:
+    return resp.headers.get("Content-Type", "").partition(";")[0].strip().lower()
+
+
+def probe(url: str) -> Tuple[bool, int, str]:
+    """(ranges work, total size or -1, content type) from a one-byte range request."""
+    with urllib.request.urlopen(_request(url, 0, 0), timeout=TIMEOUT) as resp:
+        size = resp.headers.get("Content-Range", "").rpartition("/")[2]
+        if resp.status == 206 and size.isdigit():
+            return True, int(size), _content_type(resp)
+        return False, int(resp.headers.get("Content-Length") or -1), _content_type(resp)
+
+
+_UNVERIFIABLE = "the browser didn't report the file's size and type"
+
+
+def verifiable(d: Download) -> bool:
+    """Whether we could tell if a server's file is d (always, unless the engine started d blind)."""
+    return not d.from_engine or (d.expected >= 0 and bool(d.mime))
+
+
+def mismatch(d: Download, total: int, content_type: str) -> str:
+    """Why we can't be sure the server's file is the one the engine offered for d ("" if we can)."""
+    if not d.from_engine:
+        return ""
+    if not verifiable(d):
+        return _UNVERIFIABLE
+    if total != d.expected:
+        return f"server sent {total} bytes, the browser expected {d.expected}"
+    if content_type != d.mime:
+        return f"server sent {content_type or 'no type'}, the browser expected {d.mime}"
+    return ""
+
+
+def fetch(d: Download, stop: threading.Event, segments: int = 4, min_segment: int = 4 << 20) -> None:
+    """
+    Download d into d.part_path, resuming from d.segments if they still match
+    the server's file. Returns when done or stopped; raises on failure,
+    including when d came from the engine and the server's file differs.
+    """
+    # a one-byte range request tells us the size and whether ranges work
+    resp = urllib.request.urlopen(_request(d.url, 0, 0), timeout=TIMEOUT)
+    try:
+        validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        ranges = resp.status == 206
+        if ranges:
+            size = resp.headers.get("Content-Range", "").rpartition("/")[2]
+            ranges = size.isdigit()
+            total = int(size) if ranges else -1
+        else:
+            total = int(resp.headers.get("Content-Length") or -1)
+        if resp.status == 206 and not ranges:
+            # a range reply without the file size is no use; start over without
+            resp.close()
+            resp = urllib.request.urlopen(_request(d.url), timeout=TIMEOUT)
+            total = int(resp.headers.get("Content-Length") or -1)
+        reason = mismatch(d, total, _content_type(resp))
+        if reason:
+            raise ValueError(reason)
+        url = resp.geturl()  # skip the redirects for the segments
+        resumable = ranges and d.ranges and d.segments and total == d.total and validator == d.validator
+        if not resumable:
+            d.total, d.ranges, d.validator = total, ranges, validator
+            if ranges and total > 0:
+                d.segments = _plan(total, segments, min_segment)
+            else:
+                d.segments = [Segment(0, total - 1 if total > 0 else -1)]
+            with open(d.part_path, "wb") as f:
+                if ranges and total > 0:
+                    f.truncate(total)  # segments write into their own slice
+        if not ranges:
+            # no ranges: this response is the download
+            with open(d.part_path, "r+b", buffering=0) as f:
+                _copy(resp, f, d.segments[0], stop)
+            return
+    finally:
+        resp.close()
+    pending = [s for s in d.segments if s.remaining]
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="triode-dl") as pool:
+        futures = [pool.submit(_fetch_segment, url, d, s, stop) for s in pending]
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(e)
+                stop.set()  # one failed segment fails the download; keep what the others wrote
+        if errors:
+            raise errors[0]
+
+
+class DownloadManager(QObject):
+    """
+    The download list. start() fetches a URL ourselves; handle_engine_request()
+    lets the browser engine do a download it offered and tracks it, and for a
+    big file over http probes the server meanwhile, switching to segments only
+    if we're served the same file with Range support.
+    changed(download) is emitted on state changes and on a 500 ms progress tick.
+    """
+
+    added = Signal(object)
+    changed = Signal(object)
+    removed = Signal(object)
+    _finished = Signal(object, str, str)  # worker -> GUI thread: download, state, error
+    _probed = Signal(object, object, str)  # worker -> GUI thread: download, engine request, mismatch
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        cfg = settings.get("downloads", {})
+        self.directory = os.path.expanduser(cfg.get("directory") or "~/Downloads")
+        self.segmented = cfg.get("segmented", True)
+        self.segments = int(cfg.get("segments", 4))
+        self.min_segment = int(cfg.get("min_segment_mb", 4)) << 20
+        self.downloads: List[Download] = []
+        self._next_id = 1
+        self._last_save = 0.0
+        self._tick = QTimer(self)
+        self._tick.setInterval(500)
+        self._tick.timeout.connect(self._on_tick)
+        self._finished.connect(self._on_finished)
+        self._probed.connect(self._on_probed)
+        self._load()
+
+    # ---------- list ----------
+    def _load(self) -> None:
+        try:
+            with open(_downloads_path(), encoding="utf-8") as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[Downloads] Ignoring unreadable download list: {e}")
+            return
+        for record in records:
+            try:
+                d = Download.from_json(record)
+            except (KeyError, TypeError) as e:
+                print(f"[Downloads] Skipping bad entry {record!r}: {e}")
+                continue
+            if d.state in ACTIVE:
+                d.state = PAUSED  # interrupted by quitting; resumable from the tab
+            self.downloads.append(d)
+            self._next_id = max(self._next_id, d.id + 1)
+
+    def save(self) -> None:
+        finished = [d for d in self.downloads if d.state not in ACTIVE + (PAUSED,)]
+        keep = set(map(id, finished[-_MAX_KEPT:]))
+        records = [d.to_json() for d in self.downloads if d.state in ACTIVE + (PAUSED,) or id(d) in keep]
+        try:
+            atomic_write_json(_downloads_path(), records)
+        except OSError as e:
+            print(f"[Downloads] Could not save download list: {e}")
+        self._last_save = time.monotonic()
+
+    def _add(self, d: Download) -> Download:
+        d.id = self._next_id
+        self._next_id += 1
+        self.downloads.append(d)
+        self.added.emit(d)
+        return d
+
+    def remove(self, d: Download) -> None:
+        """Forget a download that isn't running (the file stays)."""
+        if d.state in ACTIVE:
+            return
+        self.downloads.remove(d)
+        self.removed.emit(d)
+        self.save()
+
+    # ---------- our own fetches ----------
+    def start(self, url: str, filename: Optional[str] = None) -> Download:
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.basename(filename or "") or _filename_from(url, None)
+        d = self._add(Download(url, unique_path(self.directory, name)))
+        open(d.part_path, "ab").close()  # claims the name for concurrent downloads
+        self._run(d)
+        return d
+
+    def _run(self, d: Download) -> None:
+        d.state, d.error = RUNNING, ""
+        d._stop = stop = threading.Event()
+        d._last = (time.monotonic(), d.received)
+        d._thread = threading.Thread(target=self._work, args=(d, stop), name="triode-download", daemon=True)
+        d._thread.start()
+        self._tick.start()
+        self.changed.emit(d)
+        self.save()
+
+    def _work(self, d: Download, stop: threading.Event) -> None:
+        try:
+            fetch(d, stop, self.segments if self.segmented else 1, self.min_segment)
+        except Exception as e:
+            if not stop.is_set() or d.state == RUNNING:
+                self._finished.emit(d, FAILED, str(e))
+                return
+        if stop.is_set():
+            return  # paused or cancelled; the GUI side already set the state
+        try:
+            path = d.path if not os.path.exists(d.path) else unique_path(os.path.dirname(d.path), d.name)
+            os.replace(d.part_path, path)
+            d.path = path
+        except OSError as e:
+            self._finished.emit(d, FAILED, str(e))
+            return
+        self._finished.emit(d, DONE, "")
+
+    def pause(self, d: Download) -> None:
+        if d.state not in ACTIVE:
+            return
+        if d.engine is not None:
+            d.engine.pause()
+        elif d._stop is not None:
+            d._stop.set()
+        d.state = PAUSED
+        d.speed = 0.0
+        self.changed.emit(d)
+        self.save()
+
+    def resume(self, d: Download) -> None:
+        if d.state not in (PAUSED, FAILED):
+            return
+        if d.engine is not None and d.state == PAUSED:
+            d.engine.resume()
+            d.state = RUNNING
+            self._tick.start()
+            self.changed.emit(d)
+            return
+        d.engine = None  # an engine download that failed is retried by us
+        if not verifiable(d):
+            # without the page's cookies we might save a login or error page instead
+            d.state, d.error = FAILED, _UNVERIFIABLE + "; download it again from the page"
+            self.changed.emit(d)
+            self.save()
+            return
+        if d._thread is not None and d._thread.is_alive():
+            # the paused worker is still finishing a chunk; two would write one segment
+            QTimer.singleShot(200, lambda: self.resume(d))
+            return
+        self._run(d)
+
+    def cancel(self, d: Download) -> None:
+        if d.state in (DONE, CANCELLED):
+            return
+        if d.engine is not None:
+            d.engine.cancel()
+        elif d._stop is not None:
+            d._stop.set()
+        d.state = CANCELLED
+        d.speed = 0.0
+        try:
+            os.unlink(d.part_path)
+        except OSError:
+            pass
+        self.changed.emit(d)
+        self.save()
+
+    def _on_finished(self, d: Download, state: str, error: str) -> None:
+        if d.state != RUNNING:
+            return  # paused or cancelled meanwhile
+        d.state, d.error, d.speed = state, error, 0.0
+        if error:
+            print(f"[Downloads] {d.url} failed: {error}")
+        self.changed.emit(d)
+        self.save()
+
+    def _on_tick(self) -> None:
+        now = time.monotonic()
+        running = [d for d in self.downloads if d.state == RUNNING]
+        for d in running:
+            then, before = d._last
+            received = d.received
+            if now > then:
+                rate = (received - before) / (now - then)
+                d.speed = rate if d.speed == 0 else 0.7 * d.speed + 0.3 * rate
+            d._last = (now, received)
+            self.changed.emit(d)
+        if not running:
+            self._tick.stop()
+        elif now - self._last_save > 5:
+            self.save()  # checkpoint segment progress for resume after a crash
+
+    def shutdown(self) -> None:
+        """Stop our fetches (they resume next time) and write the list."""
+        for d in self.downloads:
+            if d.state in ACTIVE and d.engine is None and d._stop is not None:
+                d._stop.set()
+                d.state = PAUSED
+        self.save()
+
+    # ---------- engine downloads ----------
+    def handle_engine_request(self, request) -> Optional[Download]:
+        """
+        Take a QWebEngineDownloadRequest (must be called from the engine's
+        downloadRequested signal, before it returns).
+        """
+        url = bytes(request.url().toEncoded()).decode("ascii")  # percent-encoded, as urllib needs
+        name = request.downloadFileName() or _filename_from(url, None)
+        total = request.totalBytes()
+        os.makedirs(self.directory, exist_ok=True)
+        d = self._add(Download(url, unique_path(self.directory, name)))
+        d.total = total
+        d.segments = [Segment(0, total - 1)]
+        d.from_engine = True  # if we ever fetch it ourselves, it must be this file
+        d.expected = total if total > 0 else -1
+        d.mime = request.mimeType().partition(";")[0].strip().lower()
+        d.engine = request
+        d.state = RUNNING
+        request.setDownloadDirectory(self.directory)
+        request.setDownloadFileName(d.name)
+        request.receivedBytesChanged.connect(lambda d=d: self._on_engine_progress(d))
+        request.totalBytesChanged.connect(lambda d=d: self._on_engine_progress(d))
+        request.isFinishedChanged.connect(lambda d=d: self._on_engine_finished(d))
+        request.accept()
+        d._last = (time.monotonic(), 0)
+        self._tick.start()
+        self.changed.emit(d)
+        self.save()
+        if self.segmented and url.startswith(("http://", "https://")) and total >= 2 * self.min_segment:
+            # the engine's copy is one stream that can't resume; re-fetch in
+            # segments if the server gives us the same file without the page's
+            # cookies (or POST data, which the engine doesn't tell us about)
+            threading.Thread(target=self._probe, args=(d, request), name="triode-download-probe",
+                             daemon=True).start()
+        return d
+
+    def _probe(self, d: Download, request) -> None:
+        try:
+            ranges, total, content_type = probe(d.url)
+            reason = mismatch(d, total, content_type) if ranges else "server does not support ranges"
+        except Exception as e:
+            reason = str(e) or type(e).__name__
+        self._probed.emit(d, request, reason)
+
+    def _on_probed(self, d: Download, request, reason: str) -> None:
+        if reason:
+            print(f"[Downloads] Leaving {d.url} to the browser: {reason}")
+        if reason or d.engine is not request or d.state != RUNNING:
+            return  # stays the engine's (or was paused, cancelled or finished meanwhile)
+        d.engine = None  # so _on_engine_finished ignores the cancel
+        request.cancel()
+        d.segments = []
+        d.ranges = False
+        if os.path.exists(d.part_path):
+            d.path = unique_path(os.path.dirname(d.path), d.name)  # another of ours has the name
+        open(d.part_path, "ab").close()
+        self._run(d)
+
+    def _on_engine_progress(self, d: Download) -> None:
+        if d.engine is None:
+            return  # taken over by us
+        d.total = d.engine.totalBytes()
+        d.segments[0].end = d.total - 1
+        d.segments[0].done = d.engine.receivedBytes()
+
+    def _on_engine_finished(self, d: Download) -> None:
+        request = d.engine
+        if d.state == CANCELLED or request is None:
+            return
+        self._on_engine_progress(d)
+        state = request.state().name
+        if state == "DownloadCompleted":
+            d.state, d.error = DONE, ""
+        elif state == "DownloadCancelled":
+            d.state = CANCELLED
+        else:
+            d.state, d.error = FAILED, request.interruptReasonString()
+        d.engine = None  # finished requests are deleted by the engine
+        d.speed = 0.0
+        self.changed.emit(d)
+        self.save()
+
@@ -0,0 +1,132 @@
+# triode/browser/downloads_tab.py
+import os
+from typing import Dict, Optional
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QToolBar, QTreeWidget, QTreeWidgetItem
+from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt, Signal
+
+from .downloads import ACTIVE, DONE, FAILED, PAUSED, RUNNING, Download, DownloadManager
+
+
+def _human(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def _progress(d: Download) -> str:
+    received = d.received
+    if d.state == DONE:
+        return _human(max(d.total, received))
+    if d.total > 0:
+        text = f"{received * 100 // d.total}% of {_human(d.total)}"
+    else:
+        text = _human(received)
+    if d.state == RUNNING and d.speed > 0:
+        text += f", {_human(d.speed)}/s"
+        if d.total > 0:
+            left = (d.total - received) / d.speed
+            text += f", {int(left // 60)}:{int(left % 60):02d} left"
+    return text
+
+
+class DownloadsTab(QWidget):
+    """
+    about:downloads: the DownloadManager's list, newest first. Double-clicking
+    a finished download shows it in an explorer tab (reveal_requested).
+    """
+
+    tab_kind = "downloads"
+    reveal_requested = Signal(str)
+
+    def __init__(self, manager: DownloadManager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self._items: Dict[int, QTreeWidgetItem] = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QToolBar()
+        for label, slot in (("Pause", self._pause), ("Resume", self._resume), ("Cancel", self._cancel),
+                            ("Show in Folder", self._reveal), ("Clear Finished", self._clear)):
+            act = QAction(label, self)
+            act.triggered.connect(slot)
+            toolbar.addAction(act)
+        layout.addWidget(toolbar)
+
+        self.tree = QTreeWidget()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setHeaderLabels(["File", "Progress", "Status", "URL"])
+        self.tree.setColumnWidth(0, 260)
+        self.tree.setColumnWidth(1, 260)
+        self.tree.itemDoubleClicked.connect(lambda item, col: self._reveal())
+        layout.addWidget(self.tree)
+
+        for d in manager.downloads:
+            self._add(d)
+        manager.added.connect(self._add)
+        manager.changed.connect(self._update)
+        manager.removed.connect(self._remove)
+
+    def navigate_to(self, path: str):
+        pass
+
+    def _add(self, d: Download) -> None:
+        item = QTreeWidgetItem()
+        item.setData(0, Qt.ItemDataRole.UserRole, d)
+        self._items[d.id] = item
+        self.tree.insertTopLevelItem(0, item)
+        self._update(d)
+
+    def _update(self, d: Download) -> None:
+        item = self._items.get(d.id)
+        if item is None:
+            return
+        if not self.isVisible() and d.state == RUNNING and item.text(2) == RUNNING:
+            return  # progress ticks only matter on screen; showEvent catches up
+        item.setText(0, d.name)
+        item.setText(1, _progress(d))
+        item.setText(2, f"{d.state}: {d.error}" if d.state == FAILED else d.state)
+        item.setText(3, d.url)
+        item.setToolTip(0, d.path)
+
+    def _remove(self, d: Download) -> None:
+        item = self._items.pop(d.id, None)
+        if item is not None:
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        for d in self.manager.downloads:
+            self._update(d)
+
+    def _selected(self) -> Optional[Download]:
+        item = self.tree.currentItem()
+        return item.data(0, Qt.ItemDataRole.UserRole) if item is not None else None
+
+    def _pause(self):
+        d = self._selected()
+        if d is not None:
+            self.manager.pause(d)
+
+    def _resume(self):
+        d = self._selected()
+        if d is not None:
+            self.manager.resume(d)
+
+    def _cancel(self):
+        d = self._selected()
+        if d is not None:
+            self.manager.cancel(d)
+
+    def _reveal(self):
+        d = self._selected()
+        if d is not None and d.state == DONE and os.path.exists(d.path):
+            self.reveal_requested.emit(d.path)
+
+    def _clear(self):
+        for d in [d for d in self.manager.downloads if d.state not in ACTIVE + (PAUSED,)]:
+            self.manager.remove(d)
@@ -2,29 +2,29 @@
 import platform
 from .backend import BrowserBackend
 
+# Engines we'd like to support eventually but have no backend module for yet.
+# CEF: might skip and just use QT for chromium.
+# WebKitGTK: vital for spirit of project, but not in current scope.
+# GECKO: this is the master goal, but very complex. Not in current scope.
+PLANNED_ENGINES = ("cef", "webkit", "gecko")
+
 def _default_engine() -> str:
     if platform.system() in ("Linux", "Darwin"):
         return "qt"
     return "qt"
 
-def get_browser_backend(engine: str | None = None) -> BrowserBackend:
+def get_browser_backend(engine: str | None = None, settings: dict | None = None) -> BrowserBackend:
     if engine is None:
         engine = _default_engine()
     engine = engine.lower()
-    # Only QT is implemented for now
+    if engine in PLANNED_ENGINES:
+        print(f"[browser] Engine '{engine}' is not implemented yet; using qt")
+        engine = "qt"
     if engine == "qt":
         from .qt_backend import QTBackend
-        return QTBackend()
-    # TODO: CEF implementation pending, might skip and just use QT for chromium 
-    if engine == "cef":
-        from .cef_backend import CefBackend
-        return CefBackend()
-    # TODO: WebKitGTK implementation pending, vital for spirit of project, but not in current scope
-    if engine == "webkit":
-        from .webkit_backend import WebkitBackend
-        return WebkitBackend()
-    # TODO: GECKO! This is the master goal, but very complex. Not in current scope.
-    if engine == "gecko":
-        from .gecko_backend import GeckoBackend
-        return GeckoBackend()
+        return QTBackend(settings)
+    # Headless stand-in for tests and benchmarks
+    if engine == "stub":
+        from .stub_backend import StubBackend
+        return StubBackend(settings)
     raise ValueError(f"Unknown browser engine: {engine}")
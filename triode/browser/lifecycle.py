@@ -0,0 +1,147 @@
+# triode/browser/lifecycle.py
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from ..procfs import mem_available_bytes
+
+
+class TabLifecycleManager(QObject):
+    """
+    Freezes and discards background browser tabs.
+
+    Tabs are kept in an LRU (most recently active last). A periodic sweep
+    freezes tabs idle for longer than freeze_after_s, discards tabs idle for
+    longer than discard_after_s, and discards least-recently-used tabs while
+    the renderers' combined RSS exceeds memory_budget_mb, or while the
+    system's MemAvailable is below min_available_mb.
+    """
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        cfg = settings.get("browser", {})
+        self.freeze_after = float(cfg.get("freeze_after_s", 60))
+        self.discard_after = float(cfg.get("discard_after_s", 900))
+        budget_mb = cfg.get("memory_budget_mb", 2048)
+        self.memory_budget = int(budget_mb) * 1024 * 1024 if budget_mb else None
+        self.min_available = int(cfg.get("min_available_mb", 512)) * 1024 * 1024
+
+        self._lru: "OrderedDict[int, tuple]" = OrderedDict()  # id -> (tab, last_active)
+        self._active: Optional[int] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(cfg.get("lifecycle_interval_ms", 5000)))
+        self._timer.timeout.connect(self.sweep)
+        self._timer.start()
+
+    def add(self, tab) -> None:
+        self._lru[id(tab)] = (tab, time.monotonic())
+
+    def remove(self, tab) -> None:
+        self._lru.pop(id(tab), None)
+        if self._active == id(tab):
+            self._active = None
+
+    def activate(self, tab) -> None:
+        """Mark tab as foreground and bring it back if it was frozen or discarded."""
+        now = time.monotonic()
+        # the tab we leave starts its idle clock now
+        if self._active is not None and self._active in self._lru:
+            prev, _ = self._lru[self._active]
+            self._lru[self._active] = (prev, now)
+        self._active = None
+        if id(tab) not in self._lru:
+            return
+        self._active = id(tab)
+        self._lru[id(tab)] = (tab, now)
+        self._lru.move_to_end(id(tab))
+        tab.resume()
+
+    def deactivate(self) -> None:
+        """Called when a non-browser tab becomes current."""
+        if self._active is not None and self._active in self._lru:
+            prev, _ = self._lru[self._active]
+            self._lru[self._active] = (prev, time.monotonic())
+        self._active = None
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        background = [
+            (key, tab, last) for key, (tab, last) in self._lru.items() if key != self._active
+        ]
+        for _key, tab, last in background:
+            idle = now - last
+            try:
+                if idle >= self.discard_after:
+                    tab.discard()
+                elif idle >= self.freeze_after:
+                    tab.freeze()
+            except RuntimeError:
+                # underlying C++ object already deleted
+                self.remove(tab)
+        # without the tabs removed above
+        self._enforce_budget([entry for entry in background if entry[0] in self._lru])
+
+    def _renderers(self) -> list[tuple]:
+        """(tab, renderer pid, RSS) per tracked tab; tabs whose widget is gone are dropped."""
+        out = []
+        for tab, _ in list(self._lru.values()):
+            try:
+                out.append((tab, tab.renderer_pid(), tab.memory_usage()))
+            except RuntimeError:
+                self.remove(tab)  # underlying C++ object already deleted
+        return out
+
+    def renderer_memory(self) -> int:
+        """Combined RSS of all live renderer processes (shared ones counted once)."""
+        seen = set()
+        total = 0
+        for _tab, pid, rss in self._renderers():
+            if pid:
+                if pid in seen:
+                    continue
+                seen.add(pid)
+            total += rss
+        return total
+
+    def _budget(self, total: int) -> Optional[int]:
+        """What the renderers may use now: the configured budget, less any shortfall in free memory."""
+        budget = self.memory_budget
+        available = mem_available_bytes()
+        if available is not None and available < self.min_available:
+            squeezed = max(0, total - (self.min_available - available))
+            budget = squeezed if budget is None else min(budget, squeezed)
+        return budget
+
+    def _enforce_budget(self, background) -> None:
+        total = self.renderer_memory()
+        budget = self._budget(total)
+        if budget is None:
+            return
+        # tabs sharing a renderer only free its memory once the last of them goes
+        sharing: dict[int, int] = {}
+        for _tab, pid, _rss in self._renderers():
+            if pid:
+                sharing[pid] = sharing.get(pid, 0) + 1
+        # background is in LRU order, oldest first
+        for _key, tab, _last in background:
+            if total <= budget:
+                break
+            try:
+                if tab.lifecycle_state() == "discarded":
+                    continue
+                pid = tab.renderer_pid()
+                freed = tab.memory_usage()
+                tab.discard()
+                if tab.lifecycle_state() != "discarded":
+                    continue  # e.g. visible in another window; nothing was freed
+            except RuntimeError:
+                self.remove(tab)
+                continue
+            if pid:
+                sharing[pid] -= 1
+                if sharing[pid]:
+                    continue
+            total -= freed
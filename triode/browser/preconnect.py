@@ -0,0 +1,95 @@
+# triode/browser/preconnect.py
+import time
+import urllib.parse
+from collections import deque
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+
+def origin_of(url: str) -> Optional[str]:
+    """scheme://host[:port] for http(s) URLs that look complete enough to warm up."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return None
+    host = parts.hostname or ""
+    if parts.scheme not in ("http", "https") or not host:
+        return None
+    # "exam" or "example." are still being typed; wait for a plausible TLD
+    if host != "localhost":
+        label = host.rsplit(".", 1)[-1]
+        if "." not in host or len(label) < 2:
+            return None
+    netloc = host if parts.port is None else f"{host}:{parts.port}"
+    return f"{parts.scheme}://{netloc}"
+
+
+class Preconnector(QObject):
+    """
+    Warms up DNS/TCP/TLS for the origin being typed in the address bar.
+
+    hint() is cheap and may be called on every keystroke: the work runs only
+    after the user pauses for delay_ms, each origin is warmed at most once per
+    cooldown_s, and no more than per_minute warm-ups are issued.
+    """
+
+    def __init__(self, get_backend: Callable, router, settings: dict, parent=None):
+        super().__init__(parent)
+        # a getter, so the browser engine isn't loaded until a warm-up is due
+        self.get_backend = get_backend
+        self.router = router
+        cfg = settings.get("browser", {})
+        self.enabled = cfg.get("preconnect", True)
+        self.cooldown = float(cfg.get("preconnect_cooldown_s", 60))
+        self.per_minute = int(cfg.get("preconnect_per_minute", 20))
+
+        self._pending_text = ""
+        self._recent: dict[str, float] = {}  # origin -> last warm-up time
+        self._issued: deque[float] = deque()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(int(cfg.get("preconnect_delay_ms", 150)))
+        self._timer.timeout.connect(self._fire)
+
+    def hint(self, text: str) -> None:
+        if not self.enabled:
+            return
+        self._pending_text = text
+        self._timer.start()  # restart: only act once typing pauses
+
+    def cancel(self) -> None:
+        self._timer.stop()
+        self._pending_text = ""
+
+    def _fire(self) -> None:
+        text, self._pending_text = self._pending_text, ""
+        if not text:
+            return
+        route = self.router.parse(text)
+        if route.scheme not in ("http", "https"):
+            return
+        origin = origin_of(route.path)
+        if origin is None or not self._allow(origin):
+            return
+        try:
+            self.get_backend().preconnect(origin)
+        except Exception as e:
+            print(f"[Preconnector] preconnect failed for {origin}: {e}")
+
+    def _allow(self, origin: str) -> bool:
+        now = time.monotonic()
+        last = self._recent.get(origin)
+        if last is not None and now - last < self.cooldown:
+            return False
+        while self._issued and now - self._issued[0] > 60:
+            self._issued.popleft()
+        if len(self._issued) >= self.per_minute:
+            return False
+        self._issued.append(now)
+        self._recent[origin] = now
+        if len(self._recent) > 256:
+            # forget origins whose cooldown has long expired
+            self._recent = {o: t for o, t in self._recent.items() if now - t < self.cooldown}
+        return True
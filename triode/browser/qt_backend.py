@@ -1,24 +1,163 @@
 # triode/browser/webkit_backend.py
+import os
+from pathlib import Path
+
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtWebEngineWidgets import QWebEngineView  # fallback if WebKitGTK not found
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+from PySide6.QtCore import QCoreApplication, QUrl
 from .backend import BrowserBackend
+from ..procfs import rss_bytes
 
 # NOTE: PySide6 bundles QtWebEngine by default, so we use this as stand-in
 # for WebKitGTK until you install PyGObject + WebKit2GTK.
 # Later we can implement a true GtkWidget backend for Unix.
 
+_STATES = {
+    QWebEnginePage.LifecycleState.Active: "active",
+    QWebEnginePage.LifecycleState.Frozen: "frozen",
+    QWebEnginePage.LifecycleState.Discarded: "discarded",
+}
+
+
+def _xdg_dir(env: str, fallback: str) -> Path:
+    base = os.environ.get(env) or str(Path.home() / fallback)
+    return Path(base) / "triode"
+
+
 class QTBackend(BrowserBackend):
+    def __init__(self, settings: dict | None = None):
+        self.settings = (settings or {}).get("browser", {})
+        self._profile: QWebEngineProfile | None = None
+        self._warmup_page: QWebEnginePage | None = None
+        self._download_handler = None
+
+    def profile(self) -> QWebEngineProfile:
+        """
+        The one profile shared by every view this backend creates.
+        Created on first use so QtWebEngine isn't touched before a browser tab exists.
+        """
+        if self._profile is None:
+            self._profile = self._build_profile()
+        return self._profile
+
+    def _build_profile(self) -> QWebEngineProfile:
+        cfg = self.settings
+        name = cfg.get("profile", "default")
+        # A named profile is disk-backed; the parent keeps it alive past any tab
+        profile = QWebEngineProfile(name, QCoreApplication.instance())
+
+        cache_dir = Path(cfg.get("cache_dir") or _xdg_dir("XDG_CACHE_HOME", ".cache") / "web" / name)
+        storage_dir = Path(
+            cfg.get("storage_dir") or _xdg_dir("XDG_DATA_HOME", ".local/share") / "web" / name
+        )
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        storage_dir.mkdir(parents=True, exist_ok=True)
+        profile.setCachePath(str(cache_dir))
+        profile.setPersistentStoragePath(str(storage_dir))
+
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        # 0 lets Chromium pick its own size
+        profile.setHttpCacheMaximumSize(int(cfg.get("cache_size_mb", 256)) * 1024 * 1024)
+
+        if cfg.get("persistent_cookies", True):
+            policy = QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
+        else:
+            policy = QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies
+        profile.setPersistentCookiesPolicy(policy)
+        profile.downloadRequested.connect(self._on_download_requested)
+        return profile
+
+    def set_download_handler(self, handler) -> None:
+        self._download_handler = handler
+
+    def _on_download_requested(self, request) -> None:
+        # the request is cancelled if it isn't accepted before this returns
+        if self._download_handler is None:
+            return
+        try:
+            self._download_handler(request)
+        except Exception as e:
+            print(f"[QTBackend] Download handler failed for {request.url().toString()}: {e}")
+
+    def new_web_view(self, parent: QWidget | None = None) -> QWebEngineView:
+        """A bare QWebEngineView whose page lives in the shared profile."""
+        view = QWebEngineView(parent)
+        view.setPage(QWebEnginePage(self.profile(), view))
+        return view
+
     def create_view(self, parent: QWidget | None = None) -> QWidget:
         container = QWidget(parent)
         layout = QVBoxLayout(container)
-        view = QWebEngineView(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        view = self.new_web_view(container)
         layout.addWidget(view)
         container.setLayout(layout)
         container._view = view
         return container
 
     def load_url(self, view: QWidget, url: str) -> None:
-        view._view.setUrl(url)
+        view._view.setUrl(QUrl(url))
 
     def current_url(self, view: QWidget) -> str:
         return view._view.url().toString()
+
+    def title(self, view: QWidget) -> str:
+        return view._view.title()
+
+    def connect_signals(self, view, url_changed=None, title_changed=None,
+                        load_finished=None, scroll_changed=None) -> None:
+        web = view._view
+        if url_changed:
+            web.urlChanged.connect(lambda qurl: url_changed(qurl.toString()))
+        if title_changed:
+            web.titleChanged.connect(title_changed)
+        if load_finished:
+            web.loadFinished.connect(load_finished)
+        if scroll_changed:
+            web.page().scrollPositionChanged.connect(lambda pos: scroll_changed(pos.x(), pos.y()))
+
+    # ---------- lifecycle ----------
+    def suspend(self, view: QWidget, discard: bool = False) -> None:
+        # QtWebEngine refuses to freeze/discard a visible page
+        if view.isVisible():
+            return
+        state = QWebEnginePage.LifecycleState.Discarded if discard else QWebEnginePage.LifecycleState.Frozen
+        view._view.page().setLifecycleState(state)
+
+    def resume(self, view: QWidget) -> None:
+        view._view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+    def lifecycle_state(self, view: QWidget) -> str:
+        return _STATES.get(view._view.page().lifecycleState(), "active")
+
+    def renderer_pid(self, view: QWidget) -> int:
+        return view._view.page().renderProcessPid()
+
+    def memory_usage(self, view: QWidget) -> int | None:
+        pid = self.renderer_pid(view)
+        return rss_bytes(pid) if pid else None
+
+    # ---------- page helpers ----------
+    def scroll_position(self, view: QWidget) -> tuple[float, float]:
+        pos = view._view.page().scrollPosition()
+        return (pos.x(), pos.y())
+
+    def scroll_to(self, view: QWidget, x: float, y: float) -> None:
+        view._view.page().runJavaScript(f"window.scrollTo({x}, {y});")
+
+    # ---------- speculative loading ----------
+    def preconnect(self, origin: str) -> None:
+        """
+        Ask Chromium to preconnect through an offscreen page in the shared profile,
+        so the warmed socket is reused by the tab that navigates there next.
+        """
+        if self._warmup_page is None:
+            self._warmup_page = QWebEnginePage(self.profile(), QCoreApplication.instance())
+        href = origin.replace('"', "%22")
+        html = (
+            f'<link rel="dns-prefetch" href="{href}">'
+            f'<link rel="preconnect" href="{href}" crossorigin>'
+            f'<link rel="preconnect" href="{href}">'
+        )
+        self._warmup_page.setHtml(html, QUrl("about:blank"))
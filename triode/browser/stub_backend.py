@@ -0,0 +1,99 @@
+# triode/browser/stub_backend.py
+# Headless browser backend: no Chromium, no network, no renderer process.
+# Select it with {"browser": {"engine": "stub"}} to exercise and benchmark
+# tab management (creation, switching, suspension, sessions) cheaply.
+from typing import Optional
+
+from PySide6.QtWidgets import QWidget
+from .backend import BrowserBackend
+
+
+class StubView(QWidget):
+    """Plain widget standing in for a web view; keeps just enough page state."""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.url = ""
+        self.page_title = ""
+        self.state = "active"
+        self.scroll = (0.0, 0.0)
+        self.loads = 0
+        self._url_cbs = []
+        self._title_cbs = []
+        self._load_cbs = []
+        self._scroll_cbs = []
+
+
+class StubBackend(BrowserBackend):
+    def __init__(self, settings: dict | None = None, memory_per_view: int = 0):
+        # pretend footprint of each active view, so memory budgets can be tested
+        self.memory_per_view = memory_per_view
+        self.preconnected: list[str] = []
+
+    def create_view(self, parent: Optional[QWidget] = None) -> QWidget:
+        return StubView(parent)
+
+    def load_url(self, view: StubView, url: str) -> None:
+        view.url = url
+        view.page_title = url
+        view.scroll = (0.0, 0.0)
+        view.loads += 1
+        view.state = "active"
+        for cb in view._url_cbs:
+            cb(url)
+        for cb in view._title_cbs:
+            cb(view.page_title)
+        for cb in view._load_cbs:
+            cb(True)
+
+    def current_url(self, view: StubView) -> str:
+        return view.url
+
+    def title(self, view: StubView) -> str:
+        return view.page_title
+
+    def connect_signals(self, view, url_changed=None, title_changed=None,
+                        load_finished=None, scroll_changed=None) -> None:
+        if url_changed:
+            view._url_cbs.append(url_changed)
+        if title_changed:
+            view._title_cbs.append(title_changed)
+        if load_finished:
+            view._load_cbs.append(load_finished)
+        if scroll_changed:
+            view._scroll_cbs.append(scroll_changed)
+
+    def suspend(self, view: StubView, discard: bool = False) -> None:
+        if view.isVisible():
+            return
+        if discard:
+            # mirror QtWebEngine: a discarded page forgets its URL
+            view.state = "discarded"
+            view.url = ""
+            view.page_title = ""
+        elif view.state == "active":
+            view.state = "frozen"
+
+    def resume(self, view: StubView) -> None:
+        if view.state == "frozen":
+            view.state = "active"
+        elif view.state == "discarded":
+            # the page comes back empty; BrowserTab reloads its saved URL
+            view.state = "active"
+
+    def lifecycle_state(self, view: StubView) -> str:
+        return view.state
+
+    def memory_usage(self, view: StubView) -> Optional[int]:
+        return self.memory_per_view if view.state != "discarded" else 0
+
+    def scroll_position(self, view: StubView) -> tuple[float, float]:
+        return view.scroll
+
+    def preconnect(self, origin: str) -> None:
+        self.preconnected.append(origin)
+
+    def scroll_to(self, view: StubView, x: float, y: float) -> None:
+        view.scroll = (x, y)
+        for cb in view._scroll_cbs:
+            cb(x, y)
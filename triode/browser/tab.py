@@ -1,37 +1,112 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtCore import QUrl, Signal
+from PySide6.QtCore import Signal
+
+from .backend import BrowserBackend
 
 
 class BrowserTab(QWidget):
+    tab_kind = "browser"
     url_changed = Signal(str)  # Add this signal
     title_changed = Signal(str)  # Add this signal
+    scroll_changed = Signal(float, float)
 
-    def __init__(self, url: str = "https://example.com"):
+    def __init__(self, url: str = "https://example.com", backend: BrowserBackend | None = None):
         super().__init__()
-        self._view = QWebEngineView()
-        self._view.setUrl(QUrl(url))
+        if backend is None:
+            from .factory import get_browser_backend
+            backend = get_browser_backend()
+        self.backend = backend
+        self._view = backend.create_view(self)
+
+        # Kept across discards so the tab can be restored and labelled
+        self._saved_url = url
+        self._saved_title = ""
+        self._pending_scroll = None
 
         # Connect internal signals
-        self._view.urlChanged.connect(self._on_url_changed)
-        self._view.titleChanged.connect(self._on_title_changed)
+        backend.connect_signals(
+            self._view,
+            url_changed=self._on_url_changed,
+            title_changed=self._on_title_changed,
+            load_finished=self._apply_pending_scroll,
+            scroll_changed=self.scroll_changed.emit,
+        )
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self._view)
 
+        backend.load_url(self._view, url)
+
     def navigate_to(self, url: str):
         """Navigate this browser tab to a new URL."""
-        self._view.setUrl(QUrl(url))
+        self.backend.load_url(self._view, url)
 
-    def _on_url_changed(self, qurl):
-        #print("[SIGNAL]WebView URL changed:", qurl.toString())
-        self.url_changed.emit(qurl.toString())
+    def _on_url_changed(self, url: str):
+        #print("[SIGNAL]WebView URL changed:", url)
+        if not url:
+            # a discarded page reports an empty URL; keep showing the saved one
+            return
+        self._saved_url = url
+        self.url_changed.emit(url)
 
     def _on_title_changed(self, title):
         print("[SIGNAL]WebView title changed:", title)
+        if not title and self.lifecycle_state() == "discarded":
+            return
+        self._saved_title = title
         self.title_changed.emit(title)
 
     def current_url(self) -> str:
         """Return the current URL as a string (for address bar updates)."""
-        return self._view.url().toString()
+        return self.backend.current_url(self._view) or self._saved_url
+
+    def title(self) -> str:
+        return self.backend.title(self._view) or self._saved_title
+
+    # ---------- Lifecycle (see browser/lifecycle.py) ----------
+    def lifecycle_state(self) -> str:
+        return self.backend.lifecycle_state(self._view)
+
+    def freeze(self) -> None:
+        """Stop script execution; the renderer keeps the page in memory."""
+        if self.isVisible() or self.lifecycle_state() != "active":
+            return
+        self.backend.suspend(self._view)
+
+    def discard(self) -> None:
+        """Release the renderer; the page reloads from _saved_url on resume()."""
+        if self.isVisible() or self.lifecycle_state() == "discarded":
+            return
+        self._saved_url = self.current_url()
+        self._saved_title = self.title()
+        self.backend.suspend(self._view, discard=True)
+
+    def resume(self) -> None:
+        state = self.lifecycle_state()
+        if state == "active":
+            return
+        self.backend.resume(self._view)
+        if state == "discarded" and not self.backend.current_url(self._view) and self._saved_url:
+            self.backend.load_url(self._view, self._saved_url)
+
+    def renderer_pid(self) -> int:
+        """PID of the renderer process, or 0 if there is none (e.g. discarded)."""
+        return self.backend.renderer_pid(self._view)
+
+    def memory_usage(self) -> int:
+        return self.backend.memory_usage(self._view) or 0
+
+    def scroll_position(self) -> tuple[float, float]:
+        return self.backend.scroll_position(self._view)
+
+    def restore_scroll(self, x: float, y: float):
+        """Scroll to (x, y) once the current page has finished loading."""
+        self._pending_scroll = (x, y)
+
+    def _apply_pending_scroll(self, ok: bool):
+        if not ok or self._pending_scroll is None:
+            return
+        x, y = self._pending_scroll
+        self._pending_scroll = None
+        self.backend.scroll_to(self._view, x, y)
@@ -0,0 +1,24 @@
+# triode/cli.py
+# Console entry point: `triode [--new-instance] [URL | ROUTE | PATH ...]`.
+# If Triode is already running the targets are handed to it over a local
+# socket and this process exits right away; otherwise a new instance starts.
+import sys
+
+from .ipc import normalize_target, send_to_running
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    new_instance = "--new-instance" in args
+    targets = [normalize_target(a) for a in args if not a.startswith("-")]
+    if not new_instance and send_to_running(targets):
+        return
+
+    # the remaining flags (--perf, --profile-startup, Qt's own) are app.main's
+    sys.argv = [sys.argv[0]] + [a for a in args if a.startswith("-") and a != "--new-instance"]
+    from .app import main as app_main
+    app_main(targets)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,34 +6,56 @@ import sys
 from typing import List
 from pathlib import Path
 
+from .. import perf
+from . import archive_vfs
+
+def _check_writable(*paths: str) -> None:
+    for path in paths:
+        location = archive_vfs.split_archive_path(path)
+        if location is not None and location[1]:
+            raise PermissionError(f"Archives are read-only: {path}")
+
+@perf.timed("explorer.list_dir")
 def list_dir(path: str) -> List[os.DirEntry]:
-    """Return a sorted list of DirEntry for given path."""
+    """Return a sorted list of DirEntry for given path (archive members as VEntry)."""
+    key = lambda e: (not e.is_dir(), e.name.lower())
+    location = archive_vfs.split_archive_path(path)
+    if location is not None:
+        return sorted(archive_vfs.list_dir(*location), key=key)
     try:
-        return sorted(os.scandir(path), key=lambda e: (not e.is_dir(), e.name.lower()))
+        return sorted(os.scandir(path), key=key)
     except FileNotFoundError:
         return []
 
 def copy_items(sources: List[str], dest_dir: str) -> None:
+    _check_writable(os.path.join(dest_dir, "x"))
     for src in sources:
         name = os.path.basename(src)
         dst = os.path.join(dest_dir, name)
-        if os.path.isdir(src):
+        location = archive_vfs.split_archive_path(src)
+        if location is not None and location[1]:
+            # streamed out member by member; the rest of the archive isn't read
+            archive_vfs.extract(*location, dst)
+        elif os.path.isdir(src):
             shutil.copytree(src, dst)
         else:
             shutil.copy2(src, dst)
 
 def move_items(sources: List[str], dest_dir: str) -> None:
+    _check_writable(os.path.join(dest_dir, "x"), *sources)
     for src in sources:
         name = os.path.basename(src)
         dst = os.path.join(dest_dir, name)
         shutil.move(src, dst)
 
 def rename_item(path: str, new_name: str) -> None:
+    _check_writable(path)
     dir_path = os.path.dirname(path)
     new_path = os.path.join(dir_path, new_name)
     os.rename(path, new_path)
 
 def delete_items(paths: List[str]) -> None:
+    _check_writable(*paths)
     for path in paths:
         if os.path.isdir(path):
             shutil.rmtree(path)
@@ -48,10 +70,14 @@ def open_item(path: str) -> str:
     try:
         if sys.platform == "win32":
             os.startfile(path)
-        elif sys.platform == "darwin":
-            subprocess.run(["open", path])
         else:
-            subprocess.run(["xdg-open", path])
+            # don't wait for the opener; it runs detached in its own session
+            opener = "open" if sys.platform == "darwin" else "xdg-open"
+            subprocess.Popen(
+                [opener, path],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
     except Exception:
         pass
     return path
@@ -59,12 +85,14 @@ def open_item(path: str) -> str:
 
 def make_directory(path: str, name: str) -> str:
     """Create a new directory inside path with given name. Return absolute path."""
+    _check_writable(os.path.join(path, name))
     p = Path(path) / name
     p.mkdir(parents=False, exist_ok=False)
     return str(p.resolve())
 
 def make_file(path: str, name: str, contents: str = "") -> str:
     """Create a new text file inside path. Return absolute path."""
+    _check_writable(os.path.join(path, name))
     p = Path(path) / name
     if p.exists():
         raise FileExistsError(str(p))
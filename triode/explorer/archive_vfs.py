@@ -0,0 +1,405 @@
+# triode/explorer/archive_vfs.py
+# Zip and tar archives as read-only directories: "/builds/a.tar.gz/inner/dir".
+# Each archive's member list (zip central directory, tar headers with their
+# data offsets) is read once and kept in an LRU keyed by (path, size, mtime);
+# the index of a compressed tarball, which takes a full decompression pass to
+# build, is also written to the user cache dir so re-browsing it is instant.
+# Members are read by offset: a zip member or an uncompressed tar member is a
+# seek away, and a compressed tar is only decompressed up to the member's end.
+import errno
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+ZIP_SUFFIXES = (".zip", ".jar", ".whl")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_COMPRESSED_TAR = TAR_SUFFIXES[1:]
+_MAX_INDEXES = 8
+_MAX_LINKS = 40  # like the kernel's limit on symlinks followed in one lookup
+
+
+def is_archive_name(path: str) -> bool:
+    return path.lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+
+def split_archive_path(path: str) -> Optional[Tuple[str, str]]:
+    """
+    (archive file, member path inside it) if path is an archive or lies inside
+    one, else None. Only components named like an archive are stat'ed.
+    """
+    parts = path.split(os.sep)
+    for i, part in enumerate(parts):
+        if part and is_archive_name(part):
+            archive = os.sep.join(parts[:i + 1])
+            if os.path.isfile(archive):
+                return archive, "/".join(p for p in parts[i + 1:] if p)
+    return None
+
+
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "triode" / "archives"
+
+
+class VEntry:
+    """What list_dir() returns for an archive member; quacks like os.DirEntry."""
+
+    __slots__ = ("name", "path", "size", "mtime", "_is_dir")
+
+    def __init__(self, name: str, path: str, is_dir: bool, size: int, mtime: float):
+        self.name = name
+        self.path = path
+        self._is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+    def is_file(self) -> bool:
+        return not self._is_dir
+
+
+class Member:
+    __slots__ = ("is_dir", "size", "mtime", "ref")
+
+    def __init__(self, is_dir: bool, size: int = 0, mtime: float = 0.0, ref=None):
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        self.ref = ref  # ZipInfo / TarInfo; None for directories only implied by member names
+
+
+class ArchiveIndex:
+    def __init__(self, archive: str, kind: str):
+        self.archive = archive
+        self.kind = kind  # "zip" or "tar"
+        self.members: Dict[str, Member] = {"": Member(True)}
+        self.children: Dict[str, Dict[str, None]] = {"": {}}  # dir -> ordered set of child names
+
+    def add(self, name: str, member: Member) -> None:
+        # absolute names and ".." would point outside the archive (zip slip)
+        if name.startswith("/") or ".." in name.split("/"):
+            print(f"[ArchiveVFS] Skipping unsafe member {name!r} in {self.archive}")
+            return
+        name = posixpath.normpath(name)
+        if name == ".":
+            return
+        parent, _, base = name.rpartition("/")
+        self._ensure_dir(parent)
+        self.children[parent][base] = None
+        existing = self.members.get(name)
+        if existing is None or existing.ref is None:
+            self.members[name] = member
+        if member.is_dir:
+            self.children.setdefault(name, {})
+
+    def _ensure_dir(self, name: str) -> None:
+        if name in self.children:
+            return  # "" (the root) always is
+        self.children[name] = {}
+        self.members.setdefault(name, Member(True))
+        parent, _, base = name.rpartition("/")
+        self._ensure_dir(parent)
+        self.children[parent][base] = None
+
+    def list(self, inner: str) -> List[VEntry]:
+        inner = inner.strip("/")
+        names = self.children.get(inner)
+        if names is None:
+            raise NotADirectoryError(os.path.join(self.archive, inner))
+        base = os.path.join(self.archive, inner) if inner else self.archive
+        entries = []
+        for name in names:
+            m = self.members[f"{inner}/{name}" if inner else name]
+            entries.append(VEntry(name, os.path.join(base, name), m.is_dir, m.size, m.mtime))
+        return entries
+
+    def member(self, inner: str) -> Member:
+        m = self.members.get(inner.strip("/"))
+        if m is None:
+            raise FileNotFoundError(os.path.join(self.archive, inner))
+        return m
+
+    def walk(self, inner: str) -> Iterator[Tuple[str, Member]]:
+        """(path, member) for inner and everything below it."""
+        inner = inner.strip("/")
+        yield inner, self.member(inner)
+        for name in self.children.get(inner, ()):
+            yield from self.walk(f"{inner}/{name}" if inner else name)
+
+
+# ---------- building ----------
+def _build_zip(archive: str) -> ArchiveIndex:
+    index = ArchiveIndex(archive, "zip")
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            index.add(info.filename, Member(info.is_dir(), info.file_size, mtime, info))
+    return index
+
+
+def _add_tarinfo(index: ArchiveIndex, ti: tarfile.TarInfo) -> None:
+    index.add(ti.name, Member(ti.isdir(), ti.size, float(ti.mtime), ti))
+
+
+def _build_tar(archive: str) -> ArchiveIndex:
+    index = ArchiveIndex(archive, "tar")
+    with tarfile.open(archive, "r:*") as tf:
+        for ti in tf:
+            _add_tarinfo(index, ti)
+        tf.members = []  # don't keep a second copy of every header
+    return index
+
+
+def _disk_cache_path(archive: str) -> Path:
+    return _cache_dir() / (hashlib.sha1(archive.encode("utf-8", "surrogateescape")).hexdigest() + ".json")
+
+
+def _load_tar_cache(archive: str, key: Tuple[int, int]) -> Optional[ArchiveIndex]:
+    try:
+        with open(_disk_cache_path(archive), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("archive") != archive or data.get("key") != list(key):
+        return None
+    index = ArchiveIndex(archive, "tar")
+    for name, type_, mode, size, mtime, offset, offset_data, linkname in data["members"]:
+        ti = tarfile.TarInfo(name)
+        ti.type = type_.encode("latin-1")
+        ti.mode, ti.size, ti.mtime = mode, size, mtime
+        ti.offset, ti.offset_data, ti.linkname = offset, offset_data, linkname
+        _add_tarinfo(index, ti)
+    return index
+
+
+def _save_tar_cache(index: ArchiveIndex, key: Tuple[int, int]) -> None:
+    members = [
+        [m.ref.name, m.ref.type.decode("latin-1"), m.ref.mode, m.ref.size, m.ref.mtime,
+         m.ref.offset, m.ref.offset_data, m.ref.linkname]
+        for m in index.members.values() if m.ref is not None
+    ]
+    path = _disk_cache_path(index.archive)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"archive": index.archive, "key": list(key), "members": members}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[ArchiveVFS] Could not cache index of {index.archive}: {e}")
+
+
+def _build(archive: str, key: Tuple[int, int]) -> ArchiveIndex:
+    lower = archive.lower()
+    if lower.endswith(ZIP_SUFFIXES):
+        return _build_zip(archive)
+    compressed = lower.endswith(_COMPRESSED_TAR)
+    if compressed:
+        index = _load_tar_cache(archive, key)
+        if index is not None:
+            return index
+    index = _build_tar(archive)
+    if compressed:
+        _save_tar_cache(index, key)
+    return index
+
+
+# ---------- index cache ----------
+_lock = threading.Lock()
+_indexes: "OrderedDict[str, Tuple[Tuple[int, int], ArchiveIndex]]" = OrderedDict()
+_pending: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _stat_key(archive: str) -> Tuple[int, int]:
+    st = os.stat(archive)
+    return st.st_size, st.st_mtime_ns
+
+
+def cached_index(archive: str) -> Optional[ArchiveIndex]:
+    """The index if it's in memory and the archive hasn't changed since; never builds."""
+    key = _stat_key(archive)
+    with _lock:
+        hit = _indexes.get(archive)
+        if hit is None or hit[0] != key:
+            return None
+        _indexes.move_to_end(archive)
+        return hit[1]
+
+
+def get_index(archive: str) -> ArchiveIndex:
+    """The archive's index, building it (once, even with concurrent callers) if needed."""
+    key = _stat_key(archive)
+    with _lock:
+        hit = _indexes.get(archive)
+        if hit is not None and hit[0] == key:
+            _indexes.move_to_end(archive)
+            return hit[1]
+        future = _pending.get((archive, key))
+        owner = future is None
+        if owner:
+            future = _pending[(archive, key)] = Future()
+    if not owner:
+        return future.result()
+    try:
+        index = _build(archive, key)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _pending.pop((archive, key), None)
+    with _lock:
+        _indexes[archive] = (key, index)
+        _indexes.move_to_end(archive)
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    future.set_result(index)
+    return index
+
+
+def submit(fn, *args) -> Future:
+    """Run fn on the archive worker (indexing, extraction)."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="triode-archive")
+    return _pool.submit(fn, *args)
+
+
+# ---------- access ----------
+def list_dir(archive: str, inner: str) -> List[VEntry]:
+    return get_index(archive).list(inner)
+
+
+def is_dir(archive: str, inner: str) -> bool:
+    return get_index(archive).member(inner).is_dir
+
+
+def _resolve_links(index: ArchiveIndex, inner: str) -> Tuple[str, Member]:
+    """Follow tar symlinks and hardlinks through the index to a real member."""
+    inner = inner.strip("/")
+    m = index.member(inner)
+    seen = {inner}
+    where = os.path.join(index.archive, inner)
+    while index.kind == "tar" and (m.ref.issym() or m.ref.islnk()):
+        ti = m.ref
+        # hardlink names are relative to the archive root, symlinks to their directory
+        link = ti.linkname if ti.islnk() else posixpath.join(posixpath.dirname(inner), ti.linkname)
+        target = posixpath.normpath(link)
+        if ti.linkname.startswith("/") or target == ".." or target.startswith("../"):
+            raise FileNotFoundError(errno.ENOENT, f"link points outside the archive: {ti.linkname}", where)
+        if target in seen or len(seen) > _MAX_LINKS:
+            raise OSError(errno.ELOOP, "Too many levels of symbolic links", where)
+        seen.add(target)
+        inner, m = target, index.member(target)
+    return inner, m
+
+
+@contextmanager
+def open_member(archive: str, inner: str) -> Iterator[IO[bytes]]:
+    """Stream one member's content; nothing else in the archive is decompressed past it."""
+    index = get_index(archive)
+    # resolve links through the index; tarfile would scan the whole archive for the target
+    inner, m = _resolve_links(index, inner)
+    if m.is_dir:
+        raise IsADirectoryError(os.path.join(archive, inner))
+    if index.kind == "zip":
+        with zipfile.ZipFile(archive) as zf, zf.open(m.ref) as f:
+            yield f
+        return
+    ti = m.ref
+    with tarfile.open(archive, "r:*") as tf:
+        f = tf.extractfile(ti)
+        if f is None:
+            raise OSError(f"not a regular file: {os.path.join(archive, inner)}")
+        with f:
+            yield f
+
+
+def _check_inside(root: str, target: str) -> None:
+    root = os.path.realpath(root)
+    if os.path.commonpath([root, os.path.realpath(target)]) != root:
+        raise PermissionError(f"refusing to write outside {root}: {target}")
+
+
+def extract(archive: str, inner: str, dest: str) -> str:
+    """Copy a member (a file, or a directory recursively) out to dest; returns dest."""
+    index = get_index(archive)
+    inner = inner.strip("/")
+    for path, m in index.walk(inner):
+        rel = path[len(inner):].lstrip("/") if inner else path
+        target = os.path.join(dest, rel) if rel else dest
+        _check_inside(dest, target)
+        if m.is_dir:
+            os.makedirs(target, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open_member(archive, path) as src, open(target, "wb") as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        if m.mtime:
+            os.utime(target, (m.mtime, m.mtime))
+    return dest
+
+
+_temp_root: Optional[str] = None
+_temp_lock = threading.Lock()
+
+
+def _is_private_dir(path: str) -> bool:
+    """A real directory (not a symlink) owned by us that nobody else can enter."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _private_temp_root() -> str:
+    """
+    Where extract_temp() puts files: $XDG_RUNTIME_DIR/triode-archives when the
+    runtime dir is ours alone, else a fresh mkdtemp() for this process. A
+    fixed path in the shared /tmp could be created (or symlinked) by another
+    user first, who could then swap the file before an app opens it.
+    """
+    global _temp_root
+    with _temp_lock:
+        if _temp_root is not None and _is_private_dir(_temp_root):
+            return _temp_root
+        root = None
+        runtime = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime and _is_private_dir(runtime):
+            root = os.path.join(runtime, "triode-archives")
+            try:
+                os.mkdir(root, 0o700)
+            except FileExistsError:
+                pass
+            except OSError:
+                root = None
+            if root is not None and not _is_private_dir(root):
+                root = None
+        _temp_root = root or tempfile.mkdtemp(prefix="triode-archives-")
+        return _temp_root
+
+
+def extract_temp(archive: str, inner: str) -> str:
+    """Extract one member under a private per-user dir (for opening it in an app); returns its path."""
+    digest = hashlib.sha1(archive.encode("utf-8", "surrogateescape")).hexdigest()[:12]
+    base = os.path.join(_private_temp_root(), digest)
+    dest = os.path.join(base, inner.strip("/"))
+    _check_inside(base, dest)
+    return extract(archive, inner, dest)
@@ -0,0 +1,224 @@
+# triode/explorer/duplicates.py
+# Duplicate files under a directory, narrowed down in three passes so that
+# most files are never read: group by size, then hash the first and last
+# block of each same-size file, and only files that still collide get a full
+# hash. Hashing runs on a thread pool (file reads and hashlib both release
+# the GIL). Digests are cached in SQLite by (device, inode, size, mtime), so a
+# re-run only reads files that changed.
+import hashlib
+import os
+import sqlite3
+import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+BLOCK = 64 * 1024          # partial hash: first and last block
+READ_SIZE = 4 * 1024 * 1024  # full hash: large sequential reads
+
+FileKey = Tuple[int, int, int, int]  # (st_dev, st_ino, st_size, st_mtime_ns)
+
+
+def _cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "triode" / "hashes.sqlite"
+
+
+def partial_hash(path: str, size: int) -> str:
+    """Hash of the first and last BLOCK bytes; the whole file if it's no bigger than two blocks."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb", buffering=0) as f:
+        h.update(f.read(BLOCK))
+        if size > 2 * BLOCK:
+            f.seek(size - BLOCK)
+        h.update(f.read(BLOCK))
+    return h.hexdigest()
+
+
+def full_hash(path: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+class HashCache:
+    """(dev, inode, size, mtime_ns) -> partial/full digests. Use from one thread."""
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or str(_cache_path())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER,"
+            " partial TEXT, full TEXT, PRIMARY KEY (dev, ino, size, mtime_ns))"
+        )
+        self.db.commit()
+
+    def get(self, key: FileKey) -> Tuple[Optional[str], Optional[str]]:
+        row = self.db.execute(
+            "SELECT partial, full FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?", key
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def put(self, key: FileKey, partial: Optional[str] = None, full: Optional[str] = None) -> None:
+        self.db.execute(
+            "INSERT INTO hashes (dev, ino, size, mtime_ns, partial, full) VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (dev, ino, size, mtime_ns) DO UPDATE SET"
+            " partial = coalesce(excluded.partial, partial), full = coalesce(excluded.full, full)",
+            (*key, partial, full),
+        )
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+
+def walk_files(root: str, min_size: int = 1,
+               cancelled: Callable[[], bool] = lambda: False) -> Iterator[Tuple[str, FileKey]]:
+    """Regular files under root (symlinks not followed), each hard-linked inode once."""
+    seen_inodes = set()
+    stack = [root]
+    while stack and not cancelled():
+        top = stack.pop()
+        try:
+            it = os.scandir(top)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode) or st.st_size < min_size:
+                    continue
+                if st.st_nlink > 1:
+                    if (st.st_dev, st.st_ino) in seen_inodes:
+                        continue  # another name for a file we have; deleting it frees nothing
+                    seen_inodes.add((st.st_dev, st.st_ino))
+                yield entry.path, (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _Group:
+    __slots__ = ("size", "files", "pending", "digests", "stage")
+
+    def __init__(self, size: int, files: List[Tuple[str, FileKey]], stage: str):
+        self.size = size
+        self.files = files
+        self.pending = 0
+        self.digests: Dict[str, List[Tuple[str, FileKey]]] = {}
+        self.stage = stage  # "partial" or "full"
+
+
+def find_duplicates(
+    root: str,
+    on_group: Callable[[int, List[str]], None],
+    on_progress: Optional[Callable[[str], None]] = None,
+    cancelled: Callable[[], bool] = lambda: False,
+    workers: int = 4,
+    min_size: int = 1,
+    cache: Optional[HashCache] = None,
+) -> None:
+    """
+    Calls on_group(size, paths) for every set of identical files as soon as
+    it is confirmed by full hash, biggest files first. Runs on the caller's
+    thread (it's meant to be a worker) and blocks until done or cancelled.
+    """
+    progress = on_progress or (lambda text: None)
+
+    by_size: Dict[int, List[Tuple[str, FileKey]]] = {}
+    count = 0
+    for path, key in walk_files(root, min_size, cancelled):
+        by_size.setdefault(key[2], []).append((path, key))
+        count += 1
+        if count % 5000 == 0:
+            progress(f"Scanning: {count:,} files")
+    candidates = sorted((s for s, files in by_size.items() if len(files) > 1), reverse=True)
+    progress(f"{count:,} files, {sum(len(by_size[s]) for s in candidates):,} share a size with another")
+
+    running: Dict[Future, Tuple[_Group, str, FileKey]] = {}
+    hashed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="triode-dupes") as pool:
+
+        def start(group: _Group) -> None:
+            for path, key in group.files:
+                partial, full = cache.get(key) if cache is not None else (None, None)
+                digest = partial if group.stage == "partial" else full
+                if digest is not None:
+                    group.digests.setdefault(digest, []).append((path, key))
+                    continue
+                if group.stage == "partial":
+                    future = pool.submit(partial_hash, path, group.size)
+                else:
+                    future = pool.submit(full_hash, path)
+                running[future] = (group, path, key)
+                group.pending += 1
+            if group.pending == 0:
+                finish(group)
+
+        def finish(group: _Group) -> None:
+            for files in group.digests.values():
+                if len(files) < 2:
+                    continue
+                # small files' partial hash covers the whole content already
+                if group.stage == "partial" and group.size > 2 * BLOCK:
+                    start(_Group(group.size, files, "full"))
+                else:
+                    on_group(group.size, sorted(path for path, _ in files))
+
+        for size in candidates:
+            start(_Group(size, by_size[size], "partial"))
+            if cancelled():
+                break
+        by_size.clear()
+
+        while running and not cancelled():
+            done, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                group, path, key = running.pop(future)
+                group.pending -= 1
+                try:
+                    digest = future.result()
+                except OSError:
+                    digest = None  # vanished or unreadable: not a duplicate of anything
+                if digest is not None:
+                    group.digests.setdefault(digest, []).append((path, key))
+                    if cache is not None:
+                        if group.stage == "partial":
+                            cache.put(key, partial=digest)
+                        else:
+                            cache.put(key, full=digest)
+                hashed += 1
+                if group.pending == 0:
+                    finish(group)
+            if done:
+                progress(f"Hashing: {hashed:,} files hashed, {len(running):,} queued")
+                if cache is not None:
+                    cache.commit()
+        if cancelled():
+            for future in running:
+                future.cancel()
+    if cache is not None:
+        cache.commit()
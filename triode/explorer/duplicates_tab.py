@@ -0,0 +1,147 @@
+# triode/explorer/duplicates_tab.py
+import os
+import threading
+from typing import List, Optional
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QToolBar, QLabel, QTreeWidget, QTreeWidgetItem
+from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt, Signal
+
+from .duplicates import HashCache, find_duplicates
+
+
+def _human(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+class DuplicatesTab(QWidget):
+    """
+    Duplicate files under a directory, listed group by group as the worker
+    confirms them. Double-clicking a file opens its folder (reveal_requested).
+    """
+
+    tab_kind = "duplicates"
+    path_changed = Signal(str)
+    reveal_requested = Signal(str)
+    _group_found = Signal(object, object)  # worker -> GUI thread: size, paths
+    _progress = Signal(str)
+    _finished = Signal()
+
+    def __init__(self, root: str, settings: Optional[dict] = None, parent=None):
+        super().__init__(parent)
+        cfg = (settings or {}).get("duplicates", {})
+        self.root = os.path.abspath(root)
+        self.workers = int(cfg.get("workers", 4))
+        self.min_size = int(cfg.get("min_size", 1))
+        self.reclaimable = 0
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QToolBar()
+        self.act_stop = QAction("Stop", self)
+        self.act_stop.triggered.connect(self.stop)
+        toolbar.addAction(self.act_stop)
+        act_rescan = QAction("Rescan", self)
+        act_rescan.triggered.connect(self.start)
+        toolbar.addAction(act_rescan)
+        self.status = QLabel()
+        toolbar.addWidget(self.status)
+        layout.addWidget(toolbar)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["File", "Size"])
+        self.tree.setSortingEnabled(False)
+        self.tree.itemDoubleClicked.connect(self._on_double_click)
+        layout.addWidget(self.tree)
+
+        self._group_found.connect(self._add_group)
+        self._progress.connect(self.status.setText)
+        self._finished.connect(self._on_finished)
+        self.start()
+
+    @property
+    def current_path(self) -> str:
+        return self.root
+
+    def navigate_to(self, path: str) -> None:
+        self.root = os.path.abspath(path)
+        self.start()
+        self.path_changed.emit(self.root)
+
+    # ---------- scan ----------
+    def start(self) -> None:
+        self.stop()
+        self.tree.clear()
+        self.reclaimable = 0
+        self._cancel = cancel = threading.Event()
+        self.act_stop.setEnabled(True)
+        self.status.setText("Scanning...")
+        self._thread = threading.Thread(target=self._run, args=(self.root, cancel),
+                                        name="triode-dupes-scan", daemon=True)
+        self._thread.start()
+
+    def _run(self, root: str, cancel: threading.Event) -> None:
+        # the cache's SQLite connection belongs to this thread
+        try:
+            cache = HashCache()
+        except Exception as e:
+            print(f"[DuplicatesTab] Hash cache unavailable: {e}")
+            cache = None
+        try:
+            find_duplicates(
+                root,
+                on_group=lambda size, paths: cancel.is_set() or self._group_found.emit(size, paths),
+                on_progress=lambda text: cancel.is_set() or self._progress.emit(text),
+                cancelled=cancel.is_set,
+                workers=self.workers,
+                min_size=self.min_size,
+                cache=cache,
+            )
+        except Exception as e:
+            print(f"[DuplicatesTab] Scan of {root} failed: {e}")
+        finally:
+            if cache is not None:
+                cache.close()
+        if not cancel.is_set():
+            self._finished.emit()
+
+    def stop(self) -> None:
+        self._cancel.set()
+        self.act_stop.setEnabled(False)
+
+    def on_destroy(self) -> None:
+        self.stop()
+
+    # ---------- results ----------
+    def _add_group(self, size: int, paths: List[str]) -> None:
+        wasted = size * (len(paths) - 1)
+        self.reclaimable += wasted
+        group = QTreeWidgetItem([f"{len(paths)} copies, {_human(wasted)} reclaimable", _human(size)])
+        group.setData(1, Qt.ItemDataRole.UserRole, wasted)
+        for path in paths:
+            item = QTreeWidgetItem([path, ""])
+            item.setData(0, Qt.ItemDataRole.UserRole, path)
+            group.addChild(item)
+        # biggest waste first; groups arrive roughly in that order anyway
+        index = self.tree.topLevelItemCount()
+        while index > 0 and self.tree.topLevelItem(index - 1).data(1, Qt.ItemDataRole.UserRole) < wasted:
+            index -= 1
+        self.tree.insertTopLevelItem(index, group)
+        group.setExpanded(True)
+
+    def _on_finished(self) -> None:
+        self.act_stop.setEnabled(False)
+        self.status.setText(
+            f"Done: {self.tree.topLevelItemCount():,} groups, {_human(self.reclaimable)} reclaimable"
+        )
+
+    def _on_double_click(self, item: QTreeWidgetItem, column: int) -> None:
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path:
+            self.reveal_requested.emit(os.path.dirname(path))
@@ -0,0 +1,298 @@
+# triode/explorer/git_status.py
+# Per-entry git markers for explorer listings. `git status` runs on a worker
+# (a big repo can take seconds); its result is kept per repository until a
+# QFileSystemWatcher sees .git/index or HEAD change, so navigating around a
+# repo, or between tabs in it, costs a dict lookup. The explorer lists first
+# and paints the markers whenever they arrive.
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+# entry states, strongest first
+MODIFIED = "modified"    # changed, staged, added, deleted below, or conflicted
+UNTRACKED = "untracked"
+IGNORED = "ignored"
+_RANK = {MODIFIED: 0, UNTRACKED: 1, IGNORED: 2}
+
+STATUS_TIMEOUT = 30.0  # seconds; a repo slower than this gets no markers
+_DEBOUNCE_MS = 300     # a commit or checkout touches the index many times
+
+
+def find_repo(path: str) -> Optional[Tuple[str, str]]:
+    """(work tree root, git dir) of the repository containing path, or None."""
+    path = os.path.abspath(path)
+    while True:
+        dotgit = os.path.join(path, ".git")
+        if os.path.isdir(dotgit):
+            return path, dotgit
+        if os.path.isfile(dotgit):
+            # linked worktree or submodule: "gitdir: <path>"
+            try:
+                with open(dotgit, encoding="utf-8") as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                gitdir = line[len("gitdir:"):].strip()
+                return path, os.path.normpath(os.path.join(path, gitdir))
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+class RepoStatus:
+    """Parsed `git status` of one work tree; paths are relative to root."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.entries: Dict[str, str] = {}  # file, or "dir/" git reported as a whole
+        self.dirs: Dict[str, str] = {}     # directories with changes somewhere below
+        self.generation = 0  # provider's invalidation count for root when git started
+
+    def add(self, rel: str, state: str) -> None:
+        self.entries[rel] = state
+        if state == IGNORED:
+            return  # an ignored file doesn't make its folder interesting
+        parent = os.path.dirname(rel.rstrip("/"))
+        while parent:
+            old = self.dirs.get(parent)
+            if old is not None and _RANK[old] <= _RANK[state]:
+                break  # ancestors already carry this state or a stronger one
+            self.dirs[parent] = state
+            parent = os.path.dirname(parent)
+
+    def state_of(self, path: str, is_dir: bool) -> Optional[str]:
+        rel = os.path.relpath(path, self.root)
+        if rel.startswith(".."):
+            return None
+        if is_dir:
+            state = self.entries.get(rel + "/") or self.dirs.get(rel)
+        else:
+            state = self.entries.get(rel)
+        if state is not None:
+            return state
+        # inside a directory git only reported as a whole (untracked or ignored)
+        parent = os.path.dirname(rel)
+        while parent:
+            state = self.entries.get(parent + "/")
+            if state is not None:
+                return state
+            parent = os.path.dirname(parent)
+        return None
+
+
+def read_status(root: str, timeout: float = STATUS_TIMEOUT) -> RepoStatus:
+    """Run git status in root and parse it. Raises OSError / CalledProcessError / TimeoutExpired."""
+    out = subprocess.run(
+        ["git", "-C", root, "--no-optional-locks", "status", "--porcelain=v1", "-z",
+         "--no-renames", "--untracked-files=normal", "--ignored=matching"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+        timeout=timeout, check=True,
+    ).stdout
+    status = RepoStatus(root)
+    for record in out.split(b"\0"):
+        if len(record) < 4:
+            continue
+        xy = record[:2]
+        rel = os.fsdecode(record[3:])
+        if xy == b"??":
+            status.add(rel, UNTRACKED)
+        elif xy == b"!!":
+            status.add(rel, IGNORED)
+        else:
+            status.add(rel, MODIFIED)
+    return status
+
+
+class GitStatusProvider(QObject):
+    """
+    Cached git status per repository.
+
+    status_for(path, callback) answers from the cache when it can (None if
+    path isn't in a repo), otherwise works on a worker thread and calls back
+    on the GUI thread. changed(root) is emitted when a repo's cached status
+    was dropped because its index or HEAD changed.
+    """
+
+    changed = Signal(str)
+    _finished = Signal(str, object, object)  # worker -> GUI thread: path, repo, status
+
+    def __init__(self, timeout: float = STATUS_TIMEOUT, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self._repo_of: Dict[str, Optional[Tuple[str, str]]] = {}  # directory -> (root, gitdir)
+        self._status: Dict[str, RepoStatus] = {}
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._running: Dict[str, Future] = {}  # root -> status being read
+        self._waiters: Dict[str, list] = {}
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="triode-git")
+        self._disabled = False
+        self._slow: set = set()  # repos whose status timed out; left unmarked
+        self._failed: set = set()  # repos where git status errored; retried once invalidated
+        self._watched: Dict[str, str] = {}  # watched path -> root
+        self._dirty: set = set()
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._flush_invalidations)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_watch_event)
+        self._watcher.directoryChanged.connect(self._on_watch_event)
+        self._finished.connect(self._on_finished)
+
+    def cached(self, path: str) -> Optional[RepoStatus]:
+        repo = self._repo_of.get(path)
+        return self._status.get(repo[0]) if repo else None
+
+    def status_for(self, path: str, callback: Callable[[Optional[RepoStatus]], None]) -> Optional[RepoStatus]:
+        """The cached status for directory path, or None after starting a lookup (if one is needed)."""
+        if self._disabled:
+            return None
+        if path in self._repo_of:
+            repo = self._repo_of[path]
+            if repo is None or repo[0] in self._slow or repo[0] in self._failed:
+                return None  # known not to be in a repo, or not worth asking
+            status = self._status.get(repo[0])
+            if status is not None:
+                return status
+        first = path not in self._waiters
+        self._waiters.setdefault(path, []).append(callback)
+        if first:
+            self._pool.submit(self._work, path)
+        return None
+
+    def invalidate(self, root: str) -> None:
+        with self._lock:
+            self._generation[root] = self._generation.get(root, 0) + 1
+        failed = root in self._failed
+        self._failed.discard(root)
+        if self._status.pop(root, None) is not None or failed:
+            self.changed.emit(root)
+
+    def invalidate_path(self, path: str) -> None:
+        """Drop the cached status of the repo containing path (after the explorer changed files)."""
+        repo = self._repo_of.get(path)
+        if repo is not None:
+            self.invalidate(repo[0])
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- worker ----------
+    def _work(self, path: str) -> None:
+        repo = status = None
+        try:
+            repo = find_repo(path)
+            if repo is not None:
+                status = self._read(repo[0])
+        except FileNotFoundError:
+            print("[GitStatus] git not found; markers disabled")
+            self._disabled = True
+        except subprocess.TimeoutExpired:
+            self._slow.add(repo[0])
+            print(f"[GitStatus] git status in {repo[0]} took over {self.timeout:.0f}s; skipped")
+        except subprocess.CalledProcessError as e:
+            # e.g. a corrupt or foreign-owned repo: don't re-run git on every
+            # navigation; the watcher clears this when the repo changes
+            if repo[0] not in self._failed:
+                self._failed.add(repo[0])
+                print(f"[GitStatus] git status in {repo[0]} failed: {e}")
+        except Exception as e:
+            print(f"[GitStatus] git status for {path} failed: {e}")
+        self._finished.emit(path, repo, status)
+
+    def _read(self, root: str) -> Optional[RepoStatus]:
+        status = self._status.get(root)
+        if status is not None:
+            return status  # a new directory in a repo we already know
+        if root in self._slow or root in self._failed:
+            return None
+        # one git status per repo at a time; concurrent lookups share it
+        with self._lock:
+            future = self._running.get(root)
+            owner = future is None
+            if owner:
+                future = self._running[root] = Future()
+            generation = self._generation.get(root, 0)
+        if not owner:
+            return future.result()
+        try:
+            status = read_status(root, self.timeout)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._running.pop(root, None)
+        status.generation = generation
+        future.set_result(status)
+        return status
+
+    # ---------- GUI thread ----------
+    def _on_finished(self, path: str, repo, status) -> None:
+        self._repo_of[path] = repo
+        if repo is not None:
+            if status is not None:
+                with self._lock:
+                    current = self._generation.get(repo[0], 0)
+                if status.generation == current:
+                    self._status[repo[0]] = status  # else the index changed while git ran
+            self._watch(*repo)  # also for a failed repo, so a fix to it is noticed
+        for callback in self._waiters.pop(path, ()):
+            try:
+                callback(status)
+            except Exception as e:
+                print(f"[GitStatus] callback for {path} failed: {e}")
+
+    def _watch(self, root: str, gitdir: str) -> None:
+        # index is replaced by rename, which drops a file watch; the directory
+        # watch on the git dir sees that, and _flush_invalidations re-adds it
+        for path in (os.path.join(gitdir, "index"), os.path.join(gitdir, "HEAD"), gitdir):
+            if path not in self._watched and os.path.exists(path):
+                if self._watcher.addPath(path):
+                    self._watched[path] = root
+
+    def _on_watch_event(self, path: str) -> None:
+        root = self._watched.get(path)
+        if root is None:
+            return
+        if path in self._watcher.directories():
+            # the git dir changes with every lock file; it only matters once
+            # the index watch is gone, i.e. the index was replaced
+            if os.path.join(path, "index") in self._watched:
+                return
+        elif path not in self._watcher.files():
+            del self._watched[path]  # replaced by rename; re-added after the flush
+        self._dirty.add(root)
+        self._debounce.start()
+
+    def _flush_invalidations(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        for root in dirty:
+            self.invalidate(root)
+        for path, root in list(self._watched.items()):
+            if root in dirty and os.path.isdir(path):
+                self._watch(root, path)
+
+
+_shared: Optional[GitStatusProvider] = None
+
+
+def shared_git_status() -> GitStatusProvider:
+    """The process-wide provider (created on first use, after QApplication)."""
+    global _shared
+    if _shared is None:
+        _shared = GitStatusProvider()
+    return _shared
+
+
+def shutdown() -> None:
+    if _shared is not None:
+        _shared.shutdown()
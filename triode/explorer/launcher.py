@@ -0,0 +1,168 @@
+# triode/explorer/launcher.py
+import fnmatch
+import os
+import shlex
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal, QMimeDatabase
+
+# shown in a browser tab instead of an external application
+DEFAULT_IN_APP = ["text/html", "application/xhtml+xml", "text/plain", "text/x-log", "image/*", "application/pdf"]
+
+_UNKNOWN = "application/octet-stream"
+
+
+def _desktop_file(desktop_id: str) -> Optional[str]:
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    for base in [data_home] + data_dirs.split(":"):
+        path = os.path.join(base, "applications", desktop_id)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _exec_line(desktop_path: str) -> Optional[str]:
+    in_entry = False
+    with open(desktop_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                in_entry = line == "[Desktop Entry]"
+            elif in_entry and line.startswith("Exec="):
+                return line[len("Exec="):]
+    return None
+
+
+def resolve_handler(mime: str) -> Optional[list[str]]:
+    """
+    Command (with "{}" where the file goes) of the default application for
+    mime, from xdg-mime and its .desktop file. Slow: runs on a worker thread.
+    """
+    try:
+        out = subprocess.run(
+            ["xdg-mime", "query", "default", mime],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    desktop = _desktop_file(out) if out else None
+    exec_line = _exec_line(desktop) if desktop else None
+    if not exec_line:
+        return None
+    argv = []
+    has_file = False
+    for arg in shlex.split(exec_line):
+        if arg in ("%f", "%F", "%u", "%U"):
+            argv.append("{}")
+            has_file = True
+        elif arg.startswith("%") and len(arg) == 2:
+            continue  # %i, %c, %k ...: not needed to open a file
+        else:
+            argv.append(arg.replace("%%", "%"))
+    if not has_file:
+        argv.append("{}")
+    return argv
+
+
+def spawn_detached(argv: list[str]) -> subprocess.Popen:
+    """Start argv in its own session, not attached to our stdio; don't wait for it."""
+    return subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True, close_fds=True,
+    )
+
+
+class Launcher(QObject):
+    """
+    Opens files without blocking the GUI thread.
+
+    MIME types are looked up once per extension (content sniffing, for files
+    without a known extension, runs on a worker) and default applications
+    once per MIME type. Types matching in_app patterns go to open_in_app
+    (e.g. a browser tab) instead of an external process.
+    """
+
+    _resolved = Signal(str, str, object)  # worker -> GUI thread: path, mime, handler
+
+    def __init__(self, settings: dict, open_in_app: Optional[Callable[[str, str], None]] = None, parent=None):
+        super().__init__(parent)
+        cfg = settings.get("launcher", {})
+        self.in_app = list(cfg.get("in_app", DEFAULT_IN_APP))
+        self.open_in_app = open_in_app
+        self._db = QMimeDatabase()
+        self._mime_by_ext: dict[str, str] = {}
+        self._handlers: dict[str, Optional[list[str]]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="triode-launch")
+        self._resolved.connect(self._on_resolved)
+        self._children: list[subprocess.Popen] = []
+        self._reaper = QTimer(self)
+        self._reaper.setInterval(5000)
+        self._reaper.timeout.connect(self._reap)
+
+    def mime_type(self, path: str) -> Optional[str]:
+        """MIME type by extension (cached), or None if only the content can tell."""
+        ext = os.path.splitext(path)[1].lower()
+        if not ext:
+            return None
+        mime = self._mime_by_ext.get(ext)
+        if mime is None:
+            mime = self._db.mimeTypeForFile(path, QMimeDatabase.MatchMode.MatchExtension).name()
+            self._mime_by_ext[ext] = mime
+        return None if mime == _UNKNOWN else mime
+
+    def is_in_app(self, mime: str) -> bool:
+        return any(fnmatch.fnmatchcase(mime, pattern) for pattern in self.in_app)
+
+    def open(self, path: str) -> None:
+        mime = self.mime_type(path)
+        if mime is not None and (self.open_in_app and self.is_in_app(mime) or mime in self._handlers):
+            self._dispatch(path, mime, self._handlers.get(mime))
+            return
+        self._pool.submit(self._resolve, path, mime)
+
+    def _resolve(self, path: str, mime: Optional[str]) -> None:
+        # worker thread: sniff the content if needed, then find the handler
+        if mime is None:
+            mime = self._db.mimeTypeForFile(path, QMimeDatabase.MatchMode.MatchContent).name()
+        handler = self._handlers[mime] if mime in self._handlers else None
+        if mime not in self._handlers and sys.platform.startswith("linux"):
+            handler = resolve_handler(mime)
+        self._resolved.emit(path, mime, handler)
+
+    def _on_resolved(self, path: str, mime: str, handler) -> None:
+        if sys.platform.startswith("linux"):
+            self._handlers.setdefault(mime, handler)
+        self._dispatch(path, mime, handler)
+
+    def _dispatch(self, path: str, mime: str, handler: Optional[list[str]]) -> None:
+        if self.open_in_app is not None and self.is_in_app(mime):
+            self.open_in_app(path, mime)
+            return
+        try:
+            if sys.platform == "win32":
+                os.startfile(path)
+                return
+            if sys.platform == "darwin":
+                argv = ["open", path]
+            elif handler:
+                argv = [path if arg == "{}" else arg for arg in handler]
+            else:
+                argv = ["xdg-open", path]
+            self._children.append(spawn_detached(argv))
+            self._reaper.start()
+        except OSError as e:
+            print(f"[Launcher] Could not open {path}: {e}")
+
+    def _reap(self) -> None:
+        # collect exit statuses so finished children don't linger as zombies
+        self._children = [p for p in self._children if p.poll() is None]
+        if not self._children:
+            self._reaper.stop()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
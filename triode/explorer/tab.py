@@ -2,19 +2,38 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QToolBar, QInputDialog, QMessageBox, QFileDialog
 )
-from PySide6.QtGui import QAction
+from PySide6.QtGui import QAction, QBrush, QColor
 from PySide6.QtCore import Signal, Qt
+from ..fs_probe import shared_probe, DIR, FILE, MISSING
+from .. import perf
+from . import archive_vfs
+from .git_status import shared_git_status, MODIFIED, UNTRACKED, IGNORED
 from .actions import list_dir, open_item, copy_items, move_items, delete_items, rename_item, make_directory, make_file
 from pathlib import Path
 import os
 import traceback
 
+# git status markers: suffix and text color per state
+_GIT_MARKS = {
+    MODIFIED: ("M", QColor("#d19a66")),
+    UNTRACKED: ("?", QColor("#98c379")),
+    IGNORED: ("!", QColor("#7f848e")),
+}
+
 class ExplorerTab(QWidget):
+    tab_kind = "explorer"
     path_changed = Signal(str)
+    _deliver = Signal(object)  # archive worker -> GUI thread: a callable to run
 
     def __init__(self, start_path: str = None, parent=None):
         super().__init__(parent)
         self.current_path = os.path.abspath(start_path or os.path.expanduser("~"))
+        self._nav_target: str | None = None
+        self.launcher = None  # set by TabManager; see _open_file
+        self._dirs: set[str] = set()
+        self._git_root: str | None = None  # repo of current_path, once its status is known
+        self._deliver.connect(lambda fn: fn())
+        shared_git_status().changed.connect(self._on_git_changed)
 
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -42,7 +61,7 @@ class ExplorerTab(QWidget):
         self.toolbar.addAction(act_back)
 
         act_refresh = QAction("Refresh", self)
-        act_refresh.triggered.connect(self.refresh)
+        act_refresh.triggered.connect(self._reload)
         self.toolbar.addAction(act_refresh)
 
         act_new_dir = QAction("New Folder", self)
@@ -73,47 +92,164 @@ class ExplorerTab(QWidget):
         act_rename.triggered.connect(self._rename)
         self.toolbar.addAction(act_rename)
 
+        act_dupes = QAction("Find Duplicates", self)
+        act_dupes.triggered.connect(self._find_duplicates)
+        self.toolbar.addAction(act_dupes)
+
     # ----- UI helpers -----
+    @perf.timed("explorer.refresh")
     def refresh(self):
         """Refresh listing and emit path_changed."""
         self.list_widget.clear()
+        self._dirs = set()
+        location = archive_vfs.split_archive_path(self.current_path)
+        try:
+            indexed = location is None or archive_vfs.cached_index(location[0]) is not None
+        except OSError as e:
+            # the archive was deleted or renamed while we were inside it
+            print(f"[ExplorerTab] Could not read {location[0]}: {e}")
+            self.path_changed.emit(self.current_path)
+            return
+        if not indexed:
+            # first visit: read the archive's member list on a worker, then list again
+            self.list_widget.addItem(QListWidgetItem("Reading archive..."))
+            path = self.current_path
+            future = archive_vfs.submit(archive_vfs.get_index, location[0])
+            future.add_done_callback(lambda f: self._deliver.emit(lambda: self._on_archive_indexed(path, f)))
+            self.path_changed.emit(self.current_path)
+            return
         try:
             entries = list_dir(self.current_path)
             for entry in entries:
                 item = QListWidgetItem(entry.name)
                 item.setData(Qt.ItemDataRole.UserRole, entry.path)
+                if entry.is_dir():
+                    self._dirs.add(entry.path)
                 glyph = "📁" if entry.is_dir() else "📄"
                 item.setToolTip(entry.path)
                 item.setText(f"{glyph}  {entry.name}")
                 self.list_widget.addItem(item)
         except Exception:
             traceback.print_exc()
+        if location is None:
+            self._request_git_status()
         self.path_changed.emit(self.current_path)
 
+    def _reload(self):
+        """Refresh after files may have changed: the cached git status is stale too."""
+        shared_git_status().invalidate_path(self.current_path)
+        self.refresh()
+
+    # ----- git status -----
+    def _request_git_status(self):
+        # listing never waits for git; markers are painted when the status arrives
+        path = self.current_path
+        status = shared_git_status().status_for(path, lambda s: self._on_git_status(path, s))
+        if status is not None:
+            self._on_git_status(path, status)
+
+    def _on_git_status(self, path: str, status):
+        if path != self.current_path:
+            return  # navigated elsewhere meanwhile
+        self._git_root = status.root if status is not None else None
+        if status is None:
+            return
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            entry = item.data(Qt.ItemDataRole.UserRole)
+            if not entry:
+                continue
+            is_dir = entry in self._dirs
+            text = f"{'📁' if is_dir else '📄'}  {os.path.basename(entry)}"
+            mark = _GIT_MARKS.get(status.state_of(entry, is_dir))
+            if mark is None:
+                item.setText(text)
+                item.setData(Qt.ItemDataRole.ForegroundRole, None)
+                continue
+            item.setText(f"{text}  {mark[0]}")
+            item.setForeground(QBrush(mark[1]))
+
+    def _on_git_changed(self, root: str):
+        if root == self._git_root:
+            self._request_git_status()  # repaint markers; the listing itself is unchanged
+
+    def _on_archive_indexed(self, path: str, future):
+        if path != self.current_path:
+            return  # navigated elsewhere meanwhile
+        if future.exception() is not None:
+            print(f"[ExplorerTab] Could not read archive {path}: {future.exception()}")
+            self.list_widget.clear()
+            return
+        self.refresh()
+
     def on_double_click(self, item: QListWidgetItem):
         path = item.data(Qt.ItemDataRole.UserRole)
-        if os.path.isdir(path):
+        if path:
+            self._activate(path)
+
+    def _activate(self, path: str):
+        # archives on disk are browsed like directories
+        if path in self._dirs or (archive_vfs.is_archive_name(path)
+                                  and archive_vfs.split_archive_path(os.path.dirname(path)) is None):
             self.current_path = path
             self.refresh()
+        else:
+            self._open_file(path)
+
+    def _open_file(self, path: str):
+        location = archive_vfs.split_archive_path(path)
+        if location is not None and location[1]:
+            # apps need a real file: stream the member out on a worker first
+            future = archive_vfs.submit(archive_vfs.extract_temp, *location)
+            future.add_done_callback(lambda f: self._deliver.emit(lambda: self._on_extracted(path, f)))
+            return
+        # the launcher never blocks; open_item is the fallback outside a TabManager
+        if self.launcher is not None:
+            self.launcher.open(path)
         else:
             open_item(path)
 
+    def _on_extracted(self, path: str, future):
+        if future.exception() is not None:
+            print(f"[ExplorerTab] Could not extract {path}: {future.exception()}")
+            return
+        self._open_file(future.result())
+
     def navigate_to(self, path: str):
         """Navigate to a path when AddressBarController tells us to."""
         if path.startswith("file://"):
             path = path[len("file://"):]
-        if os.path.isdir(path):
-            self.current_path = os.path.abspath(path)
-            self.refresh()
-            self.path_changed.emit(self.current_path)  # Emit after navigation
+        path = os.path.abspath(path)
+        self._nav_target = path
+        # isdir() can hang on a dead network mount; ask a worker instead
+        kind = shared_probe().probe(path, lambda kind: self._on_probed(path, kind))
+        if kind is not None:
+            self._on_probed(path, kind)
+
+    def _on_probed(self, path: str, kind: str):
+        if path != self._nav_target:
+            return  # navigated elsewhere meanwhile
+        self._nav_target = None
+        # paths inside an archive don't stat (ENOTDIR); the archive file itself does
+        if kind == DIR or kind in (FILE, MISSING) and archive_vfs.split_archive_path(path) is not None:
+            self.current_path = path
+            self.refresh()  # emits path_changed
             print(f"[ExplorerTab] navigated to {self.current_path}")
 
     def go_up(self):
         parent = os.path.dirname(self.current_path)
-        if parent and os.path.isdir(parent):
+        if parent and (archive_vfs.split_archive_path(parent) is not None or os.path.isdir(parent)):
             self.current_path = parent
             self.refresh()
 
+    def select_path(self, path: str):
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == path:
+                self.list_widget.setCurrentItem(item)
+                self.list_widget.scrollToItem(item)
+                return
+
     def selected_paths(self) -> list[str]:
         items = self.list_widget.selectedItems()
         return [it.data(Qt.ItemDataRole.UserRole) for it in items]
@@ -137,12 +273,7 @@ class ExplorerTab(QWidget):
     def _ctx_open(self, sel):
         if not sel:
             return
-        path = sel[0]
-        if os.path.isdir(path):
-            self.current_path = path
-            self.refresh()
-        else:
-            open_item(path)
+        self._activate(sel[0])
 
     # ----- actions -----
     def _copy_cut(self, action: str):
@@ -185,7 +316,7 @@ class ExplorerTab(QWidget):
             elif action == "cut":
                 move_items(paths, self.current_path)
                 tm.clear_clipboard()
-            self.refresh()
+            self._reload()
         except Exception as e:
             QMessageBox.critical(self, "Paste error", f"{e}")
 
@@ -201,7 +332,7 @@ class ExplorerTab(QWidget):
             return
         try:
             delete_items(sel)
-            self.refresh()
+            self._reload()
         except Exception as e:
             QMessageBox.critical(self, "Delete error", f"{e}")
 
@@ -216,17 +347,27 @@ class ExplorerTab(QWidget):
             return
         try:
             rename_item(old, new_name)
-            self.refresh()
+            self._reload()
         except Exception as e:
             QMessageBox.critical(self, "Rename error", f"{e}")
 
+    def _find_duplicates(self):
+        tm = self._find_tab_manager()
+        if tm is None:
+            QMessageBox.warning(self, "Find Duplicates", "Tab manager not found.")
+            return
+        if archive_vfs.split_archive_path(self.current_path) is not None:
+            QMessageBox.information(self, "Find Duplicates", "Archives can't be searched for duplicates.")
+            return
+        tm.create_duplicates_tab(self.current_path, insert_index=tm.indexOf(self) + 1)
+
     def _new_folder(self):
         name, ok = QInputDialog.getText(self, "New Folder", "Folder name:", text="new_folder")
         if not ok or not name:
             return
         try:
             make_directory(self.current_path, name)
-            self.refresh()
+            self._reload()
         except Exception as e:
             QMessageBox.critical(self, "Create folder failed", f"{e}")
 
@@ -236,7 +377,7 @@ class ExplorerTab(QWidget):
             return
         try:
             make_file(self.current_path, name)
-            self.refresh()
+            self._reload()
         except FileExistsError:
             QMessageBox.warning(self, "File exists", "A file with that name already exists.")
         except Exception as e:
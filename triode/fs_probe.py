@@ -0,0 +1,121 @@
+# triode/fs_probe.py
+# stat() away from the GUI thread. A stale NFS/sshfs mount can block stat()
+# for minutes, so the GUI only ever looks at memoized results and waits for
+# the rest through a signal (or gives up after a timeout).
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Signal, QTimer
+
+# probe results
+DIR = "dir"
+FILE = "file"        # a regular file
+SPECIAL = "special"  # FIFO, socket or device: exists, but not something to read
+MISSING = "missing"
+TIMEOUT = "timeout"  # the stat did not come back in time; treat as unknown
+
+
+def _stat_kind(path: str) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return MISSING
+    if stat.S_ISDIR(st.st_mode):
+        return DIR
+    return FILE if stat.S_ISREG(st.st_mode) else SPECIAL
+
+
+class FsProbe(QObject):
+    """
+    Memoized, timeout-bounded existence checks.
+
+    cached(path) never blocks. probe(path, callback) answers from the memo
+    when it can, otherwise stats on a worker thread and calls back on the GUI
+    thread with the result, or with TIMEOUT if the worker takes longer than
+    timeout_ms. done(path, kind) is emitted for every finished probe.
+    """
+
+    done = Signal(str, str)
+    _finished = Signal(str, str)  # worker -> GUI thread (queued)
+
+    def __init__(self, ttl: float = 10.0, timeout_ms: int = 250, max_entries: int = 512, parent=None):
+        super().__init__(parent)
+        self.ttl = ttl
+        self.timeout_ms = timeout_ms
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._waiters: dict[str, list[Callable[[str], None]]] = {}
+        self._finished.connect(self._on_finished)
+
+    def cached(self, path: str) -> Optional[str]:
+        hit = self._memo.get(path)
+        if hit is None or time.monotonic() - hit[0] >= self.ttl:
+            return None
+        self._memo.move_to_end(path)
+        return hit[1]
+
+    def probe(self, path: str, callback: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """The memoized kind of path, or None after starting a background probe."""
+        kind = self.cached(path)
+        if kind is not None:
+            return kind
+        first = path not in self._waiters
+        waiters = self._waiters.setdefault(path, [])
+        if callback is not None:
+            waiters.append(callback)
+        if first:
+            # daemon threads rather than a pool: a thread stuck on a dead mount
+            # must neither hold up other probes nor block interpreter exit
+            threading.Thread(target=self._work, args=(path,), name="triode-stat", daemon=True).start()
+            QTimer.singleShot(self.timeout_ms, self, lambda p=path: self._on_timeout(p))
+        return None
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        if path is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(path, None)
+
+    def _work(self, path: str) -> None:
+        self._finished.emit(path, _stat_kind(path))
+
+    def _remember(self, path: str, kind: str) -> None:
+        self._memo[path] = (time.monotonic(), kind)
+        self._memo.move_to_end(path)
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+
+    def _on_timeout(self, path: str) -> None:
+        if path not in self._waiters:
+            return  # already answered
+        # remembered so a hung mount isn't probed again on every keystroke;
+        # a late real answer replaces it
+        self._remember(path, TIMEOUT)
+        self._resolve(path, TIMEOUT)
+
+    def _on_finished(self, path: str, kind: str) -> None:
+        self._remember(path, kind)
+        self._resolve(path, kind)
+        self.done.emit(path, kind)
+
+    def _resolve(self, path: str, kind: str) -> None:
+        for callback in self._waiters.pop(path, ()):
+            try:
+                callback(kind)
+            except Exception as e:
+                print(f"[FsProbe] callback for {path} failed: {e}")
+
+
+_shared: Optional[FsProbe] = None
+
+
+def shared_probe() -> FsProbe:
+    """The process-wide probe (created on first use, after QApplication)."""
+    global _shared
+    if _shared is None:
+        _shared = FsProbe()
+    return _shared
@@ -1,24 +1,23 @@
 # triode/generic_tab.py
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QPixmap
-from .browser.factory import get_browser_backend
+from .images import scaled_pixmap
+
+LOGO_SIZE = QSize(271, 78)
 
 
 
 class GenericTab(QWidget):
+    tab_kind = "generic"
+
     def __init__(self, manager, parent=None):
         super().__init__(parent)
         self.manager = manager
-        self.backend = manager.backend
 
         layout = QVBoxLayout(self)
 
         logo = QLabel(self)
-        pixmap = QPixmap('logo.png')
-        newsize = QSize(271, 78)
-        pixmap = pixmap.scaled(newsize, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        logo.setPixmap(pixmap)
+        logo.setPixmap(scaled_pixmap("logo.png", LOGO_SIZE, self.devicePixelRatioF()))
         layout.addWidget(logo)
 
         newtab_label = QLabel(
@@ -28,8 +27,9 @@ class GenericTab(QWidget):
             "'>" +
             "<h1>How to use:</h1><hr>" +
             "http:// & https:// - Browser<br>" +
-            "file:// - File Explorer<br>" +
-            "term:// - Terminal" +
+            "file:// - File Explorer (or Viewer, for a file)<br>" +
+            "term:// - Terminal<br>" +
+            "about:downloads - Downloads" +
             "</div>"
             )
         
@@ -56,7 +56,7 @@ class GenericTab(QWidget):
         url = "http://example.com"
 
 
-        tab = BrowserTab(url)
+        tab = BrowserTab(url, backend=self.manager.backend)
         insert_index = 1
         self.manager.insertTab(insert_index, tab, "Browser")
         if self.manager.address_controller:
@@ -86,5 +86,4 @@ class GenericTab(QWidget):
         self.manager.setCurrentIndex(i)
 
     def _close_tab(self):
-        i = self.manager.indexOf(self)
-        self.manager.removeTab(i)   
\ No newline at end of file
+        self.manager.destroy_tab(self)   
\ No newline at end of file
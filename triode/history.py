@@ -0,0 +1,460 @@
+# triode/history.py
+import os
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+_SCHEME_PREFIXES = ("https://", "http://", "file://", "term://")
+_DAY = 86400.0
+_CHUNK = 1 << 20  # chars scanned between deadline checks (~1 ms)
+_RECENT_MAX = 500  # session entries suggest() checks on every keystroke
+
+
+def _data_dir() -> Path:
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    path = Path(base) / "triode"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def normalize(text: str) -> str:
+    """Lowercased URL/path without scheme or leading www., as matched against queries."""
+    text = text.strip().lower()
+    for prefix in _SCHEME_PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+            break
+    if text.startswith("www."):
+        text = text[4:]
+    return text.replace("\n", " ").replace("\t", " ")
+
+
+def frecency(visits: int, last_visit: float, now: Optional[float] = None) -> float:
+    """Visit count weighted by how recently the entry was last used."""
+    age = ((now or time.time()) - last_visit) / _DAY
+    if age < 4:
+        weight = 100
+    elif age < 14:
+        weight = 70
+    elif age < 31:
+        weight = 50
+    elif age < 90:
+        weight = 30
+    else:
+        weight = 10
+    return visits * weight
+
+
+class HistoryEntry:
+    __slots__ = ("url", "title", "kind", "visits", "last_visit")
+
+    def __init__(self, url: str, title: str, kind: str, visits: int, last_visit: float):
+        self.url = url
+        self.title = title
+        self.kind = kind
+        self.visits = visits
+        self.last_visit = last_visit
+
+
+class HistoryIndex:
+    """
+    Immutable in-memory search index over a snapshot of history.
+
+    Every entry is one line ("\\n<normalized url>\\t<lowercased title>") of a
+    single string, ordered by frecency when the index is built, so str.find
+    yields hits best-first. Only the text, line offsets and SQLite rowids are
+    kept; matching rows are read back from the database.
+    """
+
+    def __init__(self, rows: Iterable[tuple] = ()):
+        # rows: (rowid, url, title, visit_count, last_visit)
+        now = time.time()
+        ordered = sorted(rows, key=lambda r: -frecency(r[3], r[4], now))
+        self.starts = array("q")
+        self.rowids = array("q")
+        parts = []
+        pos = 0
+        for rowid, url, title, _visits, _last in ordered:
+            line = f"\n{normalize(url)}\t{(title or '').lower()}"
+            self.starts.append(pos)
+            self.rowids.append(rowid)
+            parts.append(line)
+            pos += len(line)
+        self.blob = "".join(parts) + "\n"
+
+    def __len__(self) -> int:
+        return len(self.rowids)
+
+    def scan(self, needle: str, limit: int, deadline: float, found: list, seen: set,
+             cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Append rowids of lines containing needle to found, best first, until
+        limit is reached, deadline (perf_counter) passes or cancelled() is true.
+        Returns True if the whole index was scanned.
+        """
+        blob, starts, rowids = self.blob, self.starts, self.rowids
+        end = len(blob)
+        span = len(needle) - 1
+        lo = 0
+        while lo < end:
+            hi = min(end, lo + _CHUNK)
+            pos = blob.find(needle, lo, hi + span)
+            while pos != -1:
+                i = bisect_right(starts, pos) - 1
+                if i not in seen:
+                    seen.add(i)
+                    found.append(rowids[i])
+                    if len(found) >= limit:
+                        return False
+                # skip the rest of this line so each entry matches once
+                nxt = starts[i + 1] if i + 1 < len(starts) else end
+                pos = blob.find(needle, nxt, hi + span) if nxt < hi else -1
+            lo = hi
+            if time.perf_counter() > deadline or (cancelled is not None and cancelled()):
+                return False
+        return True
+
+
+class HistoryStore(QObject):
+    """
+    Visit history for browser URLs, explorer paths and terminal paths.
+
+    record() only touches memory on the calling (GUI) thread; rows are written
+    to SQLite by a background thread in batches. That thread also loads and
+    indexes existing history, so startup never waits for it, and keeps the
+    visit counts of this session's entries up to date.
+
+    suggest() scans the in-memory index best-first within its frame budget. If
+    the query is rare enough that the scan can't finish in time, the rest of
+    the search (the SQLite FTS5 trigram index when available, else the whole
+    index) runs on a worker; suggestions_ready(text) is emitted when it's done
+    and suggest(text) then includes its matches.
+    """
+
+    suggestions_ready = Signal(str)
+    _finished = Signal(int, str, str, object)  # worker -> GUI thread: seq, text, query, entries
+
+    def __init__(self, settings: dict, path: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        cfg = settings.get("history", {})
+        self.enabled = cfg.get("enabled", True)
+        self.path = path or str(_data_dir() / "history.sqlite")
+        self.batch_size = int(cfg.get("batch_size", 200))
+        self.flush_interval = float(cfg.get("flush_interval_s", 2.0))
+
+        self._index = HistoryIndex()
+        self._fts = False
+        self._reader: Optional[sqlite3.Connection] = None
+        # entries visited this session, most recent last; they shadow what's
+        # in the index/db. record() adds a placeholder, the writer thread fills
+        # in the counts and drops the oldest past _RECENT_MAX (they're still
+        # written; the index picks them up on the next start)
+        self._recent: "OrderedDict[str, HistoryEntry]" = OrderedDict()
+        self._last_url = ""
+        self._last_time = 0.0
+
+        # the search that didn't fit in suggest()'s budget
+        self._search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="triode-history-search")
+        self._searcher: Optional[sqlite3.Connection] = None  # used only on that worker
+        self._seq = 0          # bumped to abandon an unfinished search
+        self._searching = ""   # query being searched on the worker
+        self._late: tuple[str, list[HistoryEntry]] = ("", [])  # (query, its entries) from the worker
+        self._finished.connect(self._on_search_finished)
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, name="triode-history", daemon=True)
+            self._thread.start()
+
+    # ---------- recording ----------
+    def record(self, url: str, kind: str, title: str = "") -> None:
+        """Count a visit to url (a browser URL, file:// or term:// text)."""
+        if not self.enabled or not url:
+            return
+        now = time.time()
+        # the same page/path reported twice in a row is one visit
+        if url == self._last_url and now - self._last_time < 2.0:
+            if title:
+                self.set_title(url, title)
+            return
+        self._last_url, self._last_time = url, now
+        # shown until the writer has added the visits already stored for url
+        self._recent.setdefault(url, HistoryEntry(url, title, kind, 1, now))
+        self._queue.put(("visit", url, title, kind, now))
+
+    def set_title(self, url: str, title: str) -> None:
+        if not self.enabled or not url or not title:
+            return
+        entry = self._recent.get(url)
+        if entry is not None and entry.title == title:
+            return
+        self._queue.put(("title", url, title))
+
+    # ---------- querying ----------
+    def suggest(self, text: str, limit: int = 8, budget_ms: float = 12.0) -> list[HistoryEntry]:
+        """
+        Frecency-ranked entries whose URL/path or title contains text. When the
+        budget runs out before the search is done, it continues on a worker
+        and suggestions_ready(text) follows.
+        """
+        query = normalize(text)
+        if not self.enabled or not query:
+            return []
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        lowered = text.strip().lower()
+        scheme = next((p for p in _SCHEME_PREFIXES if lowered.startswith(p)), None)
+
+        # over-fetch so re-ranking by current frecency has something to choose from
+        want = limit * 4
+        index = self._index
+        rowids: list[int] = []
+        seen: set = set()
+        # prefix hits first, then any substring hit
+        exhausted = index.scan("\n" + query, limit, start + budget_ms / 4000.0, rowids, seen)
+        if len(rowids) < want:
+            exhausted = index.scan(query, want, start + budget_ms / 2000.0, rowids, seen)
+
+        late: list[HistoryEntry] = []
+        if self._late[0] == query:
+            late = self._late[1]
+        elif query != self._searching:
+            self._seq += 1  # abandon the search for an earlier query
+            self._searching = ""
+            if not exhausted and len(rowids) < want:
+                self._searching = query
+                self._search_pool.submit(self._search, self._seq, text, query, want)
+
+        # rowid lookups are quick; the deadline only guards against a stalled database
+        candidates = {e.url: e for e in late}
+        candidates.update((e.url, e) for e in self._fetch(self._reader_connection(), rowids, deadline))
+        for e in list(self._recent.values()):
+            if query in normalize(e.url) or query in e.title.lower():
+                candidates[e.url] = e
+
+        now = time.time()
+        matches = [e for e in candidates.values() if scheme is None or e.url.lower().startswith(scheme)]
+        matches.sort(key=lambda e: (not normalize(e.url).startswith(query), -frecency(e.visits, e.last_visit, now)))
+        return matches[:limit]
+
+    def _search(self, seq: int, text: str, query: str, want: int) -> None:
+        """Worker: the rest of a search suggest() had no time for."""
+        cancelled = lambda: seq != self._seq  # noqa: E731
+        if cancelled():
+            return
+        if self._searcher is None:
+            self._searcher = self._connect_reader(check_same_thread=False)
+        db = self._searcher
+        rowids: list[int] = []
+        if self._fts and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self._query(db, "SELECT rowid FROM visits_fts WHERE visits_fts MATCH ? LIMIT ?",
+                               (phrase, 256), cancelled)
+            rowids = [r[0] for r in rows]
+        else:
+            self._index.scan(query, want, float("inf"), rowids, set(), cancelled)
+        entries = self._fetch(db, rowids, cancelled=cancelled)
+        if not cancelled():
+            self._finished.emit(seq, text, query, entries)
+
+    def _on_search_finished(self, seq: int, text: str, query: str, entries: list) -> None:
+        if seq != self._seq:
+            return  # the user has typed on since
+        self._searching = ""
+        self._late = (query, entries)
+        self.suggestions_ready.emit(text)
+
+    def _fetch(self, db: Optional[sqlite3.Connection], rowids: list[int], deadline: float = 0.0,
+               cancelled: Optional[Callable[[], bool]] = None) -> list[HistoryEntry]:
+        if not rowids:
+            return []
+        marks = ",".join("?" * len(rowids))
+        if deadline:
+            cancelled = lambda: time.perf_counter() > deadline  # noqa: E731
+        rows = self._query(
+            db, f"SELECT url, title, kind, visit_count, last_visit FROM visits WHERE rowid IN ({marks})",
+            rowids, cancelled,
+        )
+        return [HistoryEntry(*r) for r in rows]
+
+    def _reader_connection(self) -> Optional[sqlite3.Connection]:
+        if self._reader is None:
+            self._reader = self._connect_reader()
+        return self._reader
+
+    def _connect_reader(self, check_same_thread: bool = True) -> Optional[sqlite3.Connection]:
+        """Read-only connection (WAL readers don't block the writer), or None before the db exists."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=check_same_thread)
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def _query(db: Optional[sqlite3.Connection], sql: str, params,
+               cancelled: Optional[Callable[[], bool]] = None) -> list[tuple]:
+        """Run a read, interrupted (returning nothing) as soon as cancelled() is true."""
+        if db is None:
+            return []
+        if cancelled is not None:
+            db.set_progress_handler(cancelled, 1000)
+        try:
+            return db.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            return []
+        finally:
+            if cancelled is not None:
+                db.set_progress_handler(None, 0)
+
+    # ---------- lifecycle ----------
+    def close(self) -> None:
+        """Flush pending writes and stop the writer and search threads."""
+        self._seq += 1
+        self._search_pool.shutdown(wait=True, cancel_futures=True)
+        if self._searcher is not None:
+            self._searcher.close()
+            self._searcher = None
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    # ---------- writer thread ----------
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS visits ("
+            " url TEXT PRIMARY KEY, title TEXT NOT NULL DEFAULT '', kind TEXT NOT NULL,"
+            " visit_count INTEGER NOT NULL DEFAULT 0, last_visit REAL NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    def _ensure_fts(self, db: sqlite3.Connection) -> bool:
+        """Trigram FTS index kept in sync by triggers; needs SQLite >= 3.34."""
+        try:
+            exists = db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'visits_fts'"
+            ).fetchone()
+            if exists:
+                return True
+            with db:
+                db.execute(
+                    "CREATE VIRTUAL TABLE visits_fts USING fts5("
+                    " url, title, content='visits', content_rowid='rowid', tokenize='trigram')"
+                )
+                db.executescript(
+                    "CREATE TRIGGER visits_ai AFTER INSERT ON visits BEGIN"
+                    "  INSERT INTO visits_fts(rowid, url, title) VALUES (new.rowid, new.url, new.title);"
+                    " END;"
+                    "CREATE TRIGGER visits_ad AFTER DELETE ON visits BEGIN"
+                    "  INSERT INTO visits_fts(visits_fts, rowid, url, title)"
+                    "  VALUES ('delete', old.rowid, old.url, old.title);"
+                    " END;"
+                    "CREATE TRIGGER visits_au AFTER UPDATE OF url, title ON visits BEGIN"
+                    "  INSERT INTO visits_fts(visits_fts, rowid, url, title)"
+                    "  VALUES ('delete', old.rowid, old.url, old.title);"
+                    "  INSERT INTO visits_fts(rowid, url, title) VALUES (new.rowid, new.url, new.title);"
+                    " END;"
+                )
+                # index whatever history predates the FTS table
+                db.execute("INSERT INTO visits_fts(visits_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.Error as e:
+            print(f"[HistoryStore] Full-text index unavailable, using scan only: {e}")
+            return False
+
+    def _run(self) -> None:
+        try:
+            db = self._connect()
+            rows = db.execute("SELECT rowid, url, title, visit_count, last_visit FROM visits").fetchall()
+            # swapping the reference is atomic; the GUI thread never sees a half-built index
+            self._index = HistoryIndex(rows)
+            del rows
+            self._fts = self._ensure_fts(db)
+        except sqlite3.Error as e:
+            print(f"[HistoryStore] History unavailable: {e}")
+            return
+
+        pending: list[tuple] = []
+        counted: set[str] = set()  # urls whose _recent entry includes their stored visits
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if item:
+                pending.append(item)
+                self._update_recent(db, item, counted)
+            if item is None or len(pending) >= self.batch_size or (
+                pending and time.monotonic() - last_flush >= self.flush_interval
+            ):
+                self._write(db, pending)
+                pending = []
+                last_flush = time.monotonic()
+            if item is None:
+                db.close()
+                return
+
+    def _update_recent(self, db: sqlite3.Connection, item: tuple, counted: set) -> None:
+        """Bring the in-memory entry for item's url up to date (visits stored before this session included)."""
+        url = item[1]
+        if url in counted:
+            entry = self._recent.get(url)
+        else:
+            try:
+                row = db.execute(
+                    "SELECT url, title, kind, visit_count, last_visit FROM visits WHERE url = ?", (url,)
+                ).fetchone()
+            except sqlite3.Error:
+                row = None
+            entry = HistoryEntry(*row) if row else None
+        if item[0] == "visit":
+            _, url, title, kind, when = item
+            visits = entry.visits if entry else 0
+            title = title or (entry.title if entry else "")
+            self._recent[url] = HistoryEntry(url, title, kind, visits + 1, when)
+            self._recent.move_to_end(url)
+            counted.add(url)
+        elif entry is not None:
+            self._recent[url] = HistoryEntry(url, item[2], entry.kind, entry.visits, entry.last_visit)
+            counted.add(url)
+        while len(self._recent) > _RECENT_MAX:
+            old, _ = self._recent.popitem(last=False)
+            counted.discard(old)  # read back from the db if it's visited again
+
+    def _write(self, db: sqlite3.Connection, items: list[tuple]) -> None:
+        if not items:
+            return
+        visits = [i[1:] for i in items if i[0] == "visit"]
+        titles = [(i[2], i[1]) for i in items if i[0] == "title"]
+        try:
+            with db:
+                db.executemany(
+                    "INSERT INTO visits (url, title, kind, visit_count, last_visit) VALUES (?, ?, ?, 1, ?)"
+                    " ON CONFLICT(url) DO UPDATE SET visit_count = visit_count + 1,"
+                    " last_visit = excluded.last_visit,"
+                    " title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END",
+                    visits,
+                )
+                db.executemany("UPDATE visits SET title = ? WHERE url = ?", titles)
+        except sqlite3.Error as e:
+            print(f"[HistoryStore] Failed to write history: {e}")
@@ -0,0 +1,94 @@
+# triode/images.py
+# Package image resources, decoded and scaled at most once.
+#
+# Lookup order for a (name, size, device-pixel-ratio) request:
+#   1. QPixmapCache (in-process, shared by every widget)
+#   2. a pre-scaled asset shipped in triode/resources/scaled/ (see build_assets)
+#   3. a pre-scaled copy in the user cache dir, written on a previous run
+#   4. decode the full-size original, scale it, and write (3) for next time
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage, QPixmap, QPixmapCache
+
+RESOURCE_DIR = Path(__file__).resolve().parent / "resources"
+PREBUILT_DIR = RESOURCE_DIR / "scaled"
+
+# (name, logical size, device pixel ratios) generated by build_assets()
+PREBUILT = [("logo.png", QSize(271, 78), (1.0, 2.0))]
+
+
+def resource_path(name: str) -> str:
+    return str(RESOURCE_DIR / name)
+
+
+def _user_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "triode" / "images"
+
+
+def _scaled_name(name: str, size: QSize, dpr: float) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{size.width()}x{size.height()}@{dpr:g}x{ext}"
+
+
+def _scale_image(name: str, size: QSize, dpr: float) -> QImage:
+    image = QImage(resource_path(name))
+    if image.isNull():
+        return image
+    return image.scaled(
+        size * dpr, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+    )
+
+
+def scaled_pixmap(name: str, size: QSize, dpr: float = 1.0) -> QPixmap:
+    """
+    name from triode/resources, scaled to fit size (logical pixels) at dpr.
+    Cheap after the first call for a given (name, size, dpr).
+    """
+    dpr = round(dpr * 4) / 4 or 1.0  # keep the number of cached variants small
+    key = f"triode:{_scaled_name(name, size, dpr)}"
+    pixmap = QPixmap()
+    if QPixmapCache.find(key, pixmap):
+        return pixmap
+
+    filename = _scaled_name(name, size, dpr)
+    image = QImage(str(PREBUILT_DIR / filename))
+    if image.isNull():
+        try:
+            src = os.stat(resource_path(name))
+            cached = _user_cache_dir() / f"{int(src.st_mtime)}-{src.st_size}-{filename}"
+        except OSError:
+            cached = None
+        if cached is not None:
+            image = QImage(str(cached))
+        if image.isNull():
+            image = _scale_image(name, size, dpr)
+            if cached is not None and not image.isNull():
+                try:
+                    cached.parent.mkdir(parents=True, exist_ok=True)
+                    image.save(str(cached))
+                except OSError as e:
+                    print(f"[images] Could not cache {filename}: {e}")
+
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def build_assets() -> None:
+    """Write the PREBUILT variants into triode/resources/scaled/."""
+    PREBUILT_DIR.mkdir(parents=True, exist_ok=True)
+    for name, size, ratios in PREBUILT:
+        for dpr in ratios:
+            out = PREBUILT_DIR / _scaled_name(name, size, dpr)
+            image = _scale_image(name, size, dpr)
+            if image.isNull() or not image.save(str(out)):
+                raise RuntimeError(f"could not build {out}")
+            print(f"[images] wrote {out} ({out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    build_assets()
@@ -0,0 +1,102 @@
+# triode/instance_server.py
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from .ipc import socket_path, decode_request
+
+MAX_REQUEST = 64 * 1024  # bytes; a longer request line drops the connection
+_PROBE_TIMEOUT_MS = 500
+
+
+class InstanceServer(QObject):
+    """
+    Listens on ipc.socket_path() for later launches. Each connection sends one
+    JSON line of targets (URLs, routes, paths); they are emitted through
+    open_requested and acknowledged with "ok". listen() doesn't block:
+    listening(ok) follows once it's known whether another instance has the
+    socket.
+    """
+
+    open_requested = Signal(list)
+    listening = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = socket_path()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict[int, bytes] = {}
+
+    def listen(self) -> None:
+        # with socket options set, listen() replaces an existing socket file
+        # even if an instance is serving it (e.g. we were started with
+        # --new-instance), so ask first and leave a live one alone
+        probe = QLocalSocket(self)
+        timer = QTimer(probe)
+        timer.setSingleShot(True)
+        # an instance too busy to accept within the timeout still counts as alive
+        timer.timeout.connect(lambda: self._on_probed(probe, True))
+        probe.connected.connect(lambda: self._on_probed(probe, True))
+        probe.errorOccurred.connect(lambda _error: self._on_probed(probe, False))
+        timer.start(_PROBE_TIMEOUT_MS)
+        probe.connectToServer(self.path)
+
+    def _on_probed(self, probe: QLocalSocket, alive: bool) -> None:
+        if probe.parent() is None:
+            return  # already answered
+        probe.setParent(None)
+        probe.abort()
+        probe.deleteLater()
+        if alive:
+            print(f"[InstanceServer] Another instance is listening on {self.path}")
+            self.listening.emit(False)
+        else:
+            self.listening.emit(self._listen())
+
+    def _listen(self) -> bool:
+        if self._server.listen(self.path):
+            return True
+        # nobody answers: the socket file is left over from a crash
+        QLocalServer.removeServer(self.path)
+        if self._server.listen(self.path):
+            return True
+        print(f"[InstanceServer] Could not listen on {self.path}: {self._server.errorString()}")
+        return False
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            conn: QLocalSocket = self._server.nextPendingConnection()
+            self._buffers[id(conn)] = b""
+            conn.readyRead.connect(lambda c=conn: self._on_ready_read(c))
+            conn.disconnected.connect(lambda c=conn: self._drop(c))
+
+    def _on_ready_read(self, conn: QLocalSocket) -> None:
+        buf = self._buffers.get(id(conn), b"") + bytes(conn.readAll())
+        end = buf.find(b"\n")
+        if end < 0 and len(buf) <= MAX_REQUEST:
+            self._buffers[id(conn)] = buf
+            return
+        if end < 0 or end > MAX_REQUEST:
+            print(f"[InstanceServer] Dropping a connection that sent over {MAX_REQUEST} bytes")
+            self._buffers.pop(id(conn), None)
+            conn.abort()
+            return
+        line = buf[:end]
+        try:
+            targets = decode_request(line)
+        except ValueError as e:
+            print(f"[InstanceServer] Bad request: {e}")
+            conn.write(b"error\n")
+        else:
+            conn.write(b"ok\n")
+            self.open_requested.emit(targets)
+        conn.flush()
+        conn.disconnectFromServer()
+
+    def _drop(self, conn: QLocalSocket) -> None:
+        self._buffers.pop(id(conn), None)
+        conn.deleteLater()
@@ -0,0 +1,59 @@
+# triode/ipc.py
+# Client half of single-instance mode. Standard library only, so a second
+# launch can hand its arguments to the running instance and exit without
+# importing Qt at all. The server half is instance_server.py.
+import json
+import os
+import socket
+import tempfile
+from typing import List
+
+SCHEME_PREFIXES = ("http://", "https://", "file://", "term://", "about:")
+
+
+def socket_path() -> str:
+    """Per-user socket path; the running instance listens here."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, "triode.sock")
+    return os.path.join(tempfile.gettempdir(), f"triode-{os.getuid()}.sock")
+
+
+def normalize_target(arg: str) -> str:
+    """Make a relative path absolute from the caller's cwd; URLs and routes pass through."""
+    if arg.startswith(SCHEME_PREFIXES):
+        return arg
+    if arg.startswith(("~", ".", "/")) or os.path.exists(arg):
+        return os.path.abspath(os.path.expanduser(arg))
+    return arg  # e.g. "example.com", left to URLRouter
+
+
+def encode_request(targets: List[str]) -> bytes:
+    return json.dumps({"targets": targets}).encode("utf-8") + b"\n"
+
+
+def decode_request(line: bytes) -> List[str]:
+    """The targets of a request line; ValueError if it isn't {"targets": [str, ...]}."""
+    data = json.loads(line.decode("utf-8"))
+    targets = data.get("targets") if isinstance(data, dict) else None
+    if not isinstance(targets, list) or not all(isinstance(t, str) for t in targets):
+        raise ValueError("expected {\"targets\": [str, ...]}")
+    return targets
+
+
+def send_to_running(targets: List[str], timeout: float = 2.0) -> bool:
+    """
+    Pass targets to an already running instance. True if it accepted them;
+    False if there is none (or it didn't answer), so the caller starts one.
+    """
+    path = socket_path()
+    if not os.path.exists(path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(path)
+            s.sendall(encode_request(targets))
+            return s.recv(16).startswith(b"ok")
+    except OSError:
+        return False  # stale socket file or an instance that is shutting down
@@ -6,9 +6,10 @@ from PySide6.QtWidgets import (
 from .tab_manager import TabManager
 from .address_bar import AddressBarController
 from .url_router import URLRouter
+from .explorer import git_status
 
 class MainWindow(QMainWindow):
-    def __init__(self, settings: dict, parent=None):
+    def __init__(self, settings: dict, targets=(), parent=None):
         super().__init__(parent)
         self.setWindowTitle("Triode")
         self.resize(1024, 768)
@@ -40,4 +41,51 @@ class MainWindow(QMainWindow):
         # Open default tab
         #self.tabs.create_browser_tab("http://example.com")
         #self.tabs.create_explorer_tab()
-        self.tabs.create_generic_tab()
+        self.instance_server = None
+        restoring = self.tabs.restore_session()
+        if targets:
+            if restoring:
+                # after the restored tabs, so they don't take the focus back
+                self.tabs.restored.connect(lambda: self.open_targets(targets))
+            else:
+                self.open_targets(targets)
+        elif not restoring:
+            self.tabs.create_generic_tab()
+
+    def open_targets(self, targets: list) -> None:
+        """
+        Open URLs, routes or paths (from the command line or another launch) as
+        new tabs and bring the window forward, even with no targets (a second
+        launch without arguments).
+        """
+        for text in targets:
+            self.router.resolve(text, self.tabs.open_route)
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def start_instance_server(self) -> None:
+        from .instance_server import InstanceServer
+        self.instance_server = InstanceServer(parent=self)
+        self.instance_server.open_requested.connect(self.open_targets)
+        self.instance_server.listening.connect(self._on_instance_server_listening)
+        self.instance_server.listen()
+
+    def _on_instance_server_listening(self, ok: bool) -> None:
+        if not ok and self.instance_server is not None:
+            self.instance_server.deleteLater()
+            self.instance_server = None
+
+    def closeEvent(self, event):
+        # write any pending session changes before the tabs go away
+        self.tabs.session.flush()
+        self.tabs.history.close()
+        self.address_controller.paths.cache.shutdown()
+        self.tabs.launcher.shutdown()
+        self.tabs.downloads.shutdown()
+        git_status.shutdown()
+        if self.instance_server is not None:
+            self.instance_server.close()
+        super().closeEvent(event)
+
@@ -1,9 +1,29 @@
 # triode/models/route.py
+import sys
 from dataclasses import dataclass
-from typing import Dict
+from typing import Mapping, Union
 
-@dataclass(frozen=True)
+Query = tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True, slots=True)
 class URLRoute:
+    """
+    Immutable and hashable, so routes can be memoized, used as dict keys and
+    kept in large numbers (history, sessions, tab placeholders) cheaply.
+    """
     scheme: str               # 'http' | 'https' | 'file' | 'term'
     path: str                 # normalized absolute path or URL
-    query: Dict[str, str] = None
+    query: Query = ()         # sorted (key, value) pairs; a dict is accepted and converted
+
+    def __post_init__(self):
+        # a handful of distinct schemes: share one string object between all routes
+        object.__setattr__(self, "scheme", sys.intern(self.scheme))
+        query: Union[Query, Mapping[str, str], None] = self.query
+        if isinstance(query, Mapping):
+            object.__setattr__(self, "query", tuple(sorted(query.items())))
+        elif query is None:
+            object.__setattr__(self, "query", ())
+
+    def query_dict(self) -> dict[str, str]:
+        return dict(self.query)
@@ -0,0 +1,182 @@
+# triode/path_completion.py
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal, QFileSystemWatcher
+
+PATH_PREFIXES = ("file://", "term://")
+# (name, is_dir)
+Listing = list[tuple[str, bool]]
+
+
+def split_path_text(text: str) -> Optional[tuple[str, str, str]]:
+    """
+    Split address-bar text into (head, directory, partial name), or None if it
+    doesn't look like a path. head is everything up to the partial name, so a
+    completion is head + name.
+    """
+    body = text
+    for prefix in PATH_PREFIXES:
+        if text.startswith(prefix):
+            body = text[len(prefix):]
+            break
+    else:
+        if not text.startswith(("/", "~", "./", "../")):
+            return None
+    cut = body.rfind("/")
+    if cut == -1:
+        # a bare "~" or "~user" has no directory part yet
+        return None
+    directory = body[: cut + 1]
+    partial = body[cut + 1:]
+    head = text[: len(text) - len(partial)]
+    return head, os.path.abspath(os.path.expanduser(directory)), partial
+
+
+def _list_directory(path: str) -> Listing:
+    """Runs on a worker thread; d_type from scandir avoids a stat per entry."""
+    out: Listing = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            out.append((entry.name, is_dir))
+    out.sort(key=lambda e: e[0].lower())
+    return out
+
+
+class DirectoryCache(QObject):
+    """
+    Directory listings made on a worker thread and cached per directory.
+    An entry is dropped when it is older than ttl or when the inotify-backed
+    QFileSystemWatcher reports the directory changed.
+    """
+
+    listed = Signal(str)
+    _finished = Signal(str, object)  # worker -> GUI thread (queued)
+
+    def __init__(self, ttl: float = 5.0, max_dirs: int = 64, parent=None):
+        super().__init__(parent)
+        self.ttl = ttl
+        self.max_dirs = max_dirs
+        self._entries: "OrderedDict[str, tuple[float, Listing]]" = OrderedDict()
+        self._pending: set[str] = set()
+        # more than one worker so one hung mount doesn't stall every listing
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="triode-ls")
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.invalidate)
+        self._finished.connect(self._on_finished)
+
+    def get(self, path: str) -> Optional[Listing]:
+        """Cached listing of path, or None (a listing is then started in the background)."""
+        hit = self._entries.get(path)
+        if hit is not None and time.monotonic() - hit[0] < self.ttl:
+            self._entries.move_to_end(path)
+            return hit[1]
+        self._request(path)
+        return None
+
+    def invalidate(self, path: str) -> None:
+        self._entries.pop(path, None)
+        if path in self._watcher.directories():
+            self._watcher.removePath(path)
+
+    def _request(self, path: str) -> None:
+        if path in self._pending:
+            return
+        self._pending.add(path)
+        future = self._pool.submit(_list_directory, path)
+        future.add_done_callback(lambda f, p=path: self._finished.emit(p, f))
+
+    def _on_finished(self, path: str, future) -> None:
+        self._pending.discard(path)
+        try:
+            listing = future.result()
+        except OSError:
+            listing = []
+        self._entries[path] = (time.monotonic(), listing)
+        self._entries.move_to_end(path)
+        if path not in self._watcher.directories():
+            self._watcher.addPath(path)
+        while len(self._entries) > self.max_dirs:
+            old, _ = self._entries.popitem(last=False)
+            self._watcher.removePath(old)
+        self.listed.emit(path)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PathCompleter(QObject):
+    """
+    Shell-like completion for file://, term:// and bare paths.
+
+    complete(text) answers from the cache when it can; otherwise it returns
+    None and emits ready(text, completions) once the directory is listed.
+    Typing more of a name filters the previous matches instead of the listing.
+    """
+
+    ready = Signal(str, list)
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        cfg = settings.get("completion", {})
+        self.limit = int(cfg.get("max_paths", 200))
+        self.cache = DirectoryCache(ttl=float(cfg.get("dir_ttl_s", 5.0)), parent=self)
+        self.cache.listed.connect(self._on_listed)
+        self._waiting_text: Optional[str] = None
+        # (listing, partial, matches) of the previous answer
+        self._last: Optional[tuple[Listing, str, Listing]] = None
+
+    def complete(self, text: str) -> Optional[list[str]]:
+        parts = split_path_text(text)
+        if parts is None:
+            self._waiting_text = None
+            return []
+        head, directory, partial = parts
+
+        listing = self.cache.get(directory)
+        if listing is None:
+            self._waiting_text = text
+            return None
+        last = self._last
+        if last is not None and last[0] is listing and last[1] and partial.startswith(last[1]):
+            # same listing, longer name: narrow the previous matches
+            candidates = last[2]
+        else:
+            candidates = listing
+
+        matches = self._filter(candidates, partial)
+        self._last = (listing, partial, matches)
+        self._waiting_text = None
+        return [head + name + ("/" if is_dir else "") for name, is_dir in matches[: self.limit]]
+
+    def common_completion(self, text: str) -> Optional[str]:
+        """Text extended by the longest prefix shared by all matches (for Tab), or None."""
+        completions = self.complete(text)
+        if not completions:
+            return None
+        common = os.path.commonprefix(completions)
+        return common if len(common) > len(text) else None
+
+    def _filter(self, candidates: Listing, partial: str) -> Listing:
+        if partial:
+            return [c for c in candidates if c[0].startswith(partial)]
+        # like a shell, dotfiles only show up once a "." has been typed
+        return [c for c in candidates if not c[0].startswith(".")]
+
+    def _on_listed(self, directory: str) -> None:
+        text = self._waiting_text
+        if text is None:
+            return
+        parts = split_path_text(text)
+        if parts is None or parts[1] != directory:
+            return
+        completions = self.complete(text)
+        if completions is not None:
+            self.ready.emit(text, completions)
@@ -0,0 +1,119 @@
+# triode/perf.py
+# Opt-in timers and counters for hot paths. Off by default, when every hook
+# costs one flag check; enable with {"perf": {"enabled": true}} or `--perf`.
+# PerfMonitor (perf_monitor.py) adds stall detection, per-tab resources, the
+# about:perf tab and the JSON-lines dump on top of this.
+import functools
+import inspect
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+_enabled = False
+
+
+class TimerStat:
+    """Running totals for one timer, plus recent samples for percentiles."""
+
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, keep: int = 512):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=keep)
+
+    def add(self, secs: float) -> None:
+        self.count += 1
+        self.total += secs
+        if secs > self.max:
+            self.max = secs
+        self.recent.append(secs)
+
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self.recent)
+        p50 = recent[len(recent) // 2] if recent else 0.0
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+_timers: Dict[str, TimerStat] = {}
+_counters: Dict[str, int] = {}
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def record(name: str, secs: float) -> None:
+    stat = _timers.get(name)
+    if stat is None:
+        stat = _timers[name] = TimerStat()
+    stat.add(secs)
+
+
+def count(name: str, n: int = 1) -> None:
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+@contextmanager
+def span(name: str):
+    """with perf.span("name"): ... times the block."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator timing every call of a function under name. Safe on Qt slots:
+    like Qt itself, signal arguments beyond what the function takes are dropped.
+    """
+    def decorate(fn: Callable) -> Callable:
+        code = fn.__code__
+        nargs = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if nargs is not None and len(args) > nargs:
+                args = args[:nargs]
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def snapshot() -> Dict[str, Any]:
+    return {
+        "timers": {name: stat.summary() for name, stat in sorted(_timers.items())},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def reset() -> None:
+    _timers.clear()
+    _counters.clear()
@@ -0,0 +1,163 @@
+# triode/perf_monitor.py
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+from . import perf
+from .procfs import rss_bytes, cpu_seconds
+from .watchdog import EventLoopWatchdog
+
+
+def _default_dump_path() -> str:
+    base = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return str(Path(base) / "triode" / "perf.jsonl")
+
+
+class PerfMonitor(QObject):
+    """
+    Runtime side of the perf instrumentation: an event-loop stall detector
+    (a heartbeat timer that notices when it fires late), the stack-sampling
+    watchdog (watchdog.py), per-tab RSS/CPU of renderer and shell processes,
+    and a periodic JSON-lines dump of it all.
+    Does nothing unless perf.enabled is set; about:perf reads report().
+    """
+
+    def __init__(self, tab_manager, settings: dict, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        cfg = settings.get("perf", {})
+        self.enabled = bool(cfg.get("enabled", False))
+        self.heartbeat_ms = int(cfg.get("heartbeat_ms", 50))
+        self.stall_ms = float(cfg.get("stall_ms", 100))
+        self.dump_interval_s = float(cfg.get("dump_interval_s", 10))
+        self.dump_path = cfg.get("dump_path") or _default_dump_path()
+        self.stalls_path = os.path.join(os.path.dirname(self.dump_path), "stalls.json")
+        watchdog_ms = float(cfg.get("watchdog_ms", 250))
+        self.watchdog: Optional[EventLoopWatchdog] = None
+        if watchdog_ms > 0:
+            self.watchdog = EventLoopWatchdog(
+                threshold_ms=watchdog_ms, heartbeat_ms=self.heartbeat_ms, parent=self
+            )
+        self.stalls: deque = deque(maxlen=50)  # (wall-clock time, stall ms)
+        self._cpu_prev: Dict[int, tuple[float, float]] = {}
+        self._last_beat = 0.0
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self._heartbeat.setInterval(self.heartbeat_ms)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+        self._dump_timer = QTimer(self)
+        self._dump_timer.setInterval(int(self.dump_interval_s * 1000))
+        self._dump_timer.timeout.connect(self.dump)
+        if self.enabled:
+            self.start()
+
+    def start(self) -> None:
+        perf.enable(True)
+        self.enabled = True
+        self._last_beat = time.perf_counter()
+        self._heartbeat.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+        if self.dump_interval_s > 0:
+            self._dump_timer.start()
+
+    def stop(self) -> None:
+        perf.enable(False)
+        self.enabled = False
+        self._heartbeat.stop()
+        self._dump_timer.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+    # ---------- stall detection ----------
+    def _on_heartbeat(self) -> None:
+        now = time.perf_counter()
+        late_ms = (now - self._last_beat) * 1000 - self.heartbeat_ms
+        self._last_beat = now
+        perf.record("eventloop.lag", max(late_ms, 0.0) / 1000)
+        if late_ms >= self.stall_ms:
+            perf.count("eventloop.stalls")
+            self.stalls.append((time.time(), late_ms))
+
+    # ---------- per-tab resources ----------
+    def resources(self) -> List[Dict[str, Any]]:
+        """RSS and CPU% (since the previous call) of Triode and each tab's process."""
+        rows = [self._sample("Triode", "main", os.getpid())]
+        tm = self.tab_manager
+        for i in range(tm.count()):
+            widget = tm.widget(i)
+            record = tm.record_for(widget)
+            if record is None:
+                continue
+            pid = self._pid_of(widget, record.kind)
+            if pid:
+                rows.append(self._sample(tm.tabText(i), record.kind, pid))
+        live = {row["pid"] for row in rows}
+        for pid in [p for p in self._cpu_prev if p not in live]:
+            del self._cpu_prev[pid]
+        return rows
+
+    @staticmethod
+    def _pid_of(widget, kind: str) -> Optional[int]:
+        try:
+            if kind == "browser":
+                return widget.renderer_pid()
+            if kind == "terminal":
+                process = getattr(widget, "process", None)
+                return process.pid if process is not None else None
+        except Exception:
+            pass
+        return None
+
+    def _sample(self, label: str, kind: str, pid: int) -> Dict[str, Any]:
+        now = time.monotonic()
+        rss = rss_bytes(pid)
+        cpu = cpu_seconds(pid)
+        cpu_pct = None
+        if cpu is not None:
+            prev = self._cpu_prev.get(pid)
+            if prev is not None and now > prev[0]:
+                cpu_pct = (cpu - prev[1]) / (now - prev[0]) * 100
+            self._cpu_prev[pid] = (now, cpu)
+        return {
+            "tab": label,
+            "kind": kind,
+            "pid": pid,
+            "rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "cpu_pct": round(cpu_pct, 1) if cpu_pct is not None else None,
+        }
+
+    # ---------- reporting ----------
+    def report(self) -> Dict[str, Any]:
+        data = perf.snapshot()
+        data["time"] = time.time()
+        data["enabled"] = self.enabled
+        data["stalls"] = [{"time": t, "ms": round(ms, 1)} for t, ms in self.stalls]
+        data["stall_sites"] = self.watchdog.top_sites() if self.watchdog is not None else []
+        data["resources"] = self.resources()
+        return data
+
+    def dump(self) -> None:
+        """Append one report as a JSON line to dump_path."""
+        try:
+            os.makedirs(os.path.dirname(self.dump_path), exist_ok=True)
+            with open(self.dump_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.report(), separators=(",", ":")) + "\n")
+        except OSError as e:
+            print(f"[PerfMonitor] Could not write {self.dump_path}: {e}")
+
+    def export_stalls(self) -> None:
+        """Write the watchdog's stall sites and events to stalls_path."""
+        if self.watchdog is None:
+            return
+        try:
+            self.watchdog.export(self.stalls_path)
+            print(f"[PerfMonitor] Stall report written to {self.stalls_path}")
+        except OSError as e:
+            print(f"[PerfMonitor] Could not write {self.stalls_path}: {e}")
@@ -0,0 +1,97 @@
+# triode/perf_tab.py
+import time
+from typing import Any, Dict
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPlainTextEdit, QToolBar
+from PySide6.QtGui import QAction, QFontDatabase
+from PySide6.QtCore import QTimer
+
+from . import perf
+
+
+def format_report(data: Dict[str, Any]) -> str:
+    lines = []
+    if not data.get("enabled"):
+        lines += ["Instrumentation is off: start with --perf or set perf.enabled.", ""]
+
+    lines.append("Timers                          count    mean ms     p95 ms     max ms   total ms")
+    for name, t in data["timers"].items():
+        lines.append(
+            f"  {name:<28} {t['count']:>7} {t['mean_ms']:>10.2f} {t['p95_ms']:>10.2f}"
+            f" {t['max_ms']:>10.2f} {t['total_ms']:>10.1f}"
+        )
+    lines.append("")
+    lines.append("Counters")
+    for name, value in data["counters"].items():
+        lines.append(f"  {name:<28} {value:>10}")
+    lines.append("")
+
+    stalls = data["stalls"]
+    lines.append(f"Event-loop stalls (last {len(stalls)})")
+    for s in reversed(stalls[-10:]):
+        lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(s['time']))}  {s['ms']:>8.1f} ms")
+    lines.append("")
+
+    sites = data.get("stall_sites") or []
+    lines.append("Stall call sites (watchdog samples)   samples  stalls     max ms")
+    for s in sites:
+        lines.append(f"  {s['site'][-36:]:<36} {s['samples']:>7} {s['stalls']:>7} {s['max_ms']:>10.1f}")
+    lines.append("")
+
+    lines.append("Processes                                 pid     RSS MB    CPU %")
+    for r in data["resources"]:
+        rss = f"{r['rss_mb']:.1f}" if r["rss_mb"] is not None else "-"
+        cpu = f"{r['cpu_pct']:.1f}" if r["cpu_pct"] is not None else "-"
+        label = f"{r['kind']}: {r['tab']}"[:38]
+        lines.append(f"  {label:<38} {r['pid']:>7} {rss:>10} {cpu:>8}")
+    return "\n".join(lines)
+
+
+class PerfTab(QWidget):
+    """about:perf: live view of PerfMonitor.report()."""
+
+    tab_kind = "perf"
+
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        toolbar = QToolBar()
+        act_reset = QAction("Reset", self)
+        act_reset.triggered.connect(self._reset)
+        toolbar.addAction(act_reset)
+        act_dump = QAction("Write dump", self)
+        act_dump.triggered.connect(self.monitor.dump)
+        toolbar.addAction(act_dump)
+        act_stalls = QAction("Export stalls", self)
+        act_stalls.triggered.connect(self.monitor.export_stalls)
+        toolbar.addAction(act_stalls)
+        layout.addWidget(toolbar)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.view)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def navigate_to(self, path: str):
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible() and self.view.toPlainText():
+            return  # nothing to update while in the background
+        self.view.setPlainText(format_report(self.monitor.report()))
+
+    def _reset(self):
+        perf.reset()
+        self.monitor.stalls.clear()
+        if self.monitor.watchdog is not None:
+            self.monitor.watchdog.clear()
+        self.refresh()
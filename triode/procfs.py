@@ -0,0 +1,79 @@
+# triode/procfs.py
+# Small readers for /proc. All of them return None when the data is unavailable
+# (non-Linux, process gone, permission denied) instead of raising.
+import os
+from typing import Optional
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of pid, from /proc/<pid>/status."""
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def mem_available_bytes() -> Optional[int]:
+    """System-wide MemAvailable, from /proc/meminfo."""
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def process_age(pid="self") -> Optional[float]:
+    """Seconds since pid was started, from /proc/<pid>/stat and /proc/uptime."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        # the command name may contain spaces; fields resume after the last ')'
+        fields = stat[stat.rindex(b")") + 2:].split()
+        start_ticks = int(fields[19])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def cpu_seconds(pid="self") -> Optional[float]:
+    """User + system CPU time consumed by pid, from /proc/<pid>/stat."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        fields = stat[stat.rindex(b")") + 2:].split()
+        # utime and stime are fields 14 and 15 of the full line
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def command_line(pid: int) -> Optional[str]:
+    """pid's command line with argv[0] shortened to its basename, from /proc/<pid>/cmdline."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            argv = f.read().rstrip(b"\0").split(b"\0")
+        if not argv[0]:
+            # kernel threads and zombies have no cmdline; comm is the short name
+            with open(f"/proc/{pid}/comm", "rb") as f:
+                return f.read().strip().decode("utf-8", "replace") or None
+        argv[0] = os.path.basename(argv[0])
+        return " ".join(a.decode("utf-8", "replace") for a in argv)
+    except OSError:
+        return None
+
+
+def cwd(pid: int) -> Optional[str]:
+    """Current working directory of pid, from /proc/<pid>/cwd."""
+    try:
+        return os.readlink(f"/proc/{pid}/cwd")
+    except OSError:
+        return None
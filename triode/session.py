@@ -0,0 +1,160 @@
+# triode/session.py
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from .settings import config_dir
+
+SESSION_VERSION = 1
+
+
+def _session_path() -> str:
+    return str(config_dir() / "session.json")
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write JSON next to path and rename over it so readers never see a torn file."""
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(prefix=".session-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def describe_tab(widget, kind: str) -> Dict[str, Any]:
+    """Build the persisted record for a single tab."""
+    record: Dict[str, Any] = {"type": kind}
+    if kind == "browser":
+        url = widget.current_url()
+        scheme = "https" if url.startswith("https://") else "http"
+        record["route"] = {"scheme": scheme, "path": url}
+        record["url"] = url
+        record["scroll"] = list(widget.scroll_position())
+    elif kind == "explorer":
+        record["route"] = {"scheme": "file", "path": widget.current_path}
+        record["path"] = widget.current_path
+    elif kind == "terminal":
+        record["route"] = {"scheme": "term", "path": widget.cwd}
+        record["cwd"] = widget.cwd
+    elif kind == "viewer":
+        record["route"] = {"scheme": "view", "path": widget.path}
+        record["path"] = widget.path
+    return record
+
+
+class SessionStore(QObject):
+    """
+    Keeps one cached record per open tab and writes the session file lazily.
+
+    Tabs call touch() when their state changes; only that tab's record is
+    rebuilt, and the file is rewritten once per debounce window.
+    """
+
+    def __init__(self, tab_manager, settings: dict, path: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.tab_manager = tab_manager
+        cfg = settings.get("session", {})
+        self.enabled = cfg.get("restore", True)
+        self.path = path or _session_path()
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._kinds: Dict[int, str] = {}
+        self._suspended = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(int(cfg.get("debounce_ms", 750)))
+        self._timer.timeout.connect(self.flush)
+
+    # ---------- tracking ----------
+    def track(self, widget, kind: str) -> None:
+        """Start following a tab; its record is refreshed whenever it signals a change."""
+        self._kinds[id(widget)] = kind
+        for name in ("url_changed", "path_changed", "scroll_changed"):
+            signal = getattr(widget, name, None)
+            if signal is not None:
+                signal.connect(lambda *_, w=widget: self.touch(w))
+        self.touch(widget)
+
+    def touch(self, widget) -> None:
+        kind = self._kinds.get(id(widget))
+        if kind is None:
+            return
+        try:
+            self._records[id(widget)] = describe_tab(widget, kind)
+        except Exception as e:
+            print(f"[SessionStore] Could not snapshot tab: {e}")
+            return
+        self.mark_dirty()
+
+    def forget(self, widget) -> None:
+        self._records.pop(id(widget), None)
+        self._kinds.pop(id(widget), None)
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        if not self.enabled or self._suspended:
+            return
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def suspend(self, suspended: bool) -> None:
+        """Ignore changes while tabs are being restored."""
+        self._suspended = suspended
+
+    # ---------- persistence ----------
+    def snapshot(self) -> Dict[str, Any]:
+        tm = self.tab_manager
+        tabs: List[Dict[str, Any]] = []
+        live = set()
+        current = 0
+        for i in range(tm.count()):
+            widget = tm.widget(i)
+            record = self._records.get(id(widget))
+            if record is None:
+                continue
+            live.add(id(widget))
+            if widget is tm.currentWidget():
+                current = len(tabs)
+            tabs.append(record)
+        # drop records of tabs removed without going through forget()
+        for key in list(self._records):
+            if key not in live:
+                self._records.pop(key, None)
+                self._kinds.pop(key, None)
+        return {"version": SESSION_VERSION, "current": current, "tabs": tabs}
+
+    def flush(self) -> None:
+        if not self.enabled or self._suspended:
+            # mid-restore the snapshot would only hold the tabs created so
+            # far; the file on disk still has all of them
+            return
+        self._timer.stop()
+        try:
+            atomic_write_json(self.path, self.snapshot())
+        except Exception as e:
+            print(f"[SessionStore] Failed to write session: {e}")
+
+    def load(self) -> Dict[str, Any]:
+        if not self.enabled or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[SessionStore] Ignoring unreadable session: {e}")
+            return {}
+        if data.get("version") != SESSION_VERSION:
+            return {}
+        return data
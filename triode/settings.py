@@ -4,14 +4,48 @@ from pathlib import Path
 from typing import Any, Dict
 
 DEFAULTS = {
-    "browser": {"engine": None},  # None => default_engine
-    "terminal": {"shell": None}
+    "browser": {
+        "engine": None,  # None => default_engine
+        "freeze_after_s": 60,
+        "discard_after_s": 900,
+        "memory_budget_mb": 2048,
+        "min_available_mb": 512,  # discard background tabs while MemAvailable is below this
+        "profile": "default",
+        "cache_size_mb": 256,
+        "persistent_cookies": True,
+        "preconnect": True,
+        "preconnect_delay_ms": 150,
+        "preconnect_cooldown_s": 60,  # don't warm the same origin again within this
+        "preconnect_per_minute": 20,
+    },
+    "terminal": {"shell": None},
+    "session": {"restore": True, "debounce_ms": 750},
+    "history": {"enabled": True, "max_suggestions": 8},
+    "completion": {"dir_ttl_s": 5.0, "max_paths": 200},
+    # MIME patterns opened in a browser tab instead of the desktop's default app
+    "launcher": {"in_app": ["text/html", "application/xhtml+xml", "text/plain", "text/x-log", "image/*", "application/pdf"]},
+    "viewer": {"follow_interval_ms": 500},
+    "duplicates": {"workers": 4, "min_size": 1},  # min_size in bytes
+    # directory None => ~/Downloads; big http downloads are re-fetched in parallel Range segments
+    "downloads": {"directory": None, "segmented": True, "segments": 4, "min_segment_mb": 4},
+    "perf": {
+        "enabled": False,  # or start with --perf
+        "heartbeat_ms": 50,
+        "stall_ms": 100,
+        "watchdog_ms": 250,  # stack-sample the GUI thread when it stalls this long; 0 = off
+        "dump_interval_s": 10,  # JSON lines appended to dump_path; 0 = off
+        "dump_path": None,  # None => $XDG_DATA_HOME/triode/perf.jsonl
+    },
 }
 
-def _config_path() -> Path:
+def config_dir() -> Path:
+    """Return ~/.config/triode, creating it if needed."""
     base = Path.home() / ".config" / "triode"
     base.mkdir(parents=True, exist_ok=True)
-    return base / "config.json"
+    return base
+
+def _config_path() -> Path:
+    return config_dir() / "config.json"
 
 def load_settings() -> Dict[str, Any]:
     p = _config_path()
@@ -0,0 +1,152 @@
+# triode/startup_profile.py
+# Backs `python -m triode.app --profile-startup`: times every import and the
+# startup phases up to the first paint of the main window, then prints a report.
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .procfs import process_age
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader and charges create/exec time to the module."""
+
+    def __init__(self, loader, name: str, timer: "_ImportTimer"):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        # extension modules (e.g. PySide6's) do their dlopen here
+        with self._timer.measure(self._name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._timer.measure(self._name):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, attr):
+        # get_data, is_package, ... go straight to the real loader
+        return getattr(self._loader, attr)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self.inclusive: dict[str, float] = {}
+        self.self_time: dict[str, float] = {}
+        self._stack: list[list] = []  # [name, start, child_time]
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find = getattr(finder, "find_spec", None)
+            if find is None:
+                continue
+            spec = find(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname, self)
+            return spec
+        return None
+
+    @contextmanager
+    def measure(self, name: str):
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.inclusive[name] = self.inclusive.get(name, 0.0) + elapsed
+            self.self_time[name] = self.self_time.get(name, 0.0) + elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+
+class StartupProfiler:
+    """
+    Collects startup timings. When disabled every method is a cheap no-op, so
+    app.main() can use it unconditionally.
+    """
+
+    def __init__(self, enabled: bool = False, top: int = 15):
+        self.enabled = enabled
+        self.top = top
+        self.t0 = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+        self._imports: Optional[_ImportTimer] = None
+        self._paint_filter = None
+        if enabled:
+            self._imports = _ImportTimer()
+            sys.meta_path.insert(0, self._imports)
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report_after_first_paint(self, window) -> None:
+        """Print the report once window has painted for the first time."""
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QObject, QEvent, QTimer
+
+        shown_at = time.perf_counter()
+        profiler = self
+
+        class _FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    profiler.phases.append(("show -> first paint", time.perf_counter() - shown_at))
+                    # let the rest of this paint pass finish before reporting
+                    QTimer.singleShot(0, profiler.report)
+                return False
+
+        self._paint_filter = _FirstPaint(window)
+        window.installEventFilter(self._paint_filter)
+
+    def report(self) -> None:
+        total = time.perf_counter() - self.t0
+        if self._imports in sys.meta_path:
+            sys.meta_path.remove(self._imports)
+        out = sys.stderr
+        age = process_age()
+        print("[startup] ---- Triode startup profile ----", file=out)
+        if age is not None:
+            # process age now, minus what we measured ourselves
+            print(f"[startup] interpreter start -> main(): {(age - total) * 1000:8.1f} ms", file=out)
+        print(f"[startup] main() -> first paint:       {total * 1000:8.1f} ms", file=out)
+        print("[startup] phases:", file=out)
+        for name, secs in self.phases:
+            print(f"[startup]   {name:<32} {secs * 1000:8.1f} ms", file=out)
+
+        imports = self._imports
+        if imports is None or not imports.self_time:
+            return
+        packages: dict[str, float] = {}
+        for name, secs in imports.self_time.items():
+            top = name.split(".", 1)[0]
+            packages[top] = packages.get(top, 0.0) + secs
+        print("[startup] imports by package (self time):", file=out)
+        for name, secs in sorted(packages.items(), key=lambda kv: -kv[1])[: self.top]:
+            print(f"[startup]   {name:<32} {secs * 1000:8.1f} ms", file=out)
+        print("[startup] slowest modules (self / inclusive):", file=out)
+        slowest = sorted(imports.self_time.items(), key=lambda kv: -kv[1])[: self.top]
+        for name, secs in slowest:
+            incl = imports.inclusive.get(name, secs)
+            print(f"[startup]   {name:<32} {secs * 1000:8.1f} ms / {incl * 1000:8.1f} ms", file=out)
+        heavy = [m for m in ("PySide6.QtWebEngineCore", "pyte") if m in sys.modules]
+        if heavy:
+            print(f"[startup] note: loaded before first paint: {', '.join(heavy)}", file=out)
@@ -1,27 +1,44 @@
 # triode/tab_manager.py
-from PySide6.QtWidgets import QTabWidget, QTabBar, QApplication
-from .browser.factory import get_browser_backend
-from .url_router import URLRouter
-from .models.route import URLRoute
-from .explorer.tab import ExplorerTab
-from .browser.tab import BrowserTab
-from .generic_tab import GenericTab
-import os
-
-# triode/tab_manager.py
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
 import os
 
 from PySide6.QtWidgets import QTabWidget, QWidget, QTabBar
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Signal, QUrl
 
 from .browser.factory import get_browser_backend
+from .browser.backend import BrowserBackend
 from .url_router import URLRouter
 from .models.route import URLRoute
-from .explorer.tab import ExplorerTab
-from .browser.tab import BrowserTab
-from .generic_tab import GenericTab
-from .address_bar import AddressBarController
+from .browser.lifecycle import TabLifecycleManager
+from .session import SessionStore
+from .history import HistoryStore
+from .tab_registry import kind_of, tab_class, tab_type, kind_for_route, address_route
+from .ui_updates import UpdateCoalescer
+from .perf_monitor import PerfMonitor
+from .fs_probe import shared_probe, DIR, FILE, SPECIAL
+from .explorer.launcher import Launcher
+from .browser.downloads import DownloadManager
+from . import perf
+
+if TYPE_CHECKING:
+    # Tab modules are imported on first use through tab_registry
+    from .browser.downloads_tab import DownloadsTab
+    from .browser.tab import BrowserTab
+    from .explorer.duplicates_tab import DuplicatesTab
+    from .explorer.tab import ExplorerTab
+    from .generic_tab import GenericTab
+    from .perf_tab import PerfTab
+    from .terminal.tab import TerminalTab
+    from .viewer.tab import ViewerTab
+
+
+@dataclass(slots=True)
+class TabRecord:
+    """What TabManager knows about one content tab, without asking the widget."""
+    kind: str
+    route: Optional[URLRoute] = None
+    state: str = "background"  # "active" | "background"
 
 
 class TabManager(QTabWidget):
@@ -31,6 +48,7 @@ class TabManager(QTabWidget):
     """
 
     PLUS_LABEL = "+"
+    restored = Signal()  # restore_session() has created its last tab
 
     def __init__(
         self,
@@ -43,63 +61,124 @@ class TabManager(QTabWidget):
         self.router = router
         self.settings = settings
         self.address_controller = address_controller
-        self.backend = get_browser_backend(settings["browser"]["engine"])
+        self._backend: Optional[BrowserBackend] = None
         self.clipboard = None
+        self.session = SessionStore(self, settings, parent=self)
+        self.lifecycle = TabLifecycleManager(settings, parent=self)
+        self.history = HistoryStore(settings, parent=self)
+        self.updates = UpdateCoalescer(self._apply_update, parent=self)
+        self.perf_monitor = PerfMonitor(self, settings, parent=self)
+        self.launcher = Launcher(settings, open_in_app=self.open_file_in_app, parent=self)
+        self.downloads = DownloadManager(settings, parent=self)
 
         # regular tab behavior
         self.setTabsClosable(True)
         self.tabCloseRequested.connect(self._handle_tab_close)
-        self.currentChanged.connect(self._on_current_changed)
+        self._restore_queue: list[dict] = []
+        self._restore_created: list[tuple[int, QWidget]] = []  # (position in the saved session, tab)
+        self._restore_current = 0
+        self._restore_pos = 0
+        # content tabs by widget identity; the plus tab is never in here
+        self._tabs: dict[int, TabRecord] = {}
+        self._active: Optional[TabRecord] = None
 
         # Create and lock the permanent "+" tab at index 0
         self._plus_widget = QWidget()
         super().insertTab(0, self._plus_widget, self.PLUS_LABEL)
         self._hide_plus_close_button()
+        self.currentChanged.connect(self._on_current_changed)
 
         # Start with one content tab optionally
         # (MainWindow can call create_browser_tab/create_explorer_tab as needed)
 
+    @property
+    def backend(self) -> BrowserBackend:
+        """Browser backend, created when the first browser tab needs it."""
+        if self._backend is None:
+            self._backend = get_browser_backend(self.settings["browser"]["engine"], self.settings)
+            self._backend.set_download_handler(self._on_engine_download)
+        return self._backend
+
+    # ---------- Tab registry ----------
+    def _register(self, widget: QWidget, kind: str, route: Optional[URLRoute] = None) -> TabRecord:
+        record = TabRecord(kind, route)
+        key = id(widget)
+        self._tabs[key] = record
+        # also covers tabs removed behind our back (plain removeTab + delete)
+        widget.destroyed.connect(lambda *_, k=key: self._unregister(k))
+        return record
+
+    def _unregister(self, key: int) -> None:
+        self.updates.forget(key)
+        record = self._tabs.pop(key, None)
+        if record is not None and record is self._active:
+            self._active = None
+
+    def record_for(self, widget: Optional[QWidget]) -> Optional[TabRecord]:
+        return self._tabs.get(id(widget)) if widget is not None else None
+
+    def tab_count(self) -> int:
+        """Number of content tabs (the plus tab not included)."""
+        return len(self._tabs)
+
+    def is_plus_tab(self, index: int) -> bool:
+        return self.widget(index) is self._plus_widget
+
     # ---------- PLUS TAB helpers ----------
     def _hide_plus_close_button(self) -> None:
         """Remove tab-close buttons from the plus tab (index 0)."""
         plus_index = 0
-        # Defensive: if plus isn't at 0, find it and move it
-        if self._find_plus_tab_index() != 0:
-            self._ensure_plus_tab_at_zero()
-        # Remove close buttons for plus
         self.tabBar().setTabButton(plus_index, QTabBar.RightSide, None)
         self.tabBar().setTabButton(plus_index, QTabBar.LeftSide, None)
         # Optional visual: make it disabled so it doesn't look closable
         self.tabBar().setTabEnabled(plus_index, True)
 
-    def _find_plus_tab_index(self) -> int:
-        for i in range(self.count()):
-            if self.tabText(i) == self.PLUS_LABEL:
-                return i
-        return -1
+    def tabInserted(self, index: int) -> None:
+        # The plus tab can only be displaced by an insert at 0, so that is
+        # the one place it is checked rather than on every tab switch.
+        super().tabInserted(index)
+        if index == 0 and self.widget(0) is not self._plus_widget:
+            QTimer.singleShot(0, self._ensure_plus_tab_at_zero)
 
     def _ensure_plus_tab_at_zero(self) -> None:
         """If plus somehow moved, re-insert it at 0 (defensive)."""
-        idx = self._find_plus_tab_index()
-        if idx == -1:
-            # recreate plus
-            self._plus_widget = QWidget()
-            super().insertTab(0, self._plus_widget, self.PLUS_LABEL)
-        elif idx != 0:
-            widget = self.widget(idx)
-            text = self.tabText(idx)
+        idx = self.indexOf(self._plus_widget)
+        if idx == 0:
+            return
+        if idx != -1:
             super().removeTab(idx)
-            super().insertTab(0, widget, text)
+        super().insertTab(0, self._plus_widget, self.PLUS_LABEL)
         # Ensure close button hidden
         self._hide_plus_close_button()
 
     # ---------- Creation helpers ----------
-    def create_generic_tab(self) -> GenericTab:
+    def create_tab(self, kind: str, arg=None, insert_index: int = 1, activate: bool = True) -> QWidget:
+        """Create a tab of a registered kind; arg is the URL or path where it applies."""
+        t = tab_type(kind)
+        if t is None:
+            raise ValueError(f"Unknown tab kind: {kind}")
+        factory = getattr(self, t.factory)
+        if t.takes_arg:
+            return factory(arg or t.default_arg, insert_index, activate)
+        return factory(insert_index, activate)
+
+    def open_route(self, route: URLRoute) -> Optional[QWidget]:
+        """Open route in a new tab after the last one and switch to it."""
+        kind = kind_for_route(route)
+        if kind is None:
+            print(f"[TabManager] No tab type for {route.scheme}:{route.path}")
+            return None
+        return self.create_tab(kind, route.path or None, self.count(), True)
+
+    @perf.timed("tab.create.generic")
+    def create_generic_tab(self, insert_index: int = 1, activate: bool = True) -> "GenericTab":
         """Create a GenericTab at index 1 (right after plus)."""
-        tab = GenericTab(self)
-        insert_index = 1  # always place after the plus tab
+        tab = tab_class("generic")(self)
         super().insertTab(insert_index, tab, "New Tab")
-        self.setCurrentIndex(insert_index)
+        self._register(tab, "generic")
+        self.session.track(tab, "generic")
+        if activate:
+            self.setCurrentIndex(insert_index)
         return tab
 
     def _get_prefix(self, tab_type: str) -> str:
@@ -130,80 +209,190 @@ class TabManager(QTabWidget):
         style_prefixes = prefixes.get(prefix_style, {})
         return style_prefixes.get(tab_type, "")
 
-    def create_browser_tab(self, url: str = "https://example.com") -> BrowserTab:
-        tab = BrowserTab(url)
-        insert_index = 1
+    @perf.timed("tab.create.browser")
+    def create_browser_tab(
+        self, url: str = "https://example.com", insert_index: int = 1, activate: bool = True
+    ) -> "BrowserTab":
+        tab = tab_class("browser")(url, backend=self.backend)
         prefix = self._get_prefix('browser')
         
         # Insert tab first so indexOf works
         super().insertTab(insert_index, tab, f"{prefix}Loading...")
-        
-        # Bind title updates
-        tab._view.titleChanged.connect(
-            lambda title, t=tab: self._apply_title_to_widget(t, title, 'browser')
-        )
-        
-        # Bind URL updates for address bar
-        if self.address_controller:
-            tab.url_changed.connect(self.address_controller.set_route_from_browser)
-            self.address_controller.attach_tab_signals(tab)
-        
-        self.setCurrentIndex(insert_index)
+
+        record = self._register(tab, "browser", self.router.route_for_url(url))
+        self._bind_ui_updates(tab, record)
+        self.session.track(tab, "browser")
+        self._track_history(tab, "browser")
+        self.lifecycle.add(tab)
+        if activate:
+            self.setCurrentIndex(insert_index)
         return tab
 
 
-    def create_explorer_tab(self, initial_path: Optional[str] = None) -> ExplorerTab:
+    @perf.timed("tab.create.explorer")
+    def create_explorer_tab(
+        self, initial_path: Optional[str] = None, insert_index: int = 1, activate: bool = True
+    ) -> "ExplorerTab":
         path = initial_path or os.path.expanduser("~")
-        tab = ExplorerTab(path)
-        insert_index = 1
+        tab = tab_class("explorer")(path)
+        tab.launcher = self.launcher
         prefix = self._get_prefix('explorer')
         
         # Insert tab first
         super().insertTab(insert_index, tab, f"{prefix}{os.path.basename(path)}")
-        
-        # Bind path updates for title
-        tab.path_changed.connect(
-            lambda path, t=tab: self._apply_title_to_widget(t, path, 'explorer')
-        )
-        
-        # Bind path updates for address bar
-        if self.address_controller:
-            tab.path_changed.connect(self.address_controller.set_route_file)
-        
-        self.setCurrentIndex(insert_index)
+
+        record = self._register(tab, "explorer", URLRoute("file", tab.current_path))
+        self._bind_ui_updates(tab, record)
+        self.session.track(tab, "explorer")
+        self._track_history(tab, "explorer")
+        if activate:
+            self.setCurrentIndex(insert_index)
         return tab
 
-    def create_terminal_tab(self, initial_path: Optional[str] = None) -> "TerminalTab":
-        from .terminal.tab import TerminalTab
-        tab = TerminalTab(initial_path)
-        insert_index = 1
+    @perf.timed("tab.create.terminal")
+    def create_terminal_tab(
+        self, initial_path: Optional[str] = None, insert_index: int = 1, activate: bool = True
+    ) -> "TerminalTab":
+        tab = tab_class("terminal")(initial_path)
         prefix = self._get_prefix('terminal')
         
         # Set initial title with prefix
         super().insertTab(insert_index, tab, f"{prefix}Terminal")
-        
-        # Connect path change signal
-        tab.path_changed.connect(
-            lambda path: self.setTabText(
-                self.indexOf(tab), 
-                f"{prefix}{os.path.basename(path)}"
-            )
-        )
-        
-        # Connect to address bar
-        if self.address_controller:
-            tab.path_changed.connect(
-                lambda path: self.address_controller.set_route_file(f"term://{path}")
-            )
-        
-        self.setCurrentIndex(insert_index)
+
+        record = self._register(tab, "terminal", URLRoute("term", tab.cwd))
+        self._bind_ui_updates(tab, record)
+        self.session.track(tab, "terminal")
+        self._track_history(tab, "terminal")
+        if activate:
+            self.setCurrentIndex(insert_index)
+        return tab
+
+    def create_perf_tab(self, insert_index: int = 1, activate: bool = True) -> "PerfTab":
+        """about:perf, showing the instrumentation collected by perf_monitor."""
+        tab = tab_class("perf")(self.perf_monitor)
+        super().insertTab(insert_index, tab, "about:perf")
+        self._register(tab, "perf", URLRoute("about", "perf"))
+        self.session.track(tab, "perf")
+        if activate:
+            self.setCurrentIndex(insert_index)
+        return tab
+
+    @perf.timed("tab.create.viewer")
+    def create_viewer_tab(
+        self, path: str, insert_index: int = 1, activate: bool = True
+    ) -> "ViewerTab":
+        tab = tab_class("viewer")(path, self.settings)
+        super().insertTab(insert_index, tab, os.path.basename(path))
+
+        record = self._register(tab, "viewer", URLRoute("view", tab.path))
+        self._bind_ui_updates(tab, record)
+        self.session.track(tab, "viewer")
+        self._track_history(tab, "viewer")
+        if activate:
+            self.setCurrentIndex(insert_index)
+        return tab
+
+    @perf.timed("tab.create.duplicates")
+    def create_duplicates_tab(
+        self, root: str, insert_index: int = 1, activate: bool = True
+    ) -> "DuplicatesTab":
+        """Duplicate finder for root. Not kept in the session: results are a snapshot."""
+        tab = tab_class("duplicates")(root, self.settings)
+        super().insertTab(insert_index, tab, f"Duplicates: {os.path.basename(tab.root) or tab.root}")
+        self._register(tab, "duplicates", URLRoute("file", tab.root))
+        tab.reveal_requested.connect(
+            lambda path: self.create_explorer_tab(path, insert_index=self.currentIndex() + 1))
+        if activate:
+            self.setCurrentIndex(insert_index)
+        return tab
+
+    def create_downloads_tab(self, insert_index: int = 1, activate: bool = True) -> "DownloadsTab":
+        """about:downloads, listing self.downloads."""
+        tab = tab_class("downloads")(self.downloads)
+        super().insertTab(insert_index, tab, "Downloads")
+        self._register(tab, "downloads", URLRoute("about", "downloads"))
+        tab.reveal_requested.connect(self.reveal_path)
+        self.session.track(tab, "downloads")
+        if activate:
+            self.setCurrentIndex(insert_index)
         return tab
 
+    def _on_engine_download(self, request) -> None:
+        """A page started a download: hand it to the manager and make sure the list is open."""
+        if self.downloads.handle_engine_request(request) is None:
+            return
+        if not any(rec.kind == "downloads" for rec in self._tabs.values()):
+            self.create_downloads_tab(max(1, self.currentIndex() + 1), activate=False)
+
+    def reveal_path(self, path: str) -> None:
+        """Open the folder containing path in a new explorer tab, with path selected."""
+        tab = self.create_explorer_tab(os.path.dirname(path), insert_index=max(1, self.currentIndex() + 1))
+        tab.select_path(path)
+
+    def _bind_ui_updates(self, tab: QWidget, record: TabRecord) -> None:
+        """
+        One connection per tab signal, feeding the update coalescer: the tab
+        title and the address bar change at most once per event-loop turn.
+        """
+        updates = self.updates
+        if record.kind == "browser":
+            def on_url(url, t=tab, rec=record):
+                rec.route = self.router.route_for_url(url)
+                updates.post(t, "location", rec.route)
+            tab.url_changed.connect(on_url)
+            tab.title_changed.connect(lambda title, t=tab: updates.post(t, "title", title))
+        else:
+            scheme = {"terminal": "term", "viewer": "view"}.get(record.kind, "file")
+            def on_path(path, t=tab, rec=record):
+                rec.route = URLRoute(scheme, path)
+                updates.post(t, "location", rec.route)
+                updates.post(t, "title", t.title() if scheme != "file" else path)
+            tab.path_changed.connect(on_path)
+            if record.kind == "terminal":
+                tab.foreground_changed.connect(lambda _, t=tab: updates.post(t, "title", t.title()))
+                tab.link_activated.connect(self.open_link)
+
+    def _apply_update(self, widget: QWidget, key: str, value) -> bool:
+        """Coalesced update for one tab; True when the value should be remembered."""
+        record = self.record_for(widget)
+        if record is None:
+            return False  # closed in the meantime
+        if key == "title":
+            self._apply_title_to_widget(widget, value, record.kind)
+            return True
+        if key == "location":
+            # a background tab doesn't own the address bar; on_tab_changed
+            # shows its location when it is switched to
+            if record.state == "active" and self.address_controller:
+                self.address_controller.set_route(value)
+            # not remembered: the bar is shared, set_route compares its text
+            return False
+        return False
+
+    def _track_history(self, tab: QWidget, kind: str) -> None:
+        """Record visits for address-bar suggestions, in the same text form the bar shows."""
+        history = self.history
+        if kind == "browser":
+            def on_url(url, t=tab):
+                if url.startswith(("http://", "https://")):
+                    history.record(url, kind, t.title())
+            tab.url_changed.connect(on_url)
+            tab.title_changed.connect(lambda title, t=tab: history.set_title(t.current_url(), title))
+        elif kind == "explorer":
+            tab.path_changed.connect(lambda path: history.record(f"file://{path}", kind))
+            history.record(f"file://{tab.current_path}", kind)
+        elif kind == "terminal":
+            tab.path_changed.connect(lambda path: history.record(f"term://{path}", kind))
+            history.record(f"term://{tab.cwd}", kind)
+        elif kind == "viewer":
+            tab.path_changed.connect(lambda path: history.record(f"file://{path}", kind))
+            history.record(f"file://{tab.path}", kind)
+
     # ---------- Close / Destroy ----------
     def _handle_tab_close(self, index: int) -> None:
         """Called by Qt when a tab close button is pressed."""
         # Do not allow closing the plus tab
-        if index == 0 and self.tabText(index) == self.PLUS_LABEL:
+        if self.is_plus_tab(index):
             return
         widget = self.widget(index)
         if widget:
@@ -216,7 +405,7 @@ class TabManager(QTabWidget):
             return
 
         # Never destroy the plus widget
-        if index == 0 and widget is self._plus_widget:
+        if widget is self._plus_widget:
             return
 
         # optional cleanup hook on the widget before deletion
@@ -227,6 +416,9 @@ class TabManager(QTabWidget):
                 # keep going; don't crash the UI
                 print(f"[TabManager] Error calling on_destroy: {e}")
 
+        self._unregister(id(widget))
+        self.session.forget(widget)
+        self.lifecycle.remove(widget)
         super().removeTab(index)
         widget.deleteLater()
 
@@ -249,11 +441,16 @@ class TabManager(QTabWidget):
 
     # ---------- Tab change logic ----------
     def _on_current_changed(self, index: int) -> None:
-        """Handle when the current tab changes (update address bar, re-hide plus)."""
-        # Defensive: ensure plus still at index 0
-        self._ensure_plus_tab_at_zero()
+        """Handle when the current tab changes (update address bar, spawn from plus)."""
+        record = self.record_for(self.widget(index))
+        if record is not self._active:
+            if self._active is not None:
+                self._active.state = "background"
+            if record is not None:
+                record.state = "active"
+            self._active = record
         # If user clicked the "+" tab, spawn a new GenericTab
-        if index == 0 and self.tabText(0) == self.PLUS_LABEL:
+        if self.is_plus_tab(index):
             if self.count() > 1:
                 new_tab = self.create_generic_tab()
                 self.setCurrentWidget(new_tab)
@@ -263,6 +460,7 @@ class TabManager(QTabWidget):
             return
         # Update address bar according to the active tab
         self.on_tab_changed(index)
+        self.session.mark_dirty()
 
 
     def on_tab_changed(self, index: int) -> None:
@@ -270,49 +468,160 @@ class TabManager(QTabWidget):
         current_tab = self.widget(index)
         if not current_tab or not self.address_controller:
             return
+        record = self.record_for(current_tab)
+        kind = record.kind if record is not None else kind_of(current_tab)
 
-        # BrowserTab (has _view from QWebEngineView or WebKit)
-        if hasattr(current_tab, "_view"):
+        if kind == "browser":
+            # wake the tab up if it was frozen or discarded in the background
+            self.lifecycle.activate(current_tab)
             try:
-                url = current_tab._view.url().toString()
+                url = current_tab.current_url()
                 #print(url)
             except Exception:
                 url = ""
                 #print("url not found error")
             
-            if url.startswith(("http://", "https://")):
-                scheme = "https" if url.startswith("https://") else "http"
-                to_route = URLRoute(scheme=scheme, path=url)
-                self.address_controller.set_route(to_route)
-            elif url.startswith("file://"):
-                # Convert file:// URL to local ExplorerTab
-                path = url[7:]  # strip "file://"
-                # Create a new ExplorerTab and replace current tab
-                new_tab = self.create_explorer_tab(path)
-                self.destroy_tab(current_tab, new_tab)
-                self.setCurrentWidget(new_tab)
-            else:
-                # Unknown URL, fallback
-                self.address_controller.set_route(URLRoute(scheme="unknown", path=url))
+            route = self.router.route_for_url(url)
+            self.address_controller.set_route(route)
+            if route.scheme == "file":
+                # a directory listing becomes an ExplorerTab; files opened
+                # in-app (see open_file_in_app) stay in the browser
+                tab = current_tab
+                kind = shared_probe().probe(route.path, lambda k: self._on_browser_file_probed(tab, route.path, k))
+                if kind is not None:
+                    self._on_browser_file_probed(tab, route.path, kind)
             return
 
-        # ExplorerTab (has current_path attribute)
-        if hasattr(current_tab, "current_path"):
-            
-            if hasattr(current_tab, "current_path"):
-                self.address_controller.set_route_file(current_tab.current_path)
-                self.address_controller.attach_tab_signals(current_tab)
-                return
+        self.lifecycle.deactivate()
+
+        route = address_route(kind, current_tab)
+        if route is not None:
+            self.address_controller.set_route(URLRoute(*route))
+        # GenericTab / unknown: leave address bar unchanged
+
+    def _on_browser_file_probed(self, tab: QWidget, path: str, kind: str) -> None:
+        if kind != DIR or self.currentWidget() is not tab:
+            return
+        new_tab = self.create_explorer_tab(path)
+        self.destroy_tab(tab, new_tab)
+        self.setCurrentWidget(new_tab)
+
+    def open_file_in_app(self, path: str, mime: str) -> None:
+        """Launcher hook: show a file in a new tab next to the current one, in the viewer if it's text."""
+        index = max(1, self.currentIndex() + 1)
+        if mime.startswith("text/") and mime != "text/html":
+            self.create_viewer_tab(path, insert_index=index)
             return
+        self.create_browser_tab(QUrl.fromLocalFile(path).toString(), insert_index=index)
+
+    def open_link(self, target: str, line: int = 0) -> None:
+        """
+        Open a path or URL clicked in a terminal next to the current tab; a
+        file:line reference opens the viewer at that line. Paths that don't
+        exist are ignored rather than tried as web addresses.
+        """
+        index = max(1, self.currentIndex() + 1)
+
+        def open_route(route: URLRoute) -> None:
+            kind = kind_for_route(route)
+            if kind is None:
+                print(f"[TabManager] No tab type for {route.scheme}:{route.path}")
+                return
+            tab = self.create_tab(kind, route.path or None, index, True)
+            if kind == "viewer" and line > 0:
+                tab.goto_line(line - 1)
 
-        # TerminalTab (has cwd attribute)
-        if hasattr(current_tab, "cwd"):
-            self.address_controller.set_route_file(current_tab.cwd)
+        if not os.path.isabs(target):
+            self.router.resolve(target, open_route)
             return
 
+        def on_kind(kind: str) -> None:
+            if kind in (DIR, FILE, SPECIAL):
+                self.router.resolve(target, open_route)
+            else:
+                print(f"[TabManager] Not opening {target}: no such file")
+
+        kind = shared_probe().probe(target, on_kind)
+        if kind is not None:
+            on_kind(kind)
 
-        # GenericTab / unknown: leave address bar unchanged
-        return
+    # ---------- Session restore ----------
+    def restore_session(self) -> bool:
+        """
+        Queue the tabs of the last saved session for re-creation.
+        Tabs are built one per event-loop turn so the window paints immediately.
+        Returns False if there was nothing to restore.
+        """
+        data = self.session.load()
+        tabs = data.get("tabs") or []
+        if not tabs:
+            return False
+        self._restore_queue = list(tabs)
+        self._restore_current = int(data.get("current", 0))
+        self._restore_pos = 0  # position of the next record in the saved session
+        self._restore_created = []
+        self.session.suspend(True)
+        QTimer.singleShot(0, self._restore_next)
+        return True
+
+    def _restore_next(self) -> None:
+        if not self._restore_queue:
+            self.session.suspend(False)
+            if self._restore_created:
+                # the saved current tab, or the nearest one before it if it failed to restore
+                before = [tab for pos, tab in self._restore_created if pos <= self._restore_current]
+                self.setCurrentWidget(before[-1] if before else self._restore_created[0][1])
+            else:
+                self.create_generic_tab()
+            self._restore_created = []
+            self.session.mark_dirty()
+            self.restored.emit()
+            return
+        record = self._restore_queue.pop(0)
+        pos = self._restore_pos
+        self._restore_pos += 1
+        cwd = record.get("cwd") if record.get("type") == "terminal" else None
+        if cwd:
+            # a terminal's cwd may be on a dead mount; stat it off the GUI thread first
+            kind = shared_probe().probe(cwd, lambda kind: self._restore_record(pos, record, kind == DIR))
+            if kind is None:
+                return  # _restore_record continues once the probe answers or times out
+            self._restore_record(pos, record, kind == DIR)
+        else:
+            self._restore_record(pos, record)
+
+    def _restore_record(self, pos: int, record: dict, cwd_ok: bool = False) -> None:
+        try:
+            tab = self._create_from_record(record, cwd_ok)
+            if tab is not None:
+                self._restore_created.append((pos, tab))
+        except Exception as e:
+            print(f"[TabManager] Could not restore tab {record}: {e}")
+        # one tab per turn; the first restored tab is shown right away
+        QTimer.singleShot(0, self._restore_next)
+
+    def _create_from_record(self, record: dict, cwd_ok: bool = False) -> Optional[QWidget]:
+        kind = record.get("type")
+        index = self.count()
+        activate = not self._restore_created
+        if kind == "browser":
+            arg = record.get("url")
+        elif kind == "explorer":
+            arg = record.get("path")
+        elif kind == "terminal":
+            arg = record.get("cwd") if cwd_ok else None  # probed by _restore_next
+        elif kind == "viewer":
+            arg = record.get("path")
+        elif kind in ("generic", "perf", "downloads"):
+            arg = None
+        else:
+            return None
+        tab = self.create_tab(kind, arg, index, activate)
+        scroll = record.get("scroll") or [0, 0]
+        if kind == "browser" and any(scroll):
+            tab.restore_scroll(*scroll)
+        self.session.touch(tab)
+        return tab
 
     # ---------- Clipboard helpers ----------
     def set_clipboard(self, action: str, paths: list[str]) -> None:
@@ -342,11 +651,9 @@ class TabManager(QTabWidget):
                 raw_title = os.path.basename(os.path.abspath(str(raw_title))).strip() or str(raw_title)
             except Exception:
                 raw_title = str(raw_title)
-        elif tab_type == "terminal":
-            try:
-                raw_title = os.path.basename(str(raw_title).rstrip(os.sep)) or str(raw_title)
-            except Exception:
-                raw_title = str(raw_title)
+        elif tab_type in ("terminal", "viewer"):
+            # already shortened by the tab's title()
+            raw_title = str(raw_title)
         else:
             raw_title = (raw_title or "").strip() or ""
 
@@ -394,7 +701,7 @@ class TabManager(QTabWidget):
         if kind == "browser" and hasattr(widget, "url_changed"):
             try:
                 print("Binding url_changed for", kind)
-                widget.url_changed.connect(lambda u, w=widget, k=kind: self._on_tab_title_signal(w, widget._view.title() if hasattr(widget, "_view") else u, k))
+                widget.url_changed.connect(lambda u, w=widget, k=kind: self._on_tab_title_signal(w, widget.title() if hasattr(widget, "title") else u, k))
             except Exception:
                 print("Failed to connect url_changed")
                 print(Exception)
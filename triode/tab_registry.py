@@ -0,0 +1,93 @@
+# triode/tab_registry.py
+# Maps tab kinds to their classes, the TabManager method creating them and the
+# address-bar route they show, without importing them. The heavy modules
+# (QtWebEngine, pyte/pty) are only imported the first time a tab of that kind
+# is created; everything else asks kind_of()/kind_for_scheme() instead of
+# using isinstance.
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class TabType:
+    kind: str
+    module: str               # relative to the triode package
+    class_name: str
+    schemes: tuple[str, ...] = ()
+    factory: str = ""         # TabManager.create_<kind>_tab([arg,] insert_index, activate)
+    takes_arg: bool = False   # the factory's first parameter is a URL or path
+    default_arg: Optional[str] = None
+    route: Optional[Callable] = None  # tab -> (scheme, path) for the address bar
+
+
+_TYPES: dict[str, TabType] = {}
+_CLASSES: dict[str, type] = {}
+_SCHEMES: dict[str, str] = {}
+
+
+def register(
+    kind: str, module: str, class_name: str, schemes: tuple[str, ...] = (), *,
+    takes_arg: bool = False, default_arg: Optional[str] = None, route: Optional[Callable] = None,
+) -> None:
+    _TYPES[kind] = TabType(
+        kind, module, class_name, schemes, f"create_{kind}_tab", takes_arg, default_arg, route)
+    _CLASSES.pop(kind, None)
+    for scheme in schemes:
+        _SCHEMES[scheme] = kind
+
+
+def tab_class(kind: str) -> type:
+    """Import (once) and return the widget class for kind."""
+    cls = _CLASSES.get(kind)
+    if cls is None:
+        t = _TYPES[kind]
+        module = importlib.import_module(t.module, __package__)
+        cls = _CLASSES[kind] = getattr(module, t.class_name)
+    return cls
+
+
+def tab_type(kind: str) -> Optional[TabType]:
+    return _TYPES.get(kind)
+
+
+def address_route(kind: Optional[str], tab) -> Optional[tuple[str, str]]:
+    """(scheme, path) the address bar shows for tab, or None to leave the bar alone."""
+    t = _TYPES.get(kind)
+    return t.route(tab) if t is not None and t.route is not None else None
+
+
+def kind_of(widget) -> Optional[str]:
+    """The registered kind of a tab widget, without importing any tab module."""
+    return getattr(type(widget), "tab_kind", None)
+
+
+def kind_for_scheme(scheme: str) -> Optional[str]:
+    return _SCHEMES.get(scheme)
+
+
+def kind_for_route(route) -> Optional[str]:
+    """Like kind_for_scheme(), but an about: page may have a kind of its own ("about:downloads")."""
+    return _SCHEMES.get(f"{route.scheme}:{route.path}") or _SCHEMES.get(route.scheme)
+
+
+def is_loaded(kind: str) -> bool:
+    return kind in _CLASSES
+
+
+# the browser's route depends on its page and is set by TabManager itself
+register("generic", ".generic_tab", "GenericTab")
+register("browser", ".browser.tab", "BrowserTab", ("http", "https"),
+         takes_arg=True, default_arg="about:blank")
+register("explorer", ".explorer.tab", "ExplorerTab", ("file",),
+         takes_arg=True, route=lambda tab: ("file", tab.current_path))
+register("terminal", ".terminal.tab", "TerminalTab", ("term",),
+         takes_arg=True, route=lambda tab: ("term", tab.cwd))
+register("perf", ".perf_tab", "PerfTab", ("about:perf",),
+         route=lambda tab: ("about", "perf"))
+register("viewer", ".viewer.tab", "ViewerTab", ("view",),
+         takes_arg=True, route=lambda tab: ("view", tab.path))
+register("duplicates", ".explorer.duplicates_tab", "DuplicatesTab",
+         takes_arg=True, route=lambda tab: ("file", tab.root))
+register("downloads", ".browser.downloads_tab", "DownloadsTab", ("about:downloads",),
+         route=lambda tab: ("about", "downloads"))
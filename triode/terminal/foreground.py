@@ -0,0 +1,59 @@
+# triode/terminal/foreground.py
+# What each terminal is running. One timer serves every TerminalTab: per tick
+# it asks each PTY for its foreground process group (tcgetpgrp, an ioctl, no
+# /proc access) and only reads /proc/<pgrp>/cmdline for the tabs where that
+# group changed. The cost per tick is a syscall per tab, not a timer per tab.
+import os
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from .. import perf, procfs
+
+POLL_INTERVAL_MS = 1000
+
+
+class ForegroundPoller(QObject):
+    def __init__(self, interval_ms: int = POLL_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self._tabs: Dict[int, object] = {}
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.poll)
+
+    def register(self, tab) -> None:
+        self._tabs[id(tab)] = tab
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def unregister(self, tab) -> None:
+        self._tabs.pop(id(tab), None)
+        if not self._tabs:
+            self._timer.stop()  # no terminals, no wakeups
+
+    @perf.timed("terminal.foreground_poll")
+    def poll(self) -> None:
+        for tab in list(self._tabs.values()):
+            fd = tab.master_fd
+            if fd is None:
+                continue
+            try:
+                pgrp = os.tcgetpgrp(fd)
+            except OSError:
+                continue  # shell gone; the tab cleans up on its own
+            if pgrp == tab.foreground_pgrp:
+                continue
+            tab.foreground_pgrp = pgrp
+            # the shell's own group in the foreground means it's at the prompt
+            command = None if pgrp == tab.process.pid else procfs.command_line(pgrp)
+            tab.set_foreground(command or "")
+
+
+_shared: Optional[ForegroundPoller] = None
+
+
+def shared_poller() -> ForegroundPoller:
+    global _shared
+    if _shared is None:
+        _shared = ForegroundPoller()
+    return _shared
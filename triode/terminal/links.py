@@ -0,0 +1,104 @@
+# triode/terminal/links.py
+# Clickable paths and URLs in terminal output. Lines are matched once: the
+# index follows the screen's dirty rows and the lines newly pushed into the
+# scrollback, never the whole history, and find_links() is memoized by line
+# text so a repainted row with the same content costs a dict lookup.
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Tuple
+
+_URL = r"(?P<url>(?:https?|file)://[^\s<>\"'`]+)"
+# an absolute/home/dot-relative path, a relative path with a slash, or a bare
+# name.ext; each optionally followed by :line[:col] as in compiler errors
+_PATH = (
+    r"(?P<path>(?:~|\.{1,2})?/[^\s:\"'`<>()\[\]{},;|]+"
+    r"|[\w.+@-]+/(?:[\w.+@-]+/)*[\w.+@-]*"
+    r"|[\w+@-][\w.+@-]*\.[A-Za-z][A-Za-z0-9]{0,7})"
+    r"(?::(?P<line>\d+)(?::(?P<col>\d+))?)?"
+)
+_LINK_RE = re.compile(rf"(?<![\w/.~@+-]){_URL}|(?<![\w/.~@+:-]){_PATH}")
+_PY_LINE = re.compile(r'", line (\d+)')  # Python tracebacks: File "x.py", line 12
+_TRAILING = ".,;:!?)]}'\""
+
+
+class LinkSpan:
+    __slots__ = ("start", "end", "kind", "target", "line")
+
+    def __init__(self, start: int, end: int, kind: str, target: str, line: Optional[int] = None):
+        self.start = start  # columns in the line, end exclusive
+        self.end = end
+        self.kind = kind    # "url" or "path"
+        self.target = target
+        self.line = line    # from a file:line reference
+
+    def __repr__(self) -> str:
+        suffix = f":{self.line}" if self.line else ""
+        return f"LinkSpan({self.start}-{self.end} {self.kind} {self.target}{suffix})"
+
+
+@lru_cache(maxsize=4096)
+def find_links(text: str) -> Tuple[LinkSpan, ...]:
+    spans = []
+    for m in _LINK_RE.finditer(text):
+        if m.group("url"):
+            url = m.group("url").rstrip(_TRAILING)
+            spans.append(LinkSpan(m.start(), m.start() + len(url), "url", url))
+            continue
+        path = m.group("path")
+        if m.group("line") is None:
+            path = path.rstrip(_TRAILING)
+            end = m.start() + len(path)
+        else:
+            end = m.end()
+        if path in (".", "..", "/", "~") or path.startswith("//"):
+            continue
+        line = int(m.group("line")) if m.group("line") else None
+        if line is None:
+            py = _PY_LINE.match(text, end)
+            line = int(py.group(1)) if py else None
+        spans.append(LinkSpan(m.start(), end, "path", path, line))
+    return tuple(spans)
+
+
+class LinkIndex:
+    """
+    Links per scrollback line and per screen row of a ScreenWithHistory.
+    update() consumes the screen's dirty set and its new history lines.
+    """
+
+    def __init__(self, history_size: int):
+        self.history: deque = deque(maxlen=history_size)
+        self.rows: dict = {}
+        self._history_seen = 0
+        self.scanned = 0  # lines matched so far; stays proportional to output, not scrollback
+
+    def update(self, screen) -> None:
+        added = screen.history_added - self._history_seen
+        if added:
+            self._history_seen = screen.history_added
+            start = max(0, len(screen.history) - added)
+            for text in islice(screen.history, start, None):
+                self.history.append(find_links(text.rstrip()))
+            self.scanned += min(added, len(screen.history))
+        if screen.dirty:
+            display = screen.display
+            for y in screen.dirty:
+                if y < len(display):
+                    self.rows[y] = find_links(display[y].rstrip())
+            self.scanned += len(screen.dirty)
+            screen.dirty.clear()
+            for y in [y for y in self.rows if y >= screen.lines]:
+                del self.rows[y]  # shrunk by a resize
+
+    def link_at(self, row: int, column: int) -> Optional[LinkSpan]:
+        """row counts scrollback lines first, then screen rows (as the terminal shows them)."""
+        if row < len(self.history):
+            spans = self.history[row]
+        else:
+            spans = self.rows.get(row - len(self.history), ())
+        for span in spans:
+            if span.start <= column < span.end:
+                return span
+        return None
@@ -0,0 +1,84 @@
+# triode/terminal/pty_writer.py
+import errno
+import os
+from collections import deque
+
+from PySide6.QtCore import QObject, QSocketNotifier, Signal
+
+from .. import perf
+
+
+class PtyWriteQueue(QObject):
+    """
+    Buffered writes to a non-blocking PTY master.
+
+    write() never blocks and never drops data: whatever the kernel doesn't
+    take right away (partial write, EAGAIN once the PTY buffer is full) is
+    queued and drained by a write-side QSocketNotifier as the shell reads.
+    depth() is the number of bytes still queued; depth_changed reports it.
+    """
+
+    depth_changed = Signal(int)
+
+    def __init__(self, fd: int, parent=None, chunk_size: int = 64 * 1024):
+        super().__init__(parent)
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self._chunks: deque = deque()  # memoryviews, so partial writes don't copy
+        self._depth = 0
+        self._notifier = QSocketNotifier(fd, QSocketNotifier.Type.Write, self)
+        self._notifier.setEnabled(False)
+        self._notifier.activated.connect(self._drain)
+
+    def depth(self) -> int:
+        return self._depth
+
+    def write(self, data: bytes) -> None:
+        if not data or self.fd is None:
+            return
+        view = memoryview(bytes(data))
+        for start in range(0, len(view), self.chunk_size):
+            self._chunks.append(view[start:start + self.chunk_size])
+        self._depth += len(view)
+        if not self._notifier.isEnabled():
+            # nothing was queued before: try right away, keeping keystrokes snappy
+            self._drain()
+        else:
+            self.depth_changed.emit(self._depth)
+
+    def _drain(self) -> None:
+        written = 0
+        while self._chunks:
+            head = self._chunks[0]
+            try:
+                n = os.write(self.fd, head)
+            except InterruptedError:
+                continue
+            except BlockingIOError:
+                break  # PTY buffer full; wait for the notifier
+            except OSError as e:
+                # EIO/EBADF: the shell is gone, nobody will read the rest
+                if e.errno not in (errno.EIO, errno.EBADF):
+                    print(f"[PtyWriteQueue] write failed: {e}")
+                self._discard()
+                return
+            written += n
+            if n < len(head):
+                self._chunks[0] = head[n:]
+                break  # short write: the buffer is full too
+            self._chunks.popleft()
+        self._depth -= written
+        perf.count("terminal.bytes_written", written)
+        self._notifier.setEnabled(bool(self._chunks))
+        self.depth_changed.emit(self._depth)
+
+    def _discard(self) -> None:
+        self._chunks.clear()
+        self._depth = 0
+        self._notifier.setEnabled(False)
+        self.depth_changed.emit(0)
+
+    def close(self) -> None:
+        """Stop writing (the fd is about to be closed) and drop anything queued."""
+        self._discard()
+        self.fd = None
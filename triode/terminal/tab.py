@@ -20,16 +20,26 @@ from PySide6.QtGui import QTextCursor, QFont, QGuiApplication
 
 import pyte
 
+from .. import perf, procfs
+from .pty_writer import PtyWriteQueue
+from .foreground import shared_poller
+from .links import LinkIndex
+
 BRACKETED_PASTE_START = b'\x1b[200~'
 BRACKETED_PASTE_END = b'\x1b[201~'
 
 
 class TerminalWidget(QTextEdit):
     """A read-only QTextEdit optimized for terminal display."""
+
+    link_clicked = Signal(object)  # LinkSpan under a Ctrl+click
+
     def __init__(self, write_callback, parent=None):
         super().__init__(parent)
         self.write_callback = write_callback
         self.cwd = os.path.expanduser("~")
+        self.link_at = None  # (document row, column) -> LinkSpan or None; set by TerminalTab
+        self.viewport().setMouseTracking(True)
 
         self.setStyleSheet("""
             QTextEdit {
@@ -66,6 +76,42 @@ class TerminalWidget(QTextEdit):
         scroll_bar = self.verticalScrollBar()
         scroll_bar.setValue(scroll_bar.maximum())
 
+    def _link_under(self, pos):
+        if self.link_at is None:
+            return None, None
+        cursor = self.cursorForPosition(pos)
+        block = cursor.block()
+        span = self.link_at(block.blockNumber(), cursor.positionInBlock())
+        return span, block
+
+    def mouseMoveEvent(self, event):
+        # hovering a link with Ctrl held underlines it
+        span, block = (None, None)
+        if event.modifiers() & Qt.ControlModifier:
+            span, block = self._link_under(event.position().toPoint())
+        if span is not None:
+            sel = QTextEdit.ExtraSelection()
+            sel.cursor = QTextCursor(block)
+            sel.cursor.setPosition(block.position() + span.start)
+            sel.cursor.setPosition(block.position() + span.end, QTextCursor.KeepAnchor)
+            sel.format.setFontUnderline(True)
+            self.setExtraSelections([sel])
+            self.viewport().setCursor(Qt.PointingHandCursor)
+        elif self.extraSelections():
+            self.setExtraSelections([])
+            self.viewport().setCursor(Qt.IBeamCursor)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier \
+                and not self.textCursor().hasSelection():
+            span, _ = self._link_under(event.position().toPoint())
+            if span is not None:
+                self.link_clicked.emit(span)
+                event.accept()
+                return
+        super().mouseReleaseEvent(event)
+
     def keyPressEvent(self, event):
         """Converts Qt key events to bytes and forwards them to the PTY."""
         try:
@@ -116,23 +162,28 @@ class ScreenWithHistory(pyte.Screen):
     def __init__(self, columns, lines, history_size=10000):
         super().__init__(columns, lines)
         self.history = collections.deque(maxlen=history_size)
+        self.history_added = 0  # lines ever appended; tells consumers what's new
 
-    def scroll_up(self, n):
-        """Overrides the default scroll_up to capture scrolled-off lines."""
-        # This is called *before* the screen buffer is scrolled.
-        # We capture the lines that are about to be lost from the top.
-        for i in range(n):
-            line_to_scroll = self.buffer.get(i)
-            if line_to_scroll:
-                line_text = "".join(char.data for char in line_to_scroll.values())
-                self.history.append(line_text)
-        
-        super().scroll_up(n)
+    def index(self):
+        """Overrides index (line feed) to capture the line scrolled off the top."""
+        # pyte scrolls in index() when the cursor is on the bottom margin;
+        # capture the top line before it is dropped from the buffer.
+        top, bottom = self.margins or pyte.screens.Margins(0, self.lines - 1)
+        if self.cursor.y == bottom and top == 0:
+            line = self.buffer[0]
+            self.history.append("".join(line[x].data for x in range(self.columns)))
+            self.history_added += 1
+        super().index()
 
 
 class TerminalTab(QWidget):
     """Manages a PTY session and renders its state to a TerminalWidget."""
+    tab_kind = "terminal"
     path_changed = Signal(str)
+    foreground_changed = Signal(str)  # command running in the PTY, "" at the prompt
+    link_activated = Signal(str, int)  # absolute path or URL, line number (0 if none)
+
+    MAX_TITLE_COMMAND = 40
 
     def __init__(self, initial_path: Optional[str] = None, shell: Optional[str] = None, parent=None):
         super().__init__(parent)
@@ -144,12 +195,17 @@ class TerminalTab(QWidget):
 
         # Initialize with a standard default size. It will be resized immediately anyway.
         self.screen = ScreenWithHistory(80, 24, history_size=10000)
+        self.links = LinkIndex(history_size=10000)
         self.stream = pyte.Stream()
         self.stream.attach(self.screen)
 
         self.master_fd, self.process = self._spawn_pty(self.shell, self.cwd)
+        self.foreground = ""
+        self.foreground_pgrp: Optional[int] = None  # maintained by the shared poller
 
         self.terminal = TerminalWidget(write_callback=self._write_to_master, parent=self)
+        self.terminal.link_at = self._link_at
+        self.terminal.link_clicked.connect(self._on_link_clicked)
         self.layout.addWidget(self.terminal)
 
         if self.master_fd is not None:
@@ -157,6 +213,11 @@ class TerminalTab(QWidget):
             fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
             self.notifier = QSocketNotifier(self.master_fd, QSocketNotifier.Read, self)
             self.notifier.activated.connect(self._on_master_ready)
+            # input (keys, pastes, cd commands) is queued and drained as the shell reads
+            self.writer = PtyWriteQueue(self.master_fd, self)
+            shared_poller().register(self)
+        else:
+            self.writer = None
 
         self._render_timer = QTimer(self)
         self._render_timer.setInterval(16)
@@ -232,17 +293,35 @@ class TerminalTab(QWidget):
         os.close(slave_fd)
         return master_fd, process
 
+    def set_foreground(self, command: str) -> None:
+        if command != self.foreground:
+            self.foreground = command
+            self.foreground_changed.emit(command)
+
+    def title(self) -> str:
+        """Tab label: the running command, if any, and the cwd's basename."""
+        base = os.path.basename(self.cwd.rstrip(os.sep)) or self.cwd
+        if not self.foreground:
+            return base
+        command = self.foreground
+        if len(command) > self.MAX_TITLE_COMMAND:
+            command = command[:self.MAX_TITLE_COMMAND - 1] + "…"
+        return f"{command} ({base})"
+
     def _write_to_master(self, data: bytes):
-        if self.master_fd is not None:
-            try:
-                os.write(self.master_fd, data)
-            except OSError:
-                pass
+        if self.writer is not None:
+            self.writer.write(data)
+
+    def input_queue_depth(self) -> int:
+        """Bytes of input accepted but not yet taken by the PTY."""
+        return self.writer.depth() if self.writer is not None else 0
 
+    @perf.timed("terminal.read")
     def _on_master_ready(self):
         try:
             data = os.read(self.master_fd, 4096)
             if data:
+                perf.count("terminal.bytes_read", len(data))
                 self.stream.feed(data.decode('utf-8', errors='replace'))
                 if not self._render_timer.isActive():
                     self._render_timer.start()
@@ -251,7 +330,25 @@ class TerminalTab(QWidget):
         except Exception as exc:
             print(f"PTY read error: {exc}")
 
+    def _link_at(self, block: int, column: int):
+        # the document may have dropped its oldest blocks (maximumBlockCount)
+        total = len(self.screen.history) + self.screen.lines
+        dropped = max(0, total - self.terminal.document().blockCount())
+        return self.links.link_at(block + dropped, column)
+
+    def _on_link_clicked(self, span) -> None:
+        if span.kind == "url":
+            self.link_activated.emit(span.target, 0)
+            return
+        # relative paths are relative to wherever the shell (or its job) is now
+        pid = self.foreground_pgrp or (self.process.pid if self.process else None)
+        base = (procfs.cwd(pid) if pid else None) or self.cwd
+        path = os.path.normpath(os.path.join(base, os.path.expanduser(span.target)))
+        self.link_activated.emit(path, span.line or 0)
+
+    @perf.timed("terminal.render")
     def _render_screen(self):
+        self.links.update(self.screen)
         history_lines = [line.rstrip() for line in self.screen.history]
         # Use the .display property which is the canonical way to get screen content
         visible_lines = [line.rstrip() for line in self.screen.display]
@@ -297,8 +394,13 @@ class TerminalTab(QWidget):
         super().resizeEvent(event)
         self._do_initial_resize()
 
-    def closeEvent(self, event):
+    def on_destroy(self):
+        """Called by TabManager before the tab is deleted: stop the shell and release the PTY."""
+        shared_poller().unregister(self)
+        if self.writer is not None:
+            self.writer.close()
         if self.master_fd:
+            self.notifier.setEnabled(False)  # before the fd goes away
             os.close(self.master_fd)
             self.master_fd = None
         if self.process and self.process.poll() is None:
@@ -306,4 +408,7 @@ class TerminalTab(QWidget):
                 os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
             except ProcessLookupError:
                 pass
+
+    def closeEvent(self, event):
+        self.on_destroy()
         super().closeEvent(event)
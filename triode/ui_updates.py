@@ -0,0 +1,47 @@
+# triode/ui_updates.py
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class UpdateCoalescer(QObject):
+    """
+    Batches UI updates coming from tab signals (titles, locations).
+
+    post(widget, key, value) only records the latest value; once per
+    event-loop turn flush() hands each (widget, key) that changed to apply().
+    A redirect chain or a burst of cwd changes therefore costs one setText
+    per tab instead of one per signal. When apply() returns True the value
+    is remembered and posting it again is a no-op.
+    """
+
+    def __init__(self, apply: Callable[[QObject, str, Any], bool], parent=None):
+        super().__init__(parent)
+        self._apply = apply
+        self._pending: dict[tuple[int, str], tuple[QObject, Any]] = {}
+        self._applied: dict[int, dict[str, Any]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def post(self, widget: QObject, key: str, value: Any) -> None:
+        self._pending[(id(widget), key)] = (widget, value)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def forget(self, widget_id: int) -> None:
+        """Drop pending and remembered values for id(widget) of a tab that is going away."""
+        wid = widget_id
+        self._applied.pop(wid, None)
+        for k in [k for k in self._pending if k[0] == wid]:
+            del self._pending[k]
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for (wid, key), (widget, value) in pending.items():
+            applied = self._applied.setdefault(wid, {})
+            if key in applied and applied[key] == value:
+                continue
+            if self._apply(widget, key, value):
+                applied[key] = value
@@ -1,44 +1,122 @@
 # triode/url_router.py
 import os
 import urllib.parse
-from typing import Dict
+from functools import lru_cache
+from typing import Callable, Optional
 from .models.route import URLRoute
+from .fs_probe import FsProbe, shared_probe, DIR, FILE, SPECIAL
+from . import perf
+from .explorer.archive_vfs import is_archive_name
+
+# input starting with one of these is a local path, no probing needed
+PATH_PREFIXES = ("/", "~", "./", "../")
+
 
 class URLRouter:
-    SUPPORTED = {"http", "https", "file", "term"}
+    SUPPORTED = {"http", "https", "file", "term", "about", "view"}
 
-    def parse(self, text: str) -> URLRoute:
+    def __init__(self, probe: Optional[FsProbe] = None, memo_size: int = 1024):
+        self._probe = probe
+        # routes are immutable, so the same text always maps to the same
+        # route object; the address bar re-parses identical text constantly
+        self.classify = lru_cache(maxsize=memo_size)(self._classify)
+        self.to_text = lru_cache(maxsize=memo_size)(self._to_text)
+        self.route_for_url = lru_cache(maxsize=memo_size)(self._route_for_url)
+
+    @property
+    def probe(self) -> FsProbe:
+        if self._probe is None:
+            self._probe = shared_probe()
+        return self._probe
+
+    def _classify(self, text: str) -> tuple[URLRoute, Optional[str]]:
+        """
+        Purely syntactic routing; never touches the filesystem.
+        Returns (route, ambiguous_path). ambiguous_path is set when the text
+        could also be a relative local path (e.g. "notes.txt"); route is then
+        the guess for when that path does not exist.
+        """
         text = text.strip()
-        # If user typed a plain path, treat as file://
         if text.startswith("http://") or text.startswith("https://"):
-            return URLRoute(scheme=urllib.parse.urlparse(text).scheme, path=text, query={})
+            return URLRoute(scheme=urllib.parse.urlparse(text).scheme, path=text), None
         if text.startswith("file://"):
-            path = self._from_file_uri(text)
-            return URLRoute(scheme="file", path=path, query={})
+            return URLRoute(scheme="file", path=self._from_file_uri(text)), None
         if text.startswith("term://"):
-            return URLRoute(scheme="term", path=text[7:])
-        # fallback: consider as file path or http (if looks like domain)
-        if " " not in text and "." in text and not os.path.exists(text):
-            # heuristic: treat as HTTP if contains dot and no local path
-            if text.startswith("www."):
-                text = "http://" + text
-            elif text.startswith("http"):
-                pass
-            elif text.count(".") >= 1:
-                text = "http://" + text
-            if text.startswith("http"):
-                return URLRoute(scheme=urllib.parse.urlparse(text).scheme, path=text, query={})
-        # otherwise treat as file path
+            return URLRoute(scheme="term", path=text[7:]), None
+        if text.startswith("about:"):
+            return URLRoute(scheme="about", path=text[6:]), None
         abs_path = os.path.abspath(os.path.expanduser(text))
-        return URLRoute(scheme="file", path=abs_path, query={})
+        if text.startswith(PATH_PREFIXES) or " " in text or "." not in text:
+            return URLRoute(scheme="file", path=abs_path), None
+        # looks like a domain unless a local file by that name exists
+        return URLRoute(scheme="http", path="http://" + text), abs_path
+
+    @perf.timed("router.parse")
+    def parse(self, text: str) -> URLRoute:
+        """
+        Non-blocking parse: ambiguous input is decided by a memoized probe
+        result if there is one, otherwise by the syntactic guess. Use resolve()
+        where the answer matters (e.g. on submit).
+        """
+        route, ambiguous = self.classify(text)
+        if ambiguous is not None:
+            kind = self.probe.cached(ambiguous)
+            if kind in (DIR, FILE, SPECIAL):
+                return self._local_route(ambiguous, kind)
+        elif route.scheme == "file" and self.probe.cached(route.path) == FILE and not is_archive_name(route.path):
+            return URLRoute(scheme="view", path=route.path)
+        return route
+
+    def resolve(self, text: str, callback: Callable[[URLRoute], None]) -> None:
+        """
+        Like parse(), but local paths are checked against the filesystem on
+        a worker thread first: ambiguous input that exists is a file route, and
+        regular files open in the viewer ("view"). callback runs on the GUI
+        thread, immediately if no probe is needed; a probe that times out
+        counts as "doesn't exist".
+        """
+        route, ambiguous = self.classify(text)
+        if ambiguous is None and route.scheme != "file":
+            callback(route)
+            return
+        path = ambiguous if ambiguous is not None else route.path
+
+        def on_kind(kind: str) -> None:
+            if kind in (DIR, FILE, SPECIAL):
+                callback(self._local_route(path, kind))
+            else:
+                callback(route)
+
+        kind = self.probe.probe(path, on_kind)
+        if kind is not None:
+            on_kind(kind)
+
+    @staticmethod
+    def _local_route(path: str, kind: str) -> URLRoute:
+        # archives are browsed in the explorer like directories; only regular
+        # files go to the viewer (opening a FIFO for reading would block)
+        view = kind == FILE and not is_archive_name(path)
+        return URLRoute(scheme="view" if view else "file", path=path)
+
+    def _route_for_url(self, url: str) -> URLRoute:
+        """Route for a URL reported by a browser view."""
+        if url.startswith("https://"):
+            return URLRoute(scheme="https", path=url)
+        if url.startswith("http://"):
+            return URLRoute(scheme="http", path=url)
+        if url.startswith("file://"):
+            return URLRoute(scheme="file", path=url[len("file://"):])
+        return URLRoute(scheme="unknown", path=url)
 
-    def to_text(self, route: URLRoute) -> str:
+    def _to_text(self, route: URLRoute) -> str:
         if route.scheme in ("http", "https"):
             return route.path
-        if route.scheme == "file":
+        if route.scheme in ("file", "view"):
             return f"file://{route.path}"
         if route.scheme == "term":
             return f"term://{route.path}"
+        if route.scheme == "about":
+            return f"about:{route.path}"
         return route.path
 
     def _from_file_uri(self, uri: str) -> str:
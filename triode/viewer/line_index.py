@@ -0,0 +1,271 @@
+# triode/viewer/line_index.py
+# Line access into a file of any size. Instead of one offset per line, the
+# index keeps one (line number, offset) checkpoint per block of bytes, and the
+# block size grows with the file so the index never holds more than
+# max_checkpoints entries. A line's offset is found from the nearest
+# checkpoint before it by counting newlines in the bytes after it.
+# Reads go through pread() rather than an mmap: a followed log can be
+# truncated at any moment (logrotate copytruncate), and touching a mapped
+# page past the new end of file kills the process with SIGBUS, whereas a
+# pread() just comes back short.
+import errno
+import os
+import re
+import stat
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterator, List, Optional, Tuple
+
+MIN_BLOCK = 64 * 1024
+READ_SIZE = 4 * 1024 * 1024  # bytes indexed per round
+MAX_LINE_BYTES = 64 * 1024  # longer lines are cut when rendered
+SEARCH_WINDOW = 8 * 1024 * 1024
+
+
+class LineIndexedFile:
+    """
+    Read-only line access to path with a sparse line index built on a worker
+    thread. on_progress (if given) is called from that thread as the index
+    grows; refresh() picks up appended data (or starts over if the file shrank).
+    """
+
+    def __init__(self, path: str, max_checkpoints: int = 65536,
+                 on_progress: Optional[Callable[[], None]] = None):
+        self.path = path
+        self.max_checkpoints = max_checkpoints
+        self.on_progress = on_progress
+        # O_NONBLOCK so a FIFO can't hang the caller in open(); only regular files are read
+        self._fd: Optional[int] = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        if not stat.S_ISREG(os.fstat(self._fd).st_mode):
+            os.close(self._fd)
+            self._fd = None
+            raise OSError(errno.EINVAL, "Not a regular file", path)
+        self.size = 0
+        self._generation = 0  # bumped whenever the index is reset
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._reset_index()
+        self.refresh()
+
+    def _reset_index(self) -> None:
+        self._lines = array("q", [0])    # checkpoint line numbers
+        self._offsets = array("q", [0])  # byte offset where that line starts
+        self._block = MIN_BLOCK
+        self._indexed_to = 0   # bytes scanned
+        self._newlines = 0     # newlines in [0, _indexed_to)
+        self._generation += 1
+
+    def _read(self, offset: int, n: int) -> bytes:
+        """Up to n bytes at offset; short or empty if the file is shorter now."""
+        fd = self._fd
+        if fd is None or n <= 0:
+            return b""
+        try:
+            return os.pread(fd, n, offset)
+        except OSError:
+            return b""
+
+    def refresh(self) -> bool:
+        """Pick up a size change; True if there was one. Indexing resumes in the background."""
+        if self._fd is None:
+            return False
+        try:
+            size = os.fstat(self._fd).st_size
+        except OSError:
+            return False
+        if size == self.size:
+            return False
+        with self._lock:
+            if size < self.size:
+                self._reset_index()  # truncated or rotated: start over
+            self.size = size
+            block = size // self.max_checkpoints
+            self._block = max(self._block, block - block % MIN_BLOCK + MIN_BLOCK)
+        self._start_indexing()
+        return True
+
+    def close(self) -> None:
+        self._closed = True
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
+
+    # ---------- index ----------
+    @property
+    def indexing(self) -> bool:
+        return self._indexed_to < self.size
+
+    def _start_indexing(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return  # the running pass notices the new size
+            self._thread = threading.Thread(target=self._index, name="triode-line-index", daemon=True)
+            self._thread.start()
+
+    def _index(self) -> None:
+        while not self._closed:
+            with self._lock:
+                size, pos, block = self.size, self._indexed_to, self._block
+                generation, newlines = self._generation, self._newlines
+                if pos >= size:
+                    self._thread = None
+                    return
+            # read ~4 MB per round (plus the byte before it, for the checkpoint
+            # test), then publish and let the GUI thread in
+            end = min(size, pos + max(block, READ_SIZE))
+            base = max(0, pos - 1)
+            data = self._read(base, end - base)
+            if len(data) < end - base:
+                if not self.refresh():  # shrank meanwhile: refresh() resets the index
+                    with self._lock:
+                        self._thread = None
+                    return
+                continue
+            found = []
+            start = pos
+            while start < end:
+                stop = min(end, (start // block + 1) * block)
+                if start > 0 and start % block == 0:
+                    # checkpoint: the first line starting at or after this block boundary
+                    if data[start - base - 1] == 0x0A:
+                        found.append((newlines, start))
+                    else:
+                        nl = data.find(b"\n", start - base, stop - base)
+                        if nl >= 0 and base + nl + 1 < size:
+                            found.append((newlines + 1, base + nl + 1))
+                newlines += data.count(b"\n", start - base, stop - base)
+                start = stop
+            with self._lock:
+                if self._generation != generation:
+                    continue  # reset meanwhile
+                for line, offset in found:
+                    if offset > self._offsets[-1]:
+                        self._lines.append(line)
+                        self._offsets.append(offset)
+                self._indexed_to = end
+                self._newlines = newlines
+                if len(self._offsets) > self.max_checkpoints:
+                    self._coarsen()
+            if self.on_progress is not None:
+                self.on_progress()
+        with self._lock:
+            self._thread = None
+
+    def _coarsen(self) -> None:
+        # keep every other checkpoint; lookups scan at most twice as far
+        self._lines = self._lines[::2]
+        self._offsets = self._offsets[::2]
+        self._block *= 2
+
+    def line_count(self) -> int:
+        """Lines known so far (all of them once indexing is done)."""
+        with self._lock:
+            count, size = self._newlines, self.size
+            done = self._indexed_to >= size
+        if done and size and self._read(size - 1, 1) not in (b"\n", b""):
+            count += 1  # last line has no newline
+        return count
+
+    def progress(self) -> float:
+        return 1.0 if not self.size else min(1.0, self._indexed_to / self.size)
+
+    def memory_bytes(self) -> int:
+        """Size of the index itself; independent of the file size."""
+        return (len(self._lines) + len(self._offsets)) * 8
+
+    # ---------- reading ----------
+    def line_offset(self, n: int) -> Optional[int]:
+        """Byte offset where line n (0-based) starts, or None if not indexed yet."""
+        with self._lock:
+            indexed_to, size = self._indexed_to, self.size
+            i = bisect_right(self._lines, n) - 1
+            line, offset = self._lines[i], self._offsets[i]
+        while line < n:
+            data = self._read(offset, min(MIN_BLOCK, indexed_to - offset))
+            if not data:
+                return None  # not indexed that far, or truncated
+            count = data.count(b"\n")
+            if line + count < n:
+                line += count
+                offset += len(data)
+                continue
+            nl = -1
+            while line < n:
+                nl = data.find(b"\n", nl + 1)
+                line += 1
+            offset += nl + 1
+        return offset if offset < size else None
+
+    def line_at(self, offset: int) -> int:
+        """Line number containing byte offset (which must be indexed)."""
+        with self._lock:
+            i = bisect_right(self._offsets, offset) - 1
+            line, start = self._lines[i], self._offsets[i]
+        while start < offset:
+            data = self._read(start, min(SEARCH_WINDOW, offset - start))
+            if not data:
+                break
+            line += data.count(b"\n")
+            start += len(data)
+        return line
+
+    def read_lines(self, first: int, count: int) -> List[str]:
+        offset = self.line_offset(first)
+        lines: List[str] = []
+        if offset is None:
+            return lines
+        size = self.size
+        line = bytearray()
+        skipping = False  # past MAX_LINE_BYTES of an over-long line
+        while len(lines) < count and offset < size:
+            data = self._read(offset, min(MIN_BLOCK, size - offset))
+            if not data:
+                break  # truncated
+            offset += len(data)
+            start = 0
+            while len(lines) < count:
+                nl = data.find(b"\n", start)
+                piece = data[start:] if nl < 0 else data[start:nl]
+                if not skipping:
+                    line += piece[:MAX_LINE_BYTES - len(line)]
+                    skipping = len(line) >= MAX_LINE_BYTES
+                if nl < 0:
+                    break
+                lines.append(line.decode("utf-8", "replace"))
+                line = bytearray()
+                skipping = False
+                start = nl + 1
+        if line and len(lines) < count and offset >= size:
+            lines.append(line.decode("utf-8", "replace"))  # last line has no newline
+        return lines
+
+    # ---------- search ----------
+    def search(self, pattern: "re.Pattern[bytes]", start_line: int,
+               cancelled: Callable[[], bool] = lambda: False) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (line, match start, match end) for matches at or after start_line,
+        reading the file in line-aligned windows so it's never held in memory
+        whole. Byte offsets are absolute.
+        """
+        offset = self.line_offset(start_line)
+        if offset is None:
+            return
+        line = start_line
+        size = self.size
+        while offset < size and not cancelled():
+            data = self._read(offset, min(SEARCH_WINDOW, size - offset))
+            if not data:
+                return  # truncated; the caller sees no more matches
+            end = len(data)
+            if offset + end < size:
+                nl = data.rfind(b"\n")
+                end = nl + 1 if nl >= 0 else end
+            pos = 0
+            for m in pattern.finditer(data, 0, end):
+                line += data.count(b"\n", pos, m.start())
+                pos = m.start()
+                yield line, offset + m.start(), offset + m.end()
+            line += data.count(b"\n", pos, end)
+            offset += end
@@ -0,0 +1,291 @@
+# triode/viewer/tab.py
+import os
+import re
+import threading
+from typing import Optional
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QToolBar, QLineEdit, QLabel, QAbstractScrollArea,
+)
+from PySide6.QtGui import QAction, QColor, QFontDatabase, QPainter
+from PySide6.QtCore import QTimer, Signal
+
+from .. import perf
+from .line_index import LineIndexedFile
+
+
+class LineView(QAbstractScrollArea):
+    """Paints only the visible lines of a LineIndexedFile; the scrollbar counts lines."""
+
+    GUTTER_PAD = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file: Optional[LineIndexedFile] = None
+        self.highlight_line: Optional[int] = None
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().setRange(0, 0)
+
+    def set_file(self, file: Optional[LineIndexedFile]) -> None:
+        self.file = file
+        self.highlight_line = None
+        self.verticalScrollBar().setValue(0)
+        self.update_range()
+
+    def visible_lines(self) -> int:
+        return max(1, self.viewport().height() // self.fontMetrics().lineSpacing())
+
+    def top_line(self) -> int:
+        return self.verticalScrollBar().value()
+
+    def update_range(self) -> None:
+        count = self.file.line_count() if self.file is not None else 0
+        bar = self.verticalScrollBar()
+        bar.setRange(0, max(0, count - self.visible_lines()))
+        bar.setPageStep(self.visible_lines())
+        self.viewport().update()
+
+    def scroll_to_line(self, line: int, highlight: bool = False) -> None:
+        if highlight:
+            self.highlight_line = line
+        self.verticalScrollBar().setValue(max(0, line - self.visible_lines() // 3))
+        self.viewport().update()
+
+    def scroll_to_end(self) -> None:
+        bar = self.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_range()
+
+    @perf.timed("viewer.paint")
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        if self.file is None:
+            return
+        fm = self.fontMetrics()
+        spacing = fm.lineSpacing()
+        top = self.top_line()
+        lines = self.file.read_lines(top, self.visible_lines() + 1)
+        last = top + len(lines)
+        gutter = fm.horizontalAdvance(str(max(last, 1))) + 2 * self.GUTTER_PAD
+        x_text = gutter - self.horizontalScrollBar().value()
+        widest = 0
+        for i, text in enumerate(lines):
+            y = i * spacing
+            n = top + i
+            if n == self.highlight_line:
+                painter.fillRect(0, y, self.viewport().width(), spacing, QColor(255, 230, 120))
+            text = text.expandtabs(8)
+            widest = max(widest, len(text))
+            painter.setPen(self.palette().text().color())
+            painter.drawText(x_text, y + fm.ascent(), text)
+        painter.fillRect(0, 0, gutter - self.GUTTER_PAD // 2, self.viewport().height(), self.palette().alternateBase())
+        painter.setPen(self.palette().placeholderText().color())
+        for i in range(len(lines)):
+            painter.drawText(self.GUTTER_PAD, i * spacing + fm.ascent(), str(top + i + 1))
+        # horizontal range follows the widest line seen on screen
+        width = widest * fm.horizontalAdvance("M") + gutter - self.viewport().width()
+        hbar = self.horizontalScrollBar()
+        if width > hbar.maximum():
+            hbar.setRange(0, width)
+
+
+class ViewerTab(QWidget):
+    """
+    Read-only view of a (possibly huge) file through a LineIndexedFile: only
+    the visible lines are read (with pread, so a file truncated under us just
+    reads short), the line index is built in the background, and search runs
+    on a worker in bounded windows.
+    """
+
+    tab_kind = "viewer"
+    path_changed = Signal(str)
+    _progress = Signal()                 # index worker -> GUI thread
+    _search_result = Signal(int, object)  # search worker -> GUI thread: id, line or None
+
+    def __init__(self, path: str, settings: Optional[dict] = None, parent=None):
+        super().__init__(parent)
+        cfg = (settings or {}).get("viewer", {})
+        self.path = ""
+        self.file: Optional[LineIndexedFile] = None
+        self._search_id = 0
+        self._pending_line: Optional[int] = None
+        self._search_cancel = threading.Event()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        toolbar = QToolBar()
+        self.goto_edit = QLineEdit()
+        self.goto_edit.setPlaceholderText("Go to line")
+        self.goto_edit.setMaximumWidth(120)
+        self.goto_edit.returnPressed.connect(self._on_goto)
+        toolbar.addWidget(self.goto_edit)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search (regex)")
+        self.search_edit.returnPressed.connect(self.find_next)
+        toolbar.addWidget(self.search_edit)
+        act_next = QAction("Next", self)
+        act_next.triggered.connect(self.find_next)
+        toolbar.addAction(act_next)
+        self.act_follow = QAction("Follow", self)
+        self.act_follow.setCheckable(True)
+        self.act_follow.toggled.connect(self.set_follow)
+        toolbar.addAction(self.act_follow)
+        self.status = QLabel()
+        toolbar.addWidget(self.status)
+        layout.addWidget(toolbar)
+
+        self.view = LineView()
+        layout.addWidget(self.view)
+
+        self._progress.connect(self._on_progress)
+        self._search_result.connect(self._on_search_result)
+
+        # follow mode polls the size; cheaper and more portable than inotify for appends
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setInterval(int(cfg.get("follow_interval_ms", 500)))
+        self._follow_timer.timeout.connect(self._poll_growth)
+
+        self.navigate_to(path)
+
+    # ---------- file ----------
+    def navigate_to(self, path: str) -> None:
+        if path.startswith("file://"):
+            path = path[len("file://"):]
+        path = os.path.abspath(path)
+        try:
+            file = LineIndexedFile(path, on_progress=self._progress.emit)
+        except OSError as e:
+            print(f"[ViewerTab] Could not open {path}: {e}")
+            self.status.setText(str(e))
+            return
+        self.close_file()
+        self.file = file
+        self.path = path
+        self._pending_line = None
+        self.view.set_file(file)
+        self._update_status()
+        self.path_changed.emit(path)
+
+    def title(self) -> str:
+        return os.path.basename(self.path) or self.path
+
+    def close_file(self) -> None:
+        self._search_cancel.set()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.view.set_file(None)
+
+    def _on_progress(self) -> None:
+        if self.file is None:
+            return
+        at_end = self.view.top_line() >= self.view.verticalScrollBar().maximum()
+        self.view.update_range()
+        if self._pending_line is not None and (
+                self._pending_line < self.file.line_count() or not self.file.indexing):
+            self.goto_line(self._pending_line)
+        elif self.act_follow.isChecked() and at_end:
+            self.view.scroll_to_end()
+        self._update_status()
+
+    def _update_status(self) -> None:
+        f = self.file
+        if f is None:
+            return
+        text = f"{f.line_count():,} lines, {f.size / (1024 * 1024):,.1f} MB"
+        if f.indexing:
+            text += f" (indexing {f.progress() * 100:.0f}%)"
+        self.status.setText(text)
+
+    # ---------- follow ----------
+    def set_follow(self, on: bool) -> None:
+        if self.act_follow.isChecked() != on:
+            self.act_follow.setChecked(on)  # re-enters through toggled
+            return
+        if on:
+            self._follow_timer.start()
+            self._poll_growth()
+            self.view.scroll_to_end()
+        else:
+            self._follow_timer.stop()
+
+    def _poll_growth(self) -> None:
+        if self.file is None:
+            return
+        try:
+            self.file.refresh()  # indexing the new tail reports through _on_progress
+        except OSError as e:
+            print(f"[ViewerTab] Could not re-read {self.path}: {e}")
+            self.set_follow(False)
+
+    # ---------- navigation ----------
+    def _on_goto(self) -> None:
+        try:
+            line = int(self.goto_edit.text().strip().replace(",", "")) - 1
+        except ValueError:
+            return
+        self.goto_line(line)
+
+    def goto_line(self, line: int) -> None:
+        if self.file is None:
+            return
+        line = max(0, line)
+        if line >= self.file.line_count() and self.file.indexing:
+            self._pending_line = line  # shown once the index gets there
+        else:
+            self._pending_line = None
+            line = min(line, max(0, self.file.line_count() - 1))
+        self.view.scroll_to_line(line, highlight=True)
+
+    # ---------- search ----------
+    def find_next(self) -> None:
+        """Search forward from the line after the highlighted (or top) line, wrapping once."""
+        text = self.search_edit.text()
+        if not text or self.file is None:
+            return
+        try:
+            pattern = re.compile(text.encode("utf-8"), re.MULTILINE)
+        except re.error as e:
+            self.status.setText(f"Bad pattern: {e}")
+            return
+        current = self.view.highlight_line
+        start = current + 1 if current is not None else self.view.top_line()
+        self._search_cancel.set()
+        self._search_cancel = cancel = threading.Event()
+        self._search_id += 1
+        search_id = self._search_id
+        file = self.file
+        self.status.setText("Searching...")
+
+        def run():
+            line = None
+            for begin in (start, 0):
+                for found, _, _ in file.search(pattern, begin, cancel.is_set):
+                    line = found
+                    break
+                if line is not None or begin == 0:
+                    break
+            if not cancel.is_set():
+                self._search_result.emit(search_id, line)
+
+        threading.Thread(target=run, name="triode-viewer-search", daemon=True).start()
+
+    def _on_search_result(self, search_id: int, line) -> None:
+        if search_id != self._search_id:
+            return  # superseded
+        self._update_status()
+        if line is None:
+            self.status.setText(self.status.text() + ": no match")
+            return
+        self.goto_line(line)
+
+    def on_destroy(self) -> None:
+        self._follow_timer.stop()
+        self.close_file()
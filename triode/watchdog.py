@@ -0,0 +1,163 @@
+# triode/watchdog.py
+# Finds out what the GUI thread was doing when the UI froze. A timer on the
+# GUI thread stamps a heartbeat; a background thread notices when the stamp
+# goes stale and samples the GUI thread's Python stack via sys._current_frames.
+# Samples are aggregated by call site, and each stall is kept in a ring buffer.
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """Innermost frame in Triode's own code (the code we can fix), else the innermost frame."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_PACKAGE_DIR) and not frame.filename.endswith("watchdog.py"):
+            break
+    else:
+        frame = stack[-1]
+    name = os.path.relpath(frame.filename, os.path.dirname(_PACKAGE_DIR)) \
+        if frame.filename.startswith(_PACKAGE_DIR) else frame.filename
+    return f"{name}:{frame.lineno} in {frame.name}"
+
+
+class StallSite:
+    __slots__ = ("samples", "stalls", "max_ms", "stack")
+
+    def __init__(self):
+        self.samples = 0
+        self.stalls = 0
+        self.max_ms = 0.0
+        self.stack: List[str] = []
+
+    def to_dict(self, site: str) -> Dict[str, Any]:
+        return {"site": site, "samples": self.samples, "stalls": self.stalls,
+                "max_ms": round(self.max_ms, 1), "stack": self.stack}
+
+
+class EventLoopWatchdog(QObject):
+    """
+    threshold_ms: heartbeat age that counts as a stall.
+    While a stall lasts the GUI thread's stack is sampled every
+    sample_interval_ms, so a long stall shows where its time went.
+    """
+
+    def __init__(self, threshold_ms: float = 250, heartbeat_ms: int = 50,
+                 sample_interval_ms: float = 100, max_events: int = 200,
+                 stack_depth: int = 16, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.sample_interval = sample_interval_ms / 1000
+        self.stack_depth = stack_depth
+        self.events: deque = deque(maxlen=max_events)
+        self.sites: Dict[str, StallSite] = {}
+        self._lock = threading.Lock()
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self._heartbeat.setInterval(heartbeat_ms)
+        self._heartbeat.timeout.connect(self._beat)
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()  # a float store; no lock needed
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._beat()
+        self._heartbeat.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="triode-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._heartbeat.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # ---------- watchdog thread ----------
+    def _run(self) -> None:
+        poll = min(self.threshold, self.sample_interval) / 2
+        stall_start: Optional[float] = None
+        stall_sites: Dict[str, int] = {}
+        next_sample = 0.0
+        while not self._stop.wait(poll):
+            now = time.monotonic()
+            beat = self._last_beat
+            if now - beat >= self.threshold:
+                if stall_start is None:
+                    stall_start, stall_sites, next_sample = beat, {}, now
+                if now >= next_sample:
+                    site = self._sample()
+                    if site is not None:
+                        stall_sites[site] = stall_sites.get(site, 0) + 1
+                    next_sample = now + self.sample_interval
+            elif stall_start is not None:
+                self._finish(stall_start, beat, stall_sites)
+                stall_start = None
+
+    def _sample(self) -> Optional[str]:
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame, limit=self.stack_depth)
+        del frame
+        if not stack:
+            return None
+        site = _call_site(stack)
+        with self._lock:
+            entry = self.sites.get(site)
+            if entry is None:
+                entry = self.sites[site] = StallSite()
+            entry.samples += 1
+            entry.stack = [f"{f.filename}:{f.lineno} in {f.name}" for f in stack]
+        return site
+
+    def _finish(self, start: float, end: float, stall_sites: Dict[str, int]) -> None:
+        ms = (end - start) * 1000
+        # the stall is charged to the site that was sampled most often during it
+        top = max(stall_sites, key=stall_sites.get) if stall_sites else None
+        with self._lock:
+            for site in stall_sites:
+                entry = self.sites.get(site)
+                if entry is None:
+                    continue  # cleared meanwhile
+                entry.stalls += 1
+                entry.max_ms = max(entry.max_ms, ms)
+            self.events.append({"time": time.time() - (time.monotonic() - end),
+                                "ms": round(ms, 1), "site": top, "samples": dict(stall_sites)})
+
+    # ---------- export ----------
+    def top_sites(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = sorted(self.sites.items(), key=lambda kv: (-kv[1].samples, -kv[1].max_ms))
+            return [entry.to_dict(site) for site, entry in ranked[:limit]]
+
+    def export(self, path: str) -> None:
+        """Write every aggregated site and the recent stall events as JSON."""
+        with self._lock:
+            events = list(self.events)
+        data = {"time": time.time(), "threshold_ms": self.threshold * 1000,
+                "sites": self.top_sites(limit=len(self.sites)), "events": events}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.sites.clear()
+            self.events.clear()